@@ -2,6 +2,8 @@ from django.contrib import admin
 
 # Register your models here.
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from .infrastructure.models import (
@@ -11,6 +13,17 @@ from .infrastructure.models import (
     PrestamoModel,
 )
 
+def _conteo_prestamos(campo: str, columna: str, **filtros):
+    """Subconsulta COUNT de préstamos por fila, para anotar el listado en una sola consulta."""
+    conteo = (
+        PrestamoModel.objects.filter(**{campo: OuterRef(columna)}, **filtros)
+        .order_by()
+        .values(campo)
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(conteo, output_field=IntegerField()), Value(0))
+
 # ---------- Inlines ----------
 class SapUsuarioInline(admin.TabularInline):
     model = SapUsuarioModel
@@ -26,9 +39,12 @@ class EmpleadoAdmin(admin.ModelAdmin):
     list_filter = ("activo",)
     inlines = [SapUsuarioInline]
 
-    @admin.display(description="Préstamos")
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_total_prestamos=_conteo_prestamos("cedula", "cedula"))
+
+    @admin.display(description="Préstamos", ordering="_total_prestamos")
     def total_prestamos(self, obj):
-        return PrestamoModel.objects.filter(cedula=obj.cedula).count()
+        return obj._total_prestamos
 
 # ---------- RadioFrecuencia ----------
 @admin.register(RadioFrecuenciaModel)
@@ -37,12 +53,14 @@ class RadioFrecuenciaAdmin(admin.ModelAdmin):
     search_fields = ("codigo", "descripcion")
     list_filter = ("activo",)
 
-    @admin.display(description="Abiertos")
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _prestamos_abiertos=_conteo_prestamos("codigo_radio", "codigo", fecha_hora_devolucion__isnull=True)
+        )
+
+    @admin.display(description="Abiertos", ordering="_prestamos_abiertos")
     def prestamos_abiertos(self, obj):
-        return PrestamoModel.objects.filter(
-            codigo_radio=obj.codigo,
-            fecha_hora_devolucion__isnull=True,
-        ).count()
+        return obj._prestamos_abiertos
 
 # ---------- SAP Usuario ----------
 @admin.register(SapUsuarioModel)
@@ -56,7 +74,9 @@ class SapUsuarioAdmin(admin.ModelAdmin):
 @admin.action(description="Marcar seleccionados como DEVUELTO (fecha ahora)")
 def marcar_como_devuelto(modeladmin, request, queryset):
     qs = queryset.filter(fecha_hora_devolucion__isnull=True)
-    n = qs.update(fecha_hora_devolucion=timezone.now(), estado="DEVUELTO")
+    ahora = timezone.now()
+    # update() no dispara auto_now: updated_at se fija explícitamente para el feed de cambios
+    n = qs.update(fecha_hora_devolucion=ahora, estado="DEVUELTO", updated_at=ahora)
     modeladmin.message_user(request, f"{n} préstamo(s) marcados como devueltos.")
 
 # ---------- Préstamo ----------
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import Any, Dict, Optional, ContextManager
+from typing import Any, Dict, Optional, ContextManager, Sequence
 from contextlib import nullcontext
 
 from ..domain.errors import EntityNotFound, BusinessRuleViolation
@@ -11,6 +11,7 @@ from ..domain.ports.repositories import (
     SapUsuarioRepository,
 )
 from ..domain.ports.audit import AuditLogRepository
+from ..domain.ports.events import CatalogChangeListener
 from ..domain.ports.uow import UnitOfWork
 from ..domain.entities import Empleado, RadioFrecuencia, SapUsuario
 
@@ -23,6 +24,7 @@ class CatalogosService:
     - SapUsuario
 
     Emite eventos de auditoría (AdminChangeEvent) y usa UoW para atomicidad.
+    Avisa cada cambio a los `listeners` (p. ej. la caché de catálogos).
     """
 
     def __init__(
@@ -32,17 +34,23 @@ class CatalogosService:
         sap_usuarios: SapUsuarioRepository,
         audit: AuditLogRepository,
         uow: Optional[UnitOfWork] = None,
+        listeners: Sequence[CatalogChangeListener] = (),
     ) -> None:
         self.empleados = empleados
         self.radios = radios
         self.sap = sap_usuarios
         self.audit = audit
         self.uow = uow
+        self.listeners = tuple(listeners)
 
     # -------- Helpers --------
     def _ctx(self) -> ContextManager:
         return self.uow if self.uow is not None else nullcontext()
 
+    def _notificar(self, aggregate: str, id_ref: str) -> None:
+        for listener in self.listeners:
+            listener.catalogo_cambiado(aggregate, id_ref)
+
     # -------- Empleado --------
     def crear_empleado(self, *, cedula: str, nombre: str, activo: bool, actor_user_id: int, reason: Optional[str] = None) -> Empleado:
         with self._ctx():
@@ -62,6 +70,7 @@ class CatalogosService:
                 after={"cedula": created.cedula, "nombre": created.nombre, "activo": created.activo},
                 reason=reason,
             ))
+            self._notificar("Empleado", cedula)
             return created
 
     def actualizar_empleado(self, *, cedula: str, cambios: Dict[str, Any], actor_user_id: int, reason: Optional[str] = None) -> Empleado:
@@ -82,6 +91,7 @@ class CatalogosService:
                 after={"nombre": updated.nombre, "activo": updated.activo},
                 reason=reason,
             ))
+            self._notificar("Empleado", cedula)
             return updated
 
     def eliminar_empleado(self, *, cedula: str, actor_user_id: int, reason: Optional[str] = None) -> None:
@@ -102,6 +112,7 @@ class CatalogosService:
                 after=None,
                 reason=reason,
             ))
+            self._notificar("Empleado", cedula)
 
     # -------- Radio --------
     def crear_radio(self, *, codigo: str, descripcion: Optional[str], activo: bool, actor_user_id: int, reason: Optional[str] = None) -> RadioFrecuencia:
@@ -122,6 +133,7 @@ class CatalogosService:
                 after={"codigo": created.codigo, "descripcion": created.descripcion, "activo": created.activo},
                 reason=reason,
             ))
+            self._notificar("RadioFrecuencia", codigo)
             return created
 
     def actualizar_radio(self, *, codigo: str, cambios: Dict[str, Any], actor_user_id: int, reason: Optional[str] = None) -> RadioFrecuencia:
@@ -142,6 +154,7 @@ class CatalogosService:
                 after={"descripcion": updated.descripcion, "activo": updated.activo},
                 reason=reason,
             ))
+            self._notificar("RadioFrecuencia", codigo)
             return updated
 
     def eliminar_radio(self, *, codigo: str, actor_user_id: int, reason: Optional[str] = None) -> None:
@@ -162,6 +175,7 @@ class CatalogosService:
                 after=None,
                 reason=reason,
             ))
+            self._notificar("RadioFrecuencia", codigo)
 
     # -------- SapUsuario --------
     def crear_sap_usuario(self, *, username: str, empleado_cedula: Optional[str], activo: bool, actor_user_id: int, reason: Optional[str] = None) -> SapUsuario:
@@ -187,6 +201,7 @@ class CatalogosService:
                 },
                 reason=reason,
             ))
+            self._notificar("SapUsuario", username)
             return created
 
     def actualizar_sap_usuario(self, *, username: str, cambios: Dict[str, Any], actor_user_id: int, reason: Optional[str] = None) -> SapUsuario:
@@ -215,6 +230,7 @@ class CatalogosService:
                 },
                 reason=reason,
             ))
+            self._notificar("SapUsuario", username)
             return updated
 
     def eliminar_sap_usuario(self, *, username: str, actor_user_id: int, reason: Optional[str] = None) -> None:
@@ -239,3 +255,4 @@ class CatalogosService:
                 after=None,
                 reason=reason,
             ))
+            self._notificar("SapUsuario", username)
@@ -0,0 +1,424 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, ContextManager, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+from contextlib import nullcontext
+
+from ..domain.entities import Empleado, RadioFrecuencia, SapUsuario
+from ..domain.errors import BusinessRuleViolation
+from ..domain.events import AdminChangeEvent
+from ..domain.ports.audit import AuditLogRepository
+from ..domain.ports.events import CatalogChangeListener
+from ..domain.ports.repositories import EmpleadoRepository, RadioRepository, SapUsuarioRepository
+from ..domain.ports.uow import UnitOfWork
+
+# Filas ya normalizadas por el lector. Clave vacía = fila omitida; en los campos
+# opcionales, None = conservar el valor actual (o el valor por defecto si es un alta).
+FilaEmpleado = Tuple[str, str, Optional[bool]]                 # (cedula, nombre, activo)
+FilaRadio = Tuple[str, Optional[str], Optional[bool]]          # (codigo, descripcion, activo)
+FilaSapUsuario = Tuple[str, Optional[str], Optional[bool]]     # (username, empleado_cedula, activo)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ResumenImportacion:
+    filas: int = 0
+    insertados: int = 0
+    actualizados: int = 0
+    desactivados: int = 0
+    sin_cambios: int = 0
+    omitidos: int = 0
+    sin_empleado: int = 0   # SAP: cédula sin empleado; el vínculo queda vacío o sin cambio
+    ausentes: int = 0       # sincronización: activos que no vienen en el archivo y se desactivan
+    sap_desactivados: int = 0
+    simulado: bool = False
+
+
+def en_lotes(filas: Iterable[Any], tamano: int) -> Iterator[List[Any]]:
+    it = iter(filas)
+    while True:
+        lote = list(islice(it, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+@dataclass
+class _Sincronizacion:
+    vistas: Set[str] = field(default_factory=set)          # claves presentes en el archivo
+    desactivadas: List[str] = field(default_factory=list)  # desactivadas explícitamente por el archivo
+
+
+class ImportacionCatalogo(ABC, Generic[T]):
+    """
+    Motor común de importación masiva por lotes.
+
+    Cada lote se compara contra los registros existentes con una sola consulta,
+    se aplica con inserción/actualización en bloque y se audita con un único
+    `append_many`, todo en una transacción. Con `simular=True` solo se calcula
+    el resumen, sin escribir ni auditar. Con `sincronizar=True` todo el archivo
+    va en una sola transacción y al final se aplica `_sincronizar` sobre las
+    claves vistas. Las subclases definen cómo se compara (`_comparar`), cómo se
+    persiste (`_guardar`) y qué se audita.
+    """
+
+    aggregate: str
+
+    def __init__(
+        self,
+        audit: AuditLogRepository,
+        uow: Optional[UnitOfWork] = None,
+        listeners: Sequence[CatalogChangeListener] = (),
+    ) -> None:
+        self.audit = audit
+        self.uow = uow
+        self.listeners = tuple(listeners)
+
+    def _ctx(self) -> ContextManager:
+        return self.uow if self.uow is not None else nullcontext()
+
+    def importar(
+        self,
+        filas: Iterable[Tuple[Any, ...]],
+        *,
+        actor_user_id: int,
+        reason: Optional[str] = None,
+        tamano_lote: int = 2000,
+        simular: bool = False,
+        sincronizar: bool = False,
+        progreso: Optional[Callable[[ResumenImportacion], None]] = None,
+    ) -> ResumenImportacion:
+        resumen = ResumenImportacion(simulado=simular)
+        sinc = _Sincronizacion() if sincronizar else None
+        # Sincronizar exige el archivo completo: una sola transacción para todo;
+        # si no, cada lote es su propia transacción
+        with self._ctx() if sincronizar and not simular else nullcontext():
+            for lote in en_lotes(filas, tamano_lote):
+                with nullcontext() if simular or sincronizar else self._ctx():
+                    self._importar_lote(lote, resumen, actor_user_id=actor_user_id, reason=reason, simular=simular, sinc=sinc)
+                if progreso is not None:
+                    progreso(resumen)
+            if sinc is not None:
+                if not sinc.vistas:
+                    raise BusinessRuleViolation("El archivo no trae filas válidas: sincronizar desactivaría todo el catálogo.")
+                self._sincronizar(sinc, resumen, actor_user_id=actor_user_id, reason=reason, simular=simular)
+        if not simular and (resumen.insertados or resumen.actualizados or resumen.desactivados or resumen.ausentes):
+            for listener in self.listeners:
+                listener.catalogo_cambiado(self.aggregate, "*")
+        return resumen
+
+    def _por_clave(self, lote: List[Tuple[Any, ...]], resumen: ResumenImportacion) -> Dict[str, Tuple[Any, ...]]:
+        """Descarta filas sin clave; una clave repetida dentro del lote: gana la última aparición."""
+        por_clave: Dict[str, Tuple[Any, ...]] = {}
+        for fila in lote:
+            clave = fila[0]
+            if not clave or not self._fila_valida(fila):
+                resumen.omitidos += 1
+                continue
+            if clave in por_clave:
+                resumen.omitidos += 1
+            por_clave[clave] = fila[1:]
+        return por_clave
+
+    def _importar_lote(
+        self,
+        lote: List[Tuple[Any, ...]],
+        resumen: ResumenImportacion,
+        *,
+        actor_user_id: int,
+        reason: Optional[str],
+        simular: bool,
+        sinc: Optional["_Sincronizacion"] = None,
+    ) -> None:
+        resumen.filas += len(lote)
+        if sinc is not None:
+            # Una fila con clave cuenta como presente aunque se omita por inválida:
+            # sincronizar no debe desactivar un registro que sí viene en el archivo
+            sinc.vistas.update(fila[0] for fila in lote if fila[0])
+        por_clave = self._por_clave(lote, resumen)
+        nuevos, cambios = self._comparar(por_clave, resumen)
+        cambiados = [(antes, despues) for antes, despues in cambios if antes != despues]
+        resumen.sin_cambios += len(cambios) - len(cambiados)
+
+        resumen.insertados += len(nuevos)
+        for antes, despues in cambiados:
+            if antes.activo and not despues.activo:
+                resumen.desactivados += 1
+                if sinc is not None:
+                    sinc.desactivadas.append(self._clave(antes))
+            else:
+                resumen.actualizados += 1
+        if simular:
+            return
+
+        self._guardar(nuevos, cambiados)
+
+        at = datetime.now(timezone.utc)
+        eventos = [
+            AdminChangeEvent(
+                aggregate=self.aggregate,
+                action="CREATED",
+                id_ref=self._clave(e),
+                at=at,
+                actor_user_id=actor_user_id,
+                before=None,
+                after=self._snapshot_creado(e),
+                reason=reason,
+            )
+            for e in nuevos
+        ] + [
+            AdminChangeEvent(
+                aggregate=self.aggregate,
+                action="UPDATED",
+                id_ref=self._clave(antes),
+                at=at,
+                actor_user_id=actor_user_id,
+                before=self._snapshot(antes),
+                after=self._snapshot(despues),
+                reason=reason,
+            )
+            for antes, despues in cambiados
+        ]
+        if eventos:
+            self.audit.append_many(eventos)
+
+    # --------- Puntos de extensión ---------
+    def _sincronizar(
+        self,
+        sinc: "_Sincronizacion",
+        resumen: ResumenImportacion,
+        *,
+        actor_user_id: int,
+        reason: Optional[str],
+        simular: bool,
+    ) -> None:
+        raise BusinessRuleViolation(f"La sincronización no está soportada para {self.aggregate}.")
+
+    def _fila_valida(self, fila: Tuple[Any, ...]) -> bool:
+        return True
+
+    @abstractmethod
+    def _comparar(
+        self, por_clave: Dict[str, Tuple[Any, ...]], resumen: ResumenImportacion
+    ) -> Tuple[List[T], List[Tuple[T, T]]]:
+        """Altas y pares (actual, propuesto) para las claves existentes; los pares iguales cuentan como sin cambios."""
+
+    @abstractmethod
+    def _guardar(self, nuevos: List[T], cambiados: List[Tuple[T, T]]) -> None: ...
+
+    @abstractmethod
+    def _clave(self, entidad: T) -> str: ...
+
+    @abstractmethod
+    def _snapshot(self, entidad: T) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def _snapshot_creado(self, entidad: T) -> Dict[str, Any]: ...
+
+
+class ImportacionEmpleadosService(ImportacionCatalogo[Empleado]):
+    """Importación masiva de empleados desde un origen tabular (Excel, CSV, Parquet)."""
+
+    aggregate = "Empleado"
+
+    def __init__(
+        self,
+        empleados: EmpleadoRepository,
+        audit: AuditLogRepository,
+        uow: Optional[UnitOfWork] = None,
+        listeners: Sequence[CatalogChangeListener] = (),
+        sap: Optional[SapUsuarioRepository] = None,
+    ) -> None:
+        super().__init__(audit, uow, listeners)
+        self.empleados = empleados
+        self.sap = sap
+
+    def _sincronizar(
+        self,
+        sinc: _Sincronizacion,
+        resumen: ResumenImportacion,
+        *,
+        actor_user_id: int,
+        reason: Optional[str],
+        simular: bool,
+    ) -> None:
+        """
+        Desactiva los empleados activos que no vienen en el archivo (maestro de RRHH)
+        y, en cascada, los usuarios SAP activos vinculados a cualquier empleado
+        desactivado en esta corrida. Se audita con un único evento `SYNC`.
+        """
+        ausentes = sorted(set(self.empleados.cedulas_activas()) - sinc.vistas)
+        usuarios_sap = self.sap.activos_por_empleados([*ausentes, *sinc.desactivadas]) if self.sap is not None else []
+        resumen.ausentes = len(ausentes)
+        resumen.sap_desactivados = len(usuarios_sap)
+        if simular or not (ausentes or usuarios_sap):
+            return
+
+        self.empleados.desactivar_lote(ausentes)
+        if usuarios_sap:
+            self.sap.desactivar_lote(usuarios_sap)
+        self.audit.append_many([AdminChangeEvent(
+            aggregate=self.aggregate,
+            action="SYNC",
+            id_ref="*",
+            at=datetime.now(timezone.utc),
+            actor_user_id=actor_user_id,
+            before=None,
+            after={
+                "desactivados": len(ausentes),
+                "cedulas": ausentes,
+                "sap_desactivados": len(usuarios_sap),
+                "usuarios_sap": sorted(usuarios_sap),
+            },
+            reason=reason,
+        )])
+        if usuarios_sap:
+            for listener in self.listeners:
+                listener.catalogo_cambiado("SapUsuario", "*")
+
+    def _fila_valida(self, fila: Tuple[Any, ...]) -> bool:
+        return bool(fila[1])  # nombre obligatorio
+
+    def _comparar(
+        self, por_clave: Dict[str, Tuple[Any, ...]], resumen: ResumenImportacion
+    ) -> Tuple[List[Empleado], List[Tuple[Empleado, Empleado]]]:
+        existentes = self.empleados.obtener_por_cedulas(por_clave.keys())
+        nuevos: List[Empleado] = []
+        cambios: List[Tuple[Empleado, Empleado]] = []
+        for cedula, (nombre, activo) in por_clave.items():
+            actual = existentes.get(cedula)
+            if actual is None:
+                nuevos.append(Empleado(id=None, cedula=cedula, nombre=nombre, activo=True if activo is None else activo))
+            else:
+                cambios.append((actual, replace(actual, nombre=nombre, activo=actual.activo if activo is None else activo)))
+        return nuevos, cambios
+
+    def _guardar(self, nuevos: List[Empleado], cambiados: List[Tuple[Empleado, Empleado]]) -> None:
+        if nuevos:
+            self.empleados.crear_lote(nuevos)
+        if cambiados:
+            self.empleados.actualizar_lote([despues for _, despues in cambiados])
+
+    def _clave(self, e: Empleado) -> str:
+        return e.cedula
+
+    def _snapshot(self, e: Empleado) -> Dict[str, Any]:
+        return {"nombre": e.nombre, "activo": e.activo}
+
+    def _snapshot_creado(self, e: Empleado) -> Dict[str, Any]:
+        return {"cedula": e.cedula, "nombre": e.nombre, "activo": e.activo}
+
+
+class ImportacionRadiosService(ImportacionCatalogo[RadioFrecuencia]):
+    """Importación masiva del catálogo de radios."""
+
+    aggregate = "RadioFrecuencia"
+
+    def __init__(
+        self,
+        radios: RadioRepository,
+        audit: AuditLogRepository,
+        uow: Optional[UnitOfWork] = None,
+        listeners: Sequence[CatalogChangeListener] = (),
+    ) -> None:
+        super().__init__(audit, uow, listeners)
+        self.radios = radios
+
+    def _comparar(
+        self, por_clave: Dict[str, Tuple[Any, ...]], resumen: ResumenImportacion
+    ) -> Tuple[List[RadioFrecuencia], List[Tuple[RadioFrecuencia, RadioFrecuencia]]]:
+        existentes = self.radios.obtener_por_codigos(por_clave.keys())
+        nuevos: List[RadioFrecuencia] = []
+        cambios: List[Tuple[RadioFrecuencia, RadioFrecuencia]] = []
+        for codigo, (descripcion, activo) in por_clave.items():
+            actual = existentes.get(codigo)
+            if actual is None:
+                nuevos.append(RadioFrecuencia(id=None, codigo=codigo, descripcion=descripcion, activo=True if activo is None else activo))
+            else:
+                cambios.append((actual, replace(
+                    actual,
+                    descripcion=actual.descripcion if descripcion is None else descripcion,
+                    activo=actual.activo if activo is None else activo,
+                )))
+        return nuevos, cambios
+
+    def _guardar(self, nuevos: List[RadioFrecuencia], cambiados: List[Tuple[RadioFrecuencia, RadioFrecuencia]]) -> None:
+        if nuevos:
+            self.radios.crear_lote(nuevos)
+        if cambiados:
+            self.radios.actualizar_lote([despues for _, despues in cambiados])
+
+    def _clave(self, r: RadioFrecuencia) -> str:
+        return r.codigo
+
+    def _snapshot(self, r: RadioFrecuencia) -> Dict[str, Any]:
+        return {"descripcion": r.descripcion, "activo": r.activo}
+
+    def _snapshot_creado(self, r: RadioFrecuencia) -> Dict[str, Any]:
+        return {"codigo": r.codigo, "descripcion": r.descripcion, "activo": r.activo}
+
+
+class ImportacionSapUsuariosService(ImportacionCatalogo[SapUsuario]):
+    """
+    Importación masiva de usuarios SAP. Los vínculos `empleado_cedula` de cada lote
+    se resuelven con una sola consulta al repositorio de empleados.
+    """
+
+    aggregate = "SapUsuario"
+
+    def __init__(
+        self,
+        sap: SapUsuarioRepository,
+        empleados: EmpleadoRepository,
+        audit: AuditLogRepository,
+        uow: Optional[UnitOfWork] = None,
+        listeners: Sequence[CatalogChangeListener] = (),
+    ) -> None:
+        super().__init__(audit, uow, listeners)
+        self.sap = sap
+        self.empleados = empleados
+
+    def _comparar(
+        self, por_clave: Dict[str, Tuple[Any, ...]], resumen: ResumenImportacion
+    ) -> Tuple[List[SapUsuario], List[Tuple[SapUsuario, SapUsuario]]]:
+        existentes = self.sap.obtener_por_usernames(por_clave.keys())
+        empleados = self.empleados.obtener_por_cedulas({ced for ced, _ in por_clave.values() if ced})
+        nuevos: List[SapUsuario] = []
+        cambios: List[Tuple[SapUsuario, SapUsuario]] = []
+        for username, (cedula, activo) in por_clave.items():
+            actual = existentes.get(username)
+            empleado = empleados.get(cedula) if cedula else None
+            if cedula and empleado is None:
+                resumen.sin_empleado += 1
+            if actual is None:
+                nuevos.append(SapUsuario(
+                    id=None,
+                    username=username,
+                    empleado_id=empleado.id if empleado else None,
+                    empleado_cedula=empleado.cedula if empleado else None,
+                    activo=True if activo is None else activo,
+                ))
+                continue
+            vinculo = {}
+            if empleado is not None:
+                vinculo = {"empleado_id": empleado.id, "empleado_cedula": empleado.cedula}
+            cambios.append((actual, replace(actual, activo=actual.activo if activo is None else activo, **vinculo)))
+        return nuevos, cambios
+
+    def _guardar(self, nuevos: List[SapUsuario], cambiados: List[Tuple[SapUsuario, SapUsuario]]) -> None:
+        if nuevos:
+            self.sap.crear_lote(nuevos)
+        if cambiados:
+            self.sap.actualizar_lote([despues for _, despues in cambiados])
+
+    def _clave(self, s: SapUsuario) -> str:
+        return s.username
+
+    def _snapshot(self, s: SapUsuario) -> Dict[str, Any]:
+        return {"empleado_id": s.empleado_id, "empleado_cedula": s.empleado_cedula, "activo": s.activo}
+
+    def _snapshot_creado(self, s: SapUsuario) -> Dict[str, Any]:
+        return {"username": s.username, "empleado_id": s.empleado_id, "empleado_cedula": s.empleado_cedula, "activo": s.activo}
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import ContextManager, Optional
+from dataclasses import dataclass
+from typing import ContextManager, Dict, List, Optional, Sequence, Set, Tuple
 from contextlib import nullcontext
 
-from ..domain.errors import BusinessRuleViolation, EntityNotFound, InactiveEntity
+from ..domain.errors import BusinessRuleViolation, DomainError, EntityNotFound, InactiveEntity
 from ..domain.ports.repositories import (
     EmpleadoRepository,
     RadioRepository,
@@ -11,16 +12,48 @@ from ..domain.ports.repositories import (
     PrestamoRepository,
 )
 from ..domain.ports.uow import UnitOfWork
-from ..domain.entities import Prestamo
+from ..domain.ports.events import PrestamoEventPublisher
+from ..domain.entities import Empleado, Prestamo, RadioFrecuencia, SapUsuario
+from ..domain.events import PrestamoEvent
 from ..domain.rules import calcular_turno
 from ..domain.value_objects import EstadoPrestamo
 
 
+@dataclass(frozen=True)
+class SolicitudAsignacion:
+    cedula: str
+    codigo_radio: str
+    usuario_sap: str
+
+
+@dataclass(frozen=True)
+class ResultadoAsignacion:
+    solicitud: SolicitudAsignacion
+    prestamo: Optional[Prestamo] = None
+    error: Optional[DomainError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class ResultadoDevolucionLote:
+    devueltos: List[Prestamo]
+    # Identificadores recibidos sin préstamo abierto, por tipo (codigo_radio / cedula / usuario_sap)
+    no_abiertos: Dict[str, List[str]]
+
+
 class PrestamosService:
     """
     Casos de uso de préstamos:
     - Asignar radio a empleado (crea préstamo abierto; requiere cédula + código RF + usuario SAP)
+    - Asignar en lote (varias solicitudes, resultado por solicitud)
     - Devolver préstamo (cierra abierto por exactamente uno de: cédula / usuario_sap / código)
+    - Devolver en lote (fin de turno: muchos identificadores, un solo UPDATE)
+
+    Cada asignación o devolución se entrega como `PrestamoEvent` a los `eventos`
+    (canal push, contadores del tablero).
     """
 
     def __init__(
@@ -30,17 +63,85 @@ class PrestamosService:
         sap: SapUsuarioRepository,
         prestamos: PrestamoRepository,
         uow: Optional[UnitOfWork] = None,
+        eventos: Sequence[PrestamoEventPublisher] = (),
     ) -> None:
         self.empleados = empleados
         self.radios = radios
         self.sap = sap
         self.prestamos = prestamos
         self.uow = uow
+        self.eventos = tuple(eventos)
 
     def _ctx(self) -> ContextManager:
         return self.uow if self.uow is not None else nullcontext()
 
+    def _publicar(self, action: str, prestamo: Prestamo, ahora: datetime) -> None:
+        event = PrestamoEvent(action=action, prestamo=prestamo, at=ahora)
+        for publisher in self.eventos:
+            publisher.publish(event)
+
     # --------- Asignar ---------
+    @staticmethod
+    def _validar_catalogos(
+        solicitud: "SolicitudAsignacion",
+        empleado: Optional[Empleado],
+        radio: Optional[RadioFrecuencia],
+        sapuser: Optional[SapUsuario],
+    ) -> None:
+        cedula, codigo_radio, usuario_sap = solicitud.cedula, solicitud.codigo_radio, solicitud.usuario_sap
+        if not empleado:
+            raise EntityNotFound(f"Empleado {cedula} no existe")
+        if not empleado.activo:
+            raise InactiveEntity(f"Empleado {cedula} inactivo")
+
+        if not radio:
+            raise EntityNotFound(f"Radio {codigo_radio} no existe")
+        if not radio.activo:
+            raise InactiveEntity(f"Radio {codigo_radio} inactiva")
+
+        if not sapuser:
+            raise EntityNotFound(f"SAP Usuario {usuario_sap} no existe")
+        if not sapuser.activo:
+            raise InactiveEntity(f"SAP Usuario {usuario_sap} inactivo")
+
+    @staticmethod
+    def _validar_libres(
+        solicitud: "SolicitudAsignacion",
+        cedulas: Set[str],
+        usuarios_sap: Set[str],
+        codigos_radio: Set[str],
+    ) -> None:
+        if solicitud.cedula in cedulas:
+            raise BusinessRuleViolation(f"Empleado {solicitud.cedula} ya tiene préstamo abierto")
+        if solicitud.usuario_sap in usuarios_sap:
+            raise BusinessRuleViolation(f"SAP Usuario {solicitud.usuario_sap} ya tiene préstamo abierto")
+        if solicitud.codigo_radio in codigos_radio:
+            raise BusinessRuleViolation(f"Radio {solicitud.codigo_radio} ya está asignada")
+
+    @staticmethod
+    def _nuevo_prestamo(
+        empleado: Empleado,
+        radio: RadioFrecuencia,
+        sapuser: SapUsuario,
+        *,
+        turno: str,
+        ahora: datetime,
+        usuario_registra_id: int,
+        usuario_registra_username: Optional[str],
+    ) -> Prestamo:
+        return Prestamo(
+            id=None,
+            cedula=empleado.cedula,
+            empleado_nombre=empleado.nombre,
+            usuario_sap=sapuser.username,
+            codigo_radio=radio.codigo,
+            fecha_hora_prestamo=ahora,
+            turno=turno,                     # Infra mapper lo convertirá a VO Enum
+            estado=EstadoPrestamo.ASIGNADO,  # idem
+            usuario_registra_id=usuario_registra_id,
+            usuario_registra_username=usuario_registra_username,
+        )
+
     def asignar(
         self,
         *,
@@ -49,57 +150,114 @@ class PrestamosService:
         usuario_sap: str,
         usuario_registra_id: int,
         ahora: datetime,
+        usuario_registra_username: Optional[str] = None,
     ) -> Prestamo:
         """
         Reglas:
         - Empleado activo, Radio activa, Usuario SAP activo.
-        - Ningún abierto por la misma cédula / usuario_sap / código.
+        - Ningún abierto por la misma cédula / usuario_sap / código
+          (la BD lo garantiza con índices únicos parciales ante carreras).
         """
+        solicitud = SolicitudAsignacion(cedula=cedula, codigo_radio=codigo_radio, usuario_sap=usuario_sap)
         with self._ctx():
             empleado = self.empleados.obtener_por_cedula(cedula)
-            if not empleado:
-                raise EntityNotFound(f"Empleado {cedula} no existe")
-            if not empleado.activo:
-                raise InactiveEntity(f"Empleado {cedula} inactivo")
-
             radio = self.radios.obtener_por_codigo(codigo_radio)
-            if not radio:
-                raise EntityNotFound(f"Radio {codigo_radio} no existe")
-            if not radio.activo:
-                raise InactiveEntity(f"Radio {codigo_radio} inactiva")
-
             sapuser = self.sap.obtener_por_username(usuario_sap)
-            if not sapuser:
-                raise EntityNotFound(f"SAP Usuario {usuario_sap} no existe")
-            if not sapuser.activo:
-                raise InactiveEntity(f"SAP Usuario {usuario_sap} inactivo")
-
-            # Verificar abiertos por cada dimensión
-            if self.prestamos.obtener_prestamo_abierto(cedula=cedula):
-                raise BusinessRuleViolation(f"Empleado {cedula} ya tiene préstamo abierto")
-
-            if self.prestamos.obtener_prestamo_abierto(usuario_sap=usuario_sap):
-                raise BusinessRuleViolation(f"SAP Usuario {usuario_sap} ya tiene préstamo abierto")
-
-            if self.prestamos.obtener_prestamo_abierto(codigo_radio=codigo_radio):
-                raise BusinessRuleViolation(f"Radio {codigo_radio} ya está asignada")
-
-            turno_str = calcular_turno(ahora)
-
-            entity = Prestamo(
-                id=None,
-                cedula=empleado.cedula,
-                empleado_nombre=empleado.nombre,
-                usuario_sap=sapuser.username,
-                codigo_radio=radio.codigo,
-                fecha_hora_prestamo=ahora,
-                turno=turno_str,                 # Infra mapper lo convertirá a VO Enum
-                estado=EstadoPrestamo.ASIGNADO,  # idem
+            self._validar_catalogos(solicitud, empleado, radio, sapuser)
+
+            # Verificar abiertos por cada dimensión (una sola consulta)
+            conflictos = self.prestamos.obtener_conflictos_abiertos(
+                cedula=cedula, usuario_sap=usuario_sap, codigo_radio=codigo_radio
+            )
+            self._validar_libres(
+                solicitud,
+                {p.cedula for p in conflictos},
+                {p.usuario_sap for p in conflictos},
+                {p.codigo_radio for p in conflictos},
+            )
+
+            entity = self._nuevo_prestamo(
+                empleado, radio, sapuser,
+                turno=calcular_turno(ahora),
+                ahora=ahora,
                 usuario_registra_id=usuario_registra_id,
+                usuario_registra_username=usuario_registra_username,
             )
             created = self.prestamos.crear(entity)
+            self._publicar(EstadoPrestamo.ASIGNADO.value, created, ahora)
             return created
 
+    def asignar_lote(
+        self,
+        *,
+        solicitudes: Sequence["SolicitudAsignacion"],
+        usuario_registra_id: int,
+        ahora: datetime,
+        usuario_registra_username: Optional[str] = None,
+    ) -> List["ResultadoAsignacion"]:
+        """
+        Asigna varios radios a la vez (entrega de turno completa).
+        Mismas reglas que `asignar`, evaluadas contra catálogos y abiertos cargados en bloque;
+        las solicitudes válidas se insertan juntas y cada una recibe su propio resultado.
+        Dentro del lote, una clave repetida cuenta como ocupada por la solicitud anterior.
+        """
+        errores: Dict[int, DomainError] = {}
+        creados: Dict[int, Prestamo] = {}
+        with self._ctx():
+            empleados = self.empleados.obtener_por_cedulas(s.cedula for s in solicitudes)
+            radios = self.radios.obtener_por_codigos(s.codigo_radio for s in solicitudes)
+            saps = self.sap.obtener_por_usernames(s.usuario_sap for s in solicitudes)
+            abiertos = self.prestamos.obtener_abiertos(
+                cedulas=[s.cedula for s in solicitudes],
+                usuarios_sap=[s.usuario_sap for s in solicitudes],
+                codigos_radio=[s.codigo_radio for s in solicitudes],
+            )
+            cedulas = {p.cedula for p in abiertos}
+            usuarios_sap = {p.usuario_sap for p in abiertos}
+            codigos_radio = {p.codigo_radio for p in abiertos}
+
+            turno = calcular_turno(ahora)
+            pendientes: List[Tuple[int, Prestamo]] = []
+            for i, solicitud in enumerate(solicitudes):
+                empleado = empleados.get(solicitud.cedula)
+                radio = radios.get(solicitud.codigo_radio)
+                sapuser = saps.get(solicitud.usuario_sap)
+                try:
+                    self._validar_catalogos(solicitud, empleado, radio, sapuser)
+                    self._validar_libres(solicitud, cedulas, usuarios_sap, codigos_radio)
+                except DomainError as exc:
+                    errores[i] = exc
+                    continue
+                cedulas.add(solicitud.cedula)
+                usuarios_sap.add(solicitud.usuario_sap)
+                codigos_radio.add(solicitud.codigo_radio)
+                pendientes.append((i, self._nuevo_prestamo(
+                    empleado, radio, sapuser,
+                    turno=turno,
+                    ahora=ahora,
+                    usuario_registra_id=usuario_registra_id,
+                    usuario_registra_username=usuario_registra_username,
+                )))
+
+            try:
+                nuevos = self.prestamos.crear_lote([p for _, p in pendientes])
+                creados.update((i, p) for (i, _), p in zip(pendientes, nuevos))
+            except BusinessRuleViolation:
+                # Carrera con otra asignación concurrente: se reintenta uno a uno para aislar los choques
+                for i, entity in pendientes:
+                    try:
+                        creados[i] = self.prestamos.crear(entity)
+                    except BusinessRuleViolation as exc:
+                        errores[i] = exc
+
+            for prestamo in creados.values():
+                self._publicar(EstadoPrestamo.ASIGNADO.value, prestamo, ahora)
+
+        return [
+            ResultadoAsignacion(solicitud=s, prestamo=creados.get(i), error=errores.get(i))
+            for i, s in enumerate(solicitudes)
+        ]
+
     # --------- Devolver (métodos específicos delegan en el unificado) ---------
     def devolver_por_radio(self, *, codigo_radio: str, ahora: datetime) -> Prestamo:
         return self.devolver(codigo_radio=codigo_radio, ahora=ahora)
@@ -124,6 +282,7 @@ class PrestamosService:
         Errores:
         - 0 o >1 identificadores -> BusinessRuleViolation
         - No hay préstamo abierto para el identificador -> EntityNotFound
+        - Otra petición lo devolvió entre la consulta y el cierre -> BusinessRuleViolation
         """
         keys = [x is not None and str(x).strip() != "" for x in (codigo_radio, cedula, usuario_sap)]
         if sum(keys) != 1:
@@ -144,4 +303,49 @@ class PrestamosService:
                 # Puedes cambiar a BusinessRuleViolation si prefieres semántica de "no está prestada".
                 raise EntityNotFound(f"No existe préstamo abierto para {target}")
 
-            return self.prestamos.marcar_devolucion(abierto.id, fecha_hora=ahora)
+            devuelto = self.prestamos.marcar_devolucion(abierto.id, fecha_hora=ahora)
+            self._publicar(EstadoPrestamo.DEVUELTO.value, devuelto, ahora)
+            return devuelto
+
+    def devolver_lote(
+        self,
+        *,
+        codigos_radio: Sequence[str] = (),
+        cedulas: Sequence[str] = (),
+        usuarios_sap: Sequence[str] = (),
+        ahora: datetime,
+    ) -> ResultadoDevolucionLote:
+        """
+        Cierra todos los préstamos abiertos que coincidan con alguno de los identificadores.
+        Se resuelven en una consulta y se cierran en un UPDATE; un mismo préstamo referido
+        por varios identificadores se cierra una sola vez.
+        """
+        pedidos = {
+            "codigo_radio": [x for x in dict.fromkeys(codigos_radio) if x],
+            "cedula": [x for x in dict.fromkeys(cedulas) if x],
+            "usuario_sap": [x for x in dict.fromkeys(usuarios_sap) if x],
+        }
+        if not any(pedidos.values()):
+            raise BusinessRuleViolation("Debe enviar al menos uno de: codigos_radio, cedulas o usuarios_sap")
+
+        with self._ctx():
+            abiertos = self.prestamos.obtener_abiertos(
+                cedulas=pedidos["cedula"],
+                usuarios_sap=pedidos["usuario_sap"],
+                codigos_radio=pedidos["codigo_radio"],
+            )
+            por_clave = {campo: {getattr(p, campo): p.id for p in abiertos} for campo in pedidos}
+            objetivo = {campo: {v: por_clave[campo].get(v) for v in valores} for campo, valores in pedidos.items()}
+
+            ids = {id_ for valores in objetivo.values() for id_ in valores.values() if id_ is not None}
+            devueltos = self.prestamos.marcar_devolucion_lote(ids, fecha_hora=ahora) if ids else []
+            cerrados = {p.id for p in devueltos}
+
+            for prestamo in devueltos:
+                self._publicar(EstadoPrestamo.DEVUELTO.value, prestamo, ahora)
+
+        no_abiertos = {
+            campo: [v for v, id_ in valores.items() if id_ not in cerrados]
+            for campo, valores in objetivo.items()
+        }
+        return ResultadoDevolucionLote(devueltos=devueltos, no_abiertos=no_abiertos)
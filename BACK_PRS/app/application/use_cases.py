@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
-from .services import PrestamosService
+from .services import PrestamosService, ResultadoAsignacion, ResultadoDevolucionLote, SolicitudAsignacion
 from .catalogos_service import CatalogosService
 from ..domain.entities import Prestamo, Empleado, RadioFrecuencia, SapUsuario
 
@@ -17,6 +17,21 @@ class AsignarPrestamoCmd:
     usuario_sap: str
     usuario_registra_id: int
     ahora: datetime
+    usuario_registra_username: Optional[str] = None
+
+@dataclass(frozen=True)
+class AsignarLoteCmd:
+    solicitudes: Tuple[SolicitudAsignacion, ...]
+    usuario_registra_id: int
+    ahora: datetime
+    usuario_registra_username: Optional[str] = None
+
+@dataclass(frozen=True)
+class DevolverLoteCmd:
+    ahora: datetime
+    codigos_radio: Tuple[str, ...] = ()
+    cedulas: Tuple[str, ...] = ()
+    usuarios_sap: Tuple[str, ...] = ()
 
 @dataclass(frozen=True)
 class DevolverPorRadioCmd:
@@ -47,6 +62,23 @@ class PrestamoUseCases:
             usuario_sap=cmd.usuario_sap,
             usuario_registra_id=cmd.usuario_registra_id,
             ahora=cmd.ahora,
+            usuario_registra_username=cmd.usuario_registra_username,
+        )
+
+    def asignar_lote(self, cmd: AsignarLoteCmd) -> List[ResultadoAsignacion]:
+        return self.svc.asignar_lote(
+            solicitudes=cmd.solicitudes,
+            usuario_registra_id=cmd.usuario_registra_id,
+            ahora=cmd.ahora,
+            usuario_registra_username=cmd.usuario_registra_username,
+        )
+
+    def devolver_lote(self, cmd: DevolverLoteCmd) -> ResultadoDevolucionLote:
+        return self.svc.devolver_lote(
+            codigos_radio=cmd.codigos_radio,
+            cedulas=cmd.cedulas,
+            usuarios_sap=cmd.usuarios_sap,
+            ahora=cmd.ahora,
         )
 
     def devolver_por_radio(self, cmd: DevolverPorRadioCmd) -> Prestamo:
@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _reparar_indice_busqueda(sender, using, **kwargs):
+    from django.db import connections
+    from .infrastructure.search import reparar_indice_empleados
+
+    reparar_indice_empleados(connections[using])
+
 
 class RadioFrecuenciasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"                      # nombre del paquete de tu app
     verbose_name = "Radio Frecuencias"
+
+    def ready(self):
+        # Sin `sender`: esta app no tiene models.py (los modelos viven en infrastructure),
+        # por lo que Django no emite post_migrate a su nombre. La reparación es idempotente.
+        post_migrate.connect(_reparar_indice_busqueda, dispatch_uid="prs_reparar_indice_empleados")
+
+        from .infrastructure.roles import conectar_invalidacion
+        from .infrastructure.token_denylist import conectar_revocacion
+
+        conectar_invalidacion()
+        conectar_revocacion()
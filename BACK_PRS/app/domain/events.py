@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from .entities import Prestamo
+
 @dataclass(frozen=True)
 class AdminChangeEvent:
     """
@@ -10,10 +12,21 @@ class AdminChangeEvent:
     No define 'cómo' se persiste; solo qué pasó.
     """
     aggregate: str            # "Empleado" | "RadioFrecuencia" | "SapUsuario"
-    action: str               # "CREATED" | "UPDATED" | "DELETED"
+    action: str               # "CREATED" | "UPDATED" | "DELETED" | "SYNC" (resumen de importación)
     id_ref: str               # clave de negocio (cedula, codigo, username)
     at: datetime
     actor_user_id: int
     before: Optional[Dict[str, Any]] = None
     after: Optional[Dict[str, Any]] = None
-    reason: Optional[str] = None
\ No newline at end of file
+    reason: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PrestamoEvent:
+    """
+    Evento de dominio emitido al asignar o devolver un préstamo.
+    Los suscriptores (canal push, contadores, etc.) lo reciben tras el commit.
+    """
+    action: str               # "ASIGNADO" | "DEVUELTO"
+    prestamo: Prestamo
+    at: datetime
@@ -5,7 +5,7 @@ from .entities import Empleado, RadioFrecuencia, SapUsuario, Prestamo
 from .value_objects import Turno, EstadoPrestamo, Cedula, CodigoRF, Username
 from .rules import calcular_turno, clean_doc, clean_sap, clean_rf
 from .errors import DomainError, EntityNotFound, InactiveEntity, BusinessRuleViolation
-from .events import AdminChangeEvent
+from .events import AdminChangeEvent, PrestamoEvent
 
 # Puertos
 from .ports.repositories import (
@@ -16,6 +16,7 @@ from .ports.repositories import (
 )
 from .ports.audit import AuditLogRepository
 from .ports.uow import UnitOfWork
+from .ports.events import PrestamoEventPublisher
 
 __all__ = [
     # Entities
@@ -27,8 +28,8 @@ __all__ = [
     # Errors
     "DomainError", "EntityNotFound", "InactiveEntity", "BusinessRuleViolation",
     # Events
-    "AdminChangeEvent",
+    "AdminChangeEvent", "PrestamoEvent",
     # Ports
     "EmpleadoRepository", "RadioRepository", "SapUsuarioRepository", "PrestamoRepository",
-    "AuditLogRepository", "UnitOfWork",
+    "AuditLogRepository", "UnitOfWork", "PrestamoEventPublisher",
 ]
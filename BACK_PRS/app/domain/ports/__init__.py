@@ -6,6 +6,9 @@ adapters in infrastructure can implement them and interfaces can wire them.
 
 from .repositories import (  # noqa: F401
     EmpleadoRepository,
+    FiltrosPrestamo,
+    LoteCambios,
+    Pagina,
     PrestamoRepository,
     RadioRepository,
     SapUsuarioRepository,
@@ -13,6 +16,9 @@ from .repositories import (  # noqa: F401
 
 __all__ = [
     "EmpleadoRepository",
+    "FiltrosPrestamo",
+    "LoteCambios",
+    "Pagina",
     "PrestamoRepository",
     "RadioRepository",
     "SapUsuarioRepository",
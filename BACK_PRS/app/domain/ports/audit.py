@@ -1,10 +1,37 @@
 from __future__ import annotations
-from typing import Protocol
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Protocol, Tuple
 from ..events import AdminChangeEvent
+from .repositories import Pagina
+
+
+@dataclass(frozen=True)
+class FiltrosAuditoria:
+    """Criterios de consulta de la auditoría. `hasta` es exclusivo."""
+    aggregate: Optional[str] = None
+    action: Optional[str] = None
+    id_ref: Optional[str] = None
+    actor_user_id: Optional[int] = None
+    desde: Optional[datetime] = None
+    hasta: Optional[datetime] = None
+
 
 class AuditLogRepository(Protocol):
     """
     Puerto para persistir auditorías de cambios administrativos.
     La implementación (ORM/cola/log) se define en infraestructura.
     """
-    def append(self, event: AdminChangeEvent) -> None: ...
\ No newline at end of file
+    def append(self, event: AdminChangeEvent) -> None: ...
+    def append_many(self, events: Iterable[AdminChangeEvent]) -> None: ...
+
+
+class AuditLogReader(Protocol):
+    """Consulta del histórico de auditoría, los eventos más recientes primero."""
+    def listar_pagina(
+        self,
+        filtros: Optional[FiltrosAuditoria] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+    ) -> Pagina[Dict[str, Any]]: ...
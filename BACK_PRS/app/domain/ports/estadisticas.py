@@ -0,0 +1,37 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import FrozenSet, List, Optional, Protocol
+from ..value_objects import Turno
+
+# Dimensiones por las que puede agruparse el reporte
+DIMENSIONES = ("dia", "turno", "radio")
+
+
+@dataclass(frozen=True)
+class FiltrosEstadisticas:
+    """Rango de días locales (ambos inclusivos) y filtros opcionales del reporte."""
+    desde: date
+    hasta: date
+    turno: Optional[Turno] = None
+    codigo_radio: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class EstadisticaPrestamos:
+    """
+    Fila del reporte. Las dimensiones no agrupadas quedan en None. La duración
+    promedio considera solo los préstamos ya devueltos.
+    """
+    fecha: Optional[date]
+    turno: Optional[str]
+    codigo_radio: Optional[str]
+    prestamos: int
+    devueltos: int
+    duracion_promedio_segundos: Optional[float]
+
+
+class EstadisticasPrestamosReader(Protocol):
+    """Consulta de las estadísticas diarias de préstamos ya consolidadas."""
+    def consultar(self, filtros: FiltrosEstadisticas, agrupar: FrozenSet[str]) -> List[EstadisticaPrestamos]: ...
+    def actualizado_hasta(self) -> Optional[datetime]: ...
@@ -0,0 +1,17 @@
+from __future__ import annotations
+from typing import Protocol
+from ..events import PrestamoEvent
+
+class PrestamoEventPublisher(Protocol):
+    """
+    Puerto para difundir eventos de préstamos a interesados externos.
+    La implementación decide el transporte y debe publicar solo si la transacción confirma.
+    """
+    def publish(self, event: PrestamoEvent) -> None: ...
+
+class CatalogChangeListener(Protocol):
+    """
+    Puerto para enterarse de cambios en catálogos (Empleado, RadioFrecuencia, SapUsuario),
+    p. ej. para invalidar cachés. `aggregate` usa los mismos nombres que la auditoría.
+    """
+    def catalogo_cambiado(self, aggregate: str, id_ref: str) -> None: ...
@@ -1,31 +1,101 @@
 from __future__ import annotations
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Protocol
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Protocol, Tuple, TypeVar
 from ..entities import Empleado, Prestamo, RadioFrecuencia, SapUsuario
+from ..value_objects import EstadoPrestamo, Turno
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Pagina(Generic[T]):
+    """
+    Página de resultados con paginación por llave (keyset).
+    `siguiente` es la llave de orden del último item; None si no hay más.
+    """
+    items: List[T] = field(default_factory=list)
+    siguiente: Optional[Tuple[Any, ...]] = None
+
+    @property
+    def hay_mas(self) -> bool:
+        return self.siguiente is not None
+
+
+@dataclass(frozen=True)
+class LoteCambios(Generic[T]):
+    """
+    Lote de un feed incremental. `token` es la posición alcanzada (llave del último
+    item entregado, o el token recibido si no hubo cambios).
+    """
+    items: List[T] = field(default_factory=list)
+    token: Optional[Tuple[Any, ...]] = None
+    hay_mas: bool = False
+
+
+# Columnas (y orden) de las filas planas de `PrestamoRepository.iterar_filas`
+COLUMNAS_EXPORTACION = (
+    "id", "cedula", "empleado_nombre", "usuario_sap", "codigo_radio", "turno", "estado",
+    "fecha_hora_prestamo", "fecha_hora_devolucion", "usuario_registra_username",
+)
+
+
+@dataclass(frozen=True)
+class FiltrosPrestamo:
+    """Criterios de búsqueda del histórico. `hasta` es exclusivo."""
+    cedula: Optional[str] = None
+    codigo_radio: Optional[str] = None
+    usuario_sap: Optional[str] = None
+    empleado_nombre: Optional[str] = None
+    estado: Optional[EstadoPrestamo] = None
+    turno: Optional[Turno] = None
+    desde: Optional[datetime] = None
+    hasta: Optional[datetime] = None
+
 
 class EmpleadoRepository(Protocol):
     def obtener_por_cedula(self, cedula: str) -> Optional[Empleado]: ...
+    def obtener_por_cedulas(self, cedulas: Iterable[str]) -> Dict[str, Empleado]: ...
     def listar(self, q: Optional[str] = None) -> List[Empleado]: ...
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[Empleado]: ...
     def crear(self, *, cedula: str, nombre: str, activo: bool = True) -> Empleado: ...
     def actualizar(self, *, cedula: str, cambios: Dict[str, object]) -> Empleado: ...
     def eliminar(self, *, cedula: str) -> None: ...
+    def crear_lote(self, empleados: List[Empleado]) -> None: ...
+    def actualizar_lote(self, empleados: List[Empleado]) -> None: ...
+    def cedulas_activas(self) -> Iterable[str]: ...
+    def desactivar_lote(self, cedulas: Iterable[str]) -> int: ...
+    def version(self) -> str: ...
 
 class RadioRepository(Protocol):
     def obtener_por_codigo(self, codigo: str) -> Optional[RadioFrecuencia]: ...
+    def obtener_por_codigos(self, codigos: Iterable[str]) -> Dict[str, RadioFrecuencia]: ...
     def listar(self, q: Optional[str] = None) -> List[RadioFrecuencia]: ...
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[RadioFrecuencia]: ...
     def crear(self, *, codigo: str, descripcion: Optional[str] = None, activo: bool = True) -> RadioFrecuencia: ...
     def actualizar(self, *, codigo: str, cambios: Dict[str, object]) -> RadioFrecuencia: ...
     def eliminar(self, *, codigo: str) -> None: ...
+    def crear_lote(self, radios: List[RadioFrecuencia]) -> None: ...
+    def actualizar_lote(self, radios: List[RadioFrecuencia]) -> None: ...
+    def version(self) -> str: ...
 
 class SapUsuarioRepository(Protocol):
     def obtener_por_username(self, username: str) -> Optional[SapUsuario]: ...
+    def obtener_por_usernames(self, usernames: Iterable[str]) -> Dict[str, SapUsuario]: ...
     def listar(self, q: Optional[str] = None) -> List[SapUsuario]: ...
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[SapUsuario]: ...
     def crear(self, *, username: str, empleado_cedula: Optional[str] = None, activo: bool = True) -> SapUsuario: ...
     def actualizar(self, *, username: str, cambios: Dict[str, object]) -> SapUsuario: ...
     def eliminar(self, *, username: str) -> None: ...
+    def crear_lote(self, usuarios: List[SapUsuario]) -> None: ...
+    def actualizar_lote(self, usuarios: List[SapUsuario]) -> None: ...
+    def activos_por_empleados(self, cedulas: Iterable[str]) -> List[str]: ...
+    def desactivar_lote(self, usernames: Iterable[str]) -> int: ...
+    def version(self) -> str: ...
 
 class PrestamoRepository(Protocol):
     def crear(self, prestamo: Prestamo) -> Prestamo: ...
+    def crear_lote(self, prestamos: List[Prestamo]) -> List[Prestamo]: ...
     def obtener_prestamo_abierto(
         self,
         *,
@@ -33,5 +103,39 @@ class PrestamoRepository(Protocol):
         usuario_sap: Optional[str] = None,
         codigo_radio: Optional[str] = None,
     ) -> Optional[Prestamo]: ...
+    def obtener_conflictos_abiertos(
+        self,
+        *,
+        cedula: Optional[str] = None,
+        usuario_sap: Optional[str] = None,
+        codigo_radio: Optional[str] = None,
+    ) -> List[Prestamo]: ...
+    def obtener_abiertos(
+        self,
+        *,
+        cedulas: Iterable[str] = (),
+        usuarios_sap: Iterable[str] = (),
+        codigos_radio: Iterable[str] = (),
+    ) -> List[Prestamo]: ...
     def marcar_devolucion(self, id_: int, fecha_hora: datetime) -> Prestamo: ...
-    def listar(self, *, cedula: Optional[str] = None, codigo_radio: Optional[str] = None) -> List[Prestamo]: ...
+    def marcar_devolucion_lote(self, ids: Iterable[int], fecha_hora: datetime) -> List[Prestamo]: ...
+    def listar(self, filtros: Optional[FiltrosPrestamo] = None) -> List[Prestamo]: ...
+    def listar_pagina(
+        self,
+        filtros: Optional[FiltrosPrestamo] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+    ) -> Pagina[Prestamo]: ...
+    def listar_cambios(
+        self,
+        filtros: Optional[FiltrosPrestamo] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+        hasta: datetime,
+    ) -> LoteCambios[Prestamo]: ...
+    def token_cambios(self, *, hasta: datetime) -> Optional[Tuple[datetime, int]]: ...
+    def iterar_filas(
+        self, filtros: Optional[FiltrosPrestamo] = None, *, chunk_size: int = 2000
+    ) -> Iterator[Tuple[Any, ...]]: ...
@@ -9,4 +9,13 @@ class UnitOfWork(Protocol, ContextManager["UnitOfWork"]):
     def commit(self) -> None: ...
     def rollback(self) -> None: ...
     def __enter__(self) -> "UnitOfWork": ...
-    def __exit__(self, exc_type, exc, tb) -> None: ...
\ No newline at end of file
+    def __exit__(self, exc_type, exc, tb) -> None: ...
+
+class TransactionParticipant(Protocol):
+    """
+    Recurso que acumula trabajo durante la unidad de trabajo más externa y lo
+    vuelca justo antes de confirmarla (p. ej. auditoría en lote).
+    """
+    def begin(self) -> None: ...
+    def before_commit(self) -> None: ...
+    def rollback(self) -> None: ...
@@ -0,0 +1,327 @@
+"""
+Infraestructura :: Escritura de auditoría en lote.
+
+`BufferedAuditLogRepository` acumula los `AdminChangeEvent` de la unidad de trabajo
+en curso (por hilo) y los inserta con un único `bulk_create` justo antes de que
+`DjangoUnitOfWork` confirme, dentro de la misma transacción: si el cambio se
+revierte, su auditoría también. Fuera de una unidad de trabajo escribe directo.
+
+Con `MODE = "background"` (`PRS_AUDIT`), el volcado se entrega tras el commit a
+`BackgroundAuditWriter`: un hilo que vacía una cola acotada por lotes. La request
+no paga el INSERT, a cambio de que la auditoría deje de ser atómica con el cambio
+(una caída del proceso puede perder lo encolado). Si la cola se llena, el evento se
+escribe en el hilo de la request: nunca se descarta. Un lote que falla (p. ej.
+"database is locked") se reintenta con espera exponencial y no se da por escrito
+hasta lograrlo; agotados `MAX_RETRIES` intentos se vuelca a un JSONL en
+`SPILL_DIR`, que el hilo reinserta (y borra) en cuanto la base vuelve a aceptar
+escrituras. Al apagar el proceso (`atexit`) se drena lo pendiente.
+
+`ActorUsernameMap` resuelve `actor_user_id` -> username para la consulta de la
+auditoría con una caché TTL del proceso: cada página consulta solo los ids que
+no ha visto recientemente.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from ..domain.events import AdminChangeEvent
+from ..domain.ports.uow import TransactionParticipant
+from .catalog_cache import TTLCache
+from .repositories import BULK_BATCH_SIZE, DjangoAuditLogRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "MODE": "sync",               # "sync" | "background"
+    "QUEUE_SIZE": 10000,
+    "BATCH_SIZE": BULK_BATCH_SIZE,
+    "FLUSH_INTERVAL_SECONDS": 1.0,
+    "MAX_RETRIES": 5,             # intentos por lote antes de volcarlo a SPILL_DIR
+    "RETRY_BACKOFF_SECONDS": 0.5, # espera inicial; se duplica en cada intento
+    "SPILL_DIR": None,            # por defecto BASE_DIR / "auditoria_pendiente"
+    "USERNAME_TTL_SECONDS": 300.0,
+    "RETENTION_DAYS": 180,
+    "ARCHIVE_DIR": None,          # por defecto BASE_DIR / "archivo_auditoria"
+}
+
+_SIN_CACHE = object()  # distingue "no cacheado" de un actor cacheado como None
+
+MAX_BACKOFF_SECONDS = 30.0
+PREFIJO_DERRAME = "pendiente-"
+
+
+def _evento_a_json(event: AdminChangeEvent) -> str:
+    return json.dumps({**asdict(event), "at": event.at.isoformat()}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _evento_de_json(linea: str) -> AdminChangeEvent:
+    row = json.loads(linea)
+    return AdminChangeEvent(**{**row, "at": datetime.fromisoformat(row["at"])})
+
+
+class BackgroundAuditWriter:
+    """Hilo único que inserta la auditoría encolada en lotes de `batch_size`."""
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10000,
+        batch_size: int = BULK_BATCH_SIZE,
+        flush_interval: float = 1.0,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        spill_dir: Optional[os.PathLike] = None,
+        repo: Optional[DjangoAuditLogRepository] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.repo = repo or DjangoAuditLogRepository()
+        self._queue: "queue.Queue[AdminChangeEvent]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._hay_derrames = False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="prs-audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def submit(self, events: Iterable[AdminChangeEvent]) -> None:
+        self._ensure_started()
+        pendientes = list(events)
+        for i, event in enumerate(pendientes):
+            try:
+                self._queue.put(event, timeout=self.flush_interval)
+            except queue.Full:
+                # Contrapresión: se escribe en el hilo llamador en lugar de perder eventos
+                logger.warning("Cola de auditoría llena; escribiendo %d eventos en línea", len(pendientes) - i)
+                self.repo.append_many(pendientes[i:])
+                return
+
+    def _drenar(self, primero: AdminChangeEvent) -> List[AdminChangeEvent]:
+        lote = [primero]
+        while len(lote) < self.batch_size:
+            try:
+                lote.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _escribir(self, lote: List[AdminChangeEvent]) -> None:
+        """
+        Inserta el lote reintentando con espera exponencial. Los eventos solo se
+        marcan como hechos (`task_done`) cuando quedaron en la base o en disco.
+        """
+        intento = 0
+        while True:
+            try:
+                self.repo.append_many(lote)
+                break
+            except Exception:
+                intento += 1
+                connection.close()  # una conexión rota se reabre en el siguiente intento
+                if intento >= self.max_retries:
+                    if self._derramar(lote):
+                        self._hay_derrames = True
+                        break
+                    if self._stop.is_set():
+                        # Apagando, sin base ni disco: último recurso, los eventos quedan en el log
+                        logger.critical(
+                            "Auditoría no escrita:\n%s", "\n".join(_evento_a_json(e) for e in lote)
+                        )
+                        break
+                espera = min(self.retry_backoff * 2 ** (intento - 1), MAX_BACKOFF_SECONDS)
+                logger.warning(
+                    "No fue posible escribir %d eventos de auditoría (intento %d); reintento en %.1fs",
+                    len(lote), intento, espera, exc_info=True,
+                )
+                # Al apagar no se espera: se reintenta de inmediato hasta derramar
+                self._stop.wait(espera)
+        if self._hay_derrames and not intento:
+            self._reinsertar_derrames()  # la base volvió: se recupera lo volcado a disco
+        for _ in lote:
+            self._queue.task_done()
+
+    # --------- Derrame a disco ---------
+    def _derrames(self) -> List[Path]:
+        if self.spill_dir is None or not self.spill_dir.is_dir():
+            return []
+        return sorted(self.spill_dir.glob(f"{PREFIJO_DERRAME}*.jsonl"))
+
+    def _derramar(self, lote: List[AdminChangeEvent]) -> bool:
+        if self.spill_dir is None:
+            return False
+        ruta = self.spill_dir / f"{PREFIJO_DERRAME}{datetime.now(dt_timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl"
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            with open(ruta, "w", encoding="utf-8") as fh:
+                fh.write("".join(_evento_a_json(e) + "\n" for e in lote))
+                fh.flush()
+                os.fsync(fh.fileno())
+        except OSError:
+            logger.exception("No fue posible volcar %d eventos de auditoría a %s", len(lote), ruta)
+            return False
+        logger.error("Base no disponible: %d eventos de auditoría volcados a %s", len(lote), ruta)
+        return True
+
+    def _reinsertar_derrames(self) -> None:
+        """Reinserta los lotes volcados a disco; cada archivo se borra tras su INSERT."""
+        self._hay_derrames = False
+        for ruta in self._derrames():
+            try:
+                with open(ruta, encoding="utf-8") as fh:
+                    eventos = [_evento_de_json(linea) for linea in fh if linea.strip()]
+                self.repo.append_many(eventos)
+            except Exception:
+                logger.warning("No fue posible reinsertar la auditoría de %s", ruta, exc_info=True)
+                self._hay_derrames = True
+                return
+            ruta.unlink()
+            logger.info("Reinsertados %d eventos de auditoría desde %s", len(eventos), ruta)
+
+    def _run(self) -> None:
+        try:
+            self._reinsertar_derrames()  # lo que haya quedado de una corrida anterior
+            while not self._stop.is_set():
+                try:
+                    primero = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                self._escribir(self._drenar(primero))
+        finally:
+            connection.close()  # conexión propia del hilo
+
+    def flush(self) -> None:
+        """Espera a que se escriba todo lo encolado hasta ahora."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo y escribe en el hilo actual lo que haya quedado en la cola."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        resto: List[AdminChangeEvent] = []
+        while True:
+            try:
+                resto.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for i in range(0, len(resto), self.batch_size):
+            self._escribir(resto[i:i + self.batch_size])
+        self._thread = None
+        self._stop.clear()
+
+
+class BufferedAuditLogRepository(DjangoAuditLogRepository, TransactionParticipant):
+    """Participante de `DjangoUnitOfWork`: un `bulk_create` por unidad de trabajo."""
+
+    def __init__(self, writer: Optional[BackgroundAuditWriter] = None) -> None:
+        self.writer = writer
+        self._local = threading.local()
+
+    @classmethod
+    def from_settings(cls) -> "BufferedAuditLogRepository":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_AUDIT", {})}
+        writer = None
+        if conf["MODE"] == "background":
+            writer = BackgroundAuditWriter(
+                queue_size=conf["QUEUE_SIZE"],
+                batch_size=conf["BATCH_SIZE"],
+                flush_interval=conf["FLUSH_INTERVAL_SECONDS"],
+                max_retries=conf["MAX_RETRIES"],
+                retry_backoff=conf["RETRY_BACKOFF_SECONDS"],
+                spill_dir=conf["SPILL_DIR"] or Path(settings.BASE_DIR) / "auditoria_pendiente",
+            )
+        elif conf["MODE"] != "sync":
+            raise ValueError(f"PRS_AUDIT.MODE inválido: {conf['MODE']!r}")
+        return cls(writer)
+
+    def _buffer(self) -> Optional[List[AdminChangeEvent]]:
+        return getattr(self._local, "buffer", None)
+
+    def _entregar(self, events: List[AdminChangeEvent]) -> None:
+        if not events:
+            return
+        if self.writer is None:
+            super().append_many(events)
+        else:
+            transaction.on_commit(lambda: self.writer.submit(events))
+
+    # --------- AuditLogRepository ---------
+    def append(self, event: AdminChangeEvent) -> None:
+        self.append_many([event])
+
+    def append_many(self, events: Iterable[AdminChangeEvent]) -> None:
+        buffer = self._buffer()
+        if buffer is None:
+            self._entregar(list(events))
+        else:
+            buffer.extend(events)
+
+    # --------- TransactionParticipant ---------
+    def begin(self) -> None:
+        self._local.buffer = []
+
+    def before_commit(self) -> None:
+        buffer, self._local.buffer = self._buffer(), None
+        self._entregar(buffer or [])
+
+    def rollback(self) -> None:
+        self._local.buffer = None
+
+
+class ActorUsernameMap:
+    """Mapa id -> username de los actores de la auditoría, cacheado con TTL."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 5000) -> None:
+        self._cache = TTLCache(ttl_seconds, max_entries)
+
+    @classmethod
+    def from_settings(cls) -> "ActorUsernameMap":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_AUDIT", {})}
+        return cls(ttl_seconds=conf["USERNAME_TTL_SECONDS"])
+
+    def resolver(self, ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        resultado: Dict[int, Optional[str]] = {}
+        faltantes = set()
+        for id_ in set(ids):
+            username = self._cache.get(id_, _SIN_CACHE)
+            if username is _SIN_CACHE:
+                faltantes.add(id_)
+            else:
+                resultado[id_] = username
+        if faltantes:
+            encontrados = dict(get_user_model().objects.filter(id__in=faltantes).values_list("id", "username"))
+            for id_ in faltantes:
+                # Los ids sin usuario (eliminados) también se cachean, como None
+                resultado[id_] = encontrados.get(id_)
+                self._cache.set(id_, resultado[id_])
+        return resultado
+
+    def invalidar(self) -> None:
+        self._cache.clear()
+
@@ -0,0 +1,201 @@
+"""
+Infraestructura :: Retención y archivo de la auditoría.
+
+`ArchivoAuditoria` mueve las entradas de `audit_log` más antiguas que el
+horizonte de retención a archivos JSONL comprimidos con gzip, uno por mes (UTC):
+`audit_log-AAAA-MM.jsonl.gz`. Trabaja por lotes en orden (at, id): escribe el lote
+en su partición, fuerza el volcado a disco y solo entonces lo borra de la tabla
+en una transacción corta. Cada lote se agrega como un miembro gzip nuevo, así que
+un mes puede completarse en varias corridas sin reescribir el archivo.
+
+Si el proceso cae entre la escritura y el borrado, la siguiente corrida vuelve a
+archivar ese lote; la lectura descarta los ids repetidos.
+
+La lectura (`listar_pagina`) implementa el mismo contrato que la tabla viva:
+solo abre las particiones que cruzan el rango pedido y se detiene al completar
+la página.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from ..domain.ports.audit import AuditLogReader, FiltrosAuditoria
+from ..domain.ports.repositories import Pagina
+from .audit import DEFAULTS
+from .models import AuditEntry
+from .repositories import DjangoAuditLogRepository
+
+PREFIJO = "audit_log-"
+EXTENSION = ".jsonl.gz"
+_PATRON = re.compile(rf"^{PREFIJO}(\d{{4}})-(\d{{2}}){re.escape(EXTENSION)}$")
+
+Llave = Tuple[datetime, int]  # (at, id)
+
+
+@dataclass
+class ResumenArchivo:
+    archivados: int = 0
+    particiones: Set[str] = field(default_factory=set)
+    simulado: bool = False
+
+
+def _particion(at: datetime) -> str:
+    return at.astimezone(dt_timezone.utc).strftime("%Y-%m")
+
+
+def _rango_particion(particion: str) -> Tuple[datetime, datetime]:
+    anio, mes = (int(x) for x in particion.split("-"))
+    inicio = datetime(anio, mes, 1, tzinfo=dt_timezone.utc)
+    fin = datetime(anio + mes // 12, mes % 12 + 1, 1, tzinfo=dt_timezone.utc)
+    return inicio, fin
+
+
+def _a_json(row: Dict[str, Any]) -> str:
+    return json.dumps({**row, "at": row["at"].isoformat()}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _cumple(row: Dict[str, Any], filtros: Optional[FiltrosAuditoria]) -> bool:
+    if not filtros:
+        return True
+    return not (
+        (filtros.aggregate and row["aggregate"] != filtros.aggregate)
+        or (filtros.action and row["action"] != filtros.action)
+        or (filtros.id_ref and row["id_ref"] != filtros.id_ref)
+        or (filtros.actor_user_id is not None and row["actor_user_id"] != filtros.actor_user_id)
+        or (filtros.desde and row["at"] < filtros.desde)
+        or (filtros.hasta and row["at"] >= filtros.hasta)
+    )
+
+
+class ArchivoAuditoria(AuditLogReader):
+    def __init__(self, directorio: os.PathLike) -> None:
+        self.directorio = Path(directorio)
+
+    @classmethod
+    def from_settings(cls) -> "ArchivoAuditoria":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_AUDIT", {})}
+        return cls(conf["ARCHIVE_DIR"] or Path(settings.BASE_DIR) / "archivo_auditoria")
+
+    @staticmethod
+    def horizonte(dias: int, ahora: Optional[datetime] = None) -> datetime:
+        """Instante a partir del cual la auditoría se conserva en la tabla viva."""
+        return (ahora or datetime.now(dt_timezone.utc)) - timedelta(days=dias)
+
+    def ruta(self, particion: str) -> Path:
+        return self.directorio / f"{PREFIJO}{particion}{EXTENSION}"
+
+    def particiones(self) -> List[str]:
+        if not self.directorio.is_dir():
+            return []
+        encontradas = (_PATRON.match(p.name) for p in self.directorio.iterdir())
+        return sorted(f"{m.group(1)}-{m.group(2)}" for m in encontradas if m)
+
+    # --------- Escritura ---------
+    def _escribir(self, particion: str, rows: List[Dict[str, Any]]) -> None:
+        with open(self.ruta(particion), "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                gz.write("".join(_a_json(r) + "\n" for r in rows).encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    def archivar(
+        self,
+        antes_de: datetime,
+        *,
+        tamano_lote: int = 5000,
+        simular: bool = False,
+        progreso: Optional[Callable[[ResumenArchivo], None]] = None,
+    ) -> ResumenArchivo:
+        """Mueve al archivo las entradas con `at` anterior a `antes_de`."""
+        resumen = ResumenArchivo(simulado=simular)
+        if not simular:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+        qs = AuditEntry.objects.filter(at__lt=antes_de).order_by("at", "id")
+        ultimo: Optional[Llave] = None
+        while True:
+            lote_qs = qs
+            if simular and ultimo:
+                # Sin borrar, se avanza por llave para no releer el mismo lote
+                at, id_ = ultimo
+                lote_qs = qs.filter(at__gte=at).exclude(at=at, id__lte=id_)
+            rows = list(lote_qs.values(*DjangoAuditLogRepository.CAMPOS)[:tamano_lote])
+            if not rows:
+                break
+
+            por_particion: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                por_particion.setdefault(_particion(row["at"]), []).append(row)
+            if not simular:
+                for particion, grupo in por_particion.items():
+                    self._escribir(particion, grupo)
+                with transaction.atomic():
+                    AuditEntry.objects.filter(id__in=[r["id"] for r in rows]).delete()
+
+            resumen.archivados += len(rows)
+            resumen.particiones.update(por_particion)
+            ultimo = (rows[-1]["at"], rows[-1]["id"])
+            if progreso:
+                progreso(resumen)
+        return resumen
+
+    # --------- Lectura ---------
+    def _leer(self, particion: str) -> Iterator[Dict[str, Any]]:
+        with gzip.open(self.ruta(particion), "rt", encoding="utf-8") as fh:
+            for linea in fh:
+                if linea.strip():
+                    row = json.loads(linea)
+                    row["at"] = datetime.fromisoformat(row["at"])
+                    yield row
+
+    def listar_pagina(
+        self,
+        filtros: Optional[FiltrosAuditoria] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Llave] = None,
+    ) -> Pagina[Dict[str, Any]]:
+        """
+        Keyset sobre (at, id) descendente, como la tabla viva. Se recorren las
+        particiones de la más reciente a la más antigua, descartando por nombre
+        las que quedan fuera del rango, y se cargan solo las filas que cumplen
+        los filtros de cada partición abierta.
+        """
+        items: List[Dict[str, Any]] = []
+        for particion in reversed(self.particiones()):
+            inicio, fin = _rango_particion(particion)
+            if filtros and filtros.hasta and inicio >= filtros.hasta:
+                continue
+            if despues_de and inicio > despues_de[0]:
+                continue
+            if filtros and filtros.desde and fin <= filtros.desde:
+                break
+
+            vistos: Set[int] = set()
+            filas = []
+            for row in self._leer(particion):
+                if row["id"] in vistos or not _cumple(row, filtros):
+                    continue
+                if despues_de and (row["at"], row["id"]) >= despues_de:
+                    continue
+                vistos.add(row["id"])
+                filas.append(row)
+            filas.sort(key=lambda r: (r["at"], r["id"]), reverse=True)
+            items.extend(filas)
+            if len(items) > limite:
+                break
+
+        siguiente = None
+        if len(items) > limite:
+            items = items[:limite]
+            siguiente = (items[-1]["at"], items[-1]["id"])
+        return Pagina(items=items, siguiente=siguiente)
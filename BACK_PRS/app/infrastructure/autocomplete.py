@@ -0,0 +1,136 @@
+"""
+Infraestructura :: Índice de prefijos para autocompletar en la mesa de préstamos.
+
+Por cada tipo (cédula, código de radio, usuario SAP) mantiene una lista ordenada
+de llaves normalizadas de los registros ACTIVOS; una sugerencia es un `bisect`
+más un recorrido de a lo sumo `limite` elementos, sin tocar la base de datos.
+
+Cada tipo se construye de forma perezosa en su primera consulta; después las
+sugerencias nunca consultan la base. Un hilo (`RefrescoPeriodico`) recarga los
+tipos en uso cada `max_age_seconds`, para acotar el desfase frente a cambios
+hechos por admin o imports, y en cuanto `CatalogosService` notifica un cambio
+(al confirmar). Mientras tanto se sigue sirviendo la lista anterior.
+
+Cada tipo tiene un número de generación, como `CatalogCache`: invalidar lo
+incrementa y una carga que empezó antes no se guarda (podría ser vieja); la
+recarga pedida por la invalidación la reemplaza.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from ..domain.ports.events import CatalogChangeListener
+from .models import EmpleadoModel, RadioFrecuenciaModel, SapUsuarioModel
+from .open_loans import OpenLoanIndex
+from .refresco import RefrescoPeriodico
+
+CEDULA = "cedula"
+CODIGO_RADIO = "codigo_radio"
+USUARIO_SAP = "usuario_sap"
+TIPOS = (CEDULA, CODIGO_RADIO, USUARIO_SAP)
+
+# Tipos afectados por cambios en cada catálogo (la etiqueta SAP muestra la cédula del empleado)
+_AFECTADOS = {
+    "Empleado": (CEDULA, USUARIO_SAP),
+    "RadioFrecuencia": (CODIGO_RADIO,),
+    "SapUsuario": (USUARIO_SAP,),
+}
+
+
+@dataclass(frozen=True)
+class Sugerencia:
+    valor: str
+    etiqueta: Optional[str]
+    prestado: bool
+
+
+class _Lista:
+    __slots__ = ("llaves", "filas")
+
+    def __init__(self, filas: List[Tuple[str, str, Optional[str]]]) -> None:
+        filas.sort(key=lambda f: f[0])
+        self.llaves = [f[0] for f in filas]
+        self.filas = filas
+
+
+def _normalizar(valor: str) -> str:
+    return valor.strip().casefold()
+
+
+def _cargar(tipo: str) -> List[Tuple[str, str, Optional[str]]]:
+    """(llave normalizada, valor, etiqueta) de los registros activos del tipo."""
+    if tipo == CEDULA:
+        rows = EmpleadoModel.objects.filter(activo=True).values_list("cedula", "nombre")
+    elif tipo == CODIGO_RADIO:
+        rows = RadioFrecuenciaModel.objects.filter(activo=True).values_list("codigo", "descripcion")
+    else:
+        rows = SapUsuarioModel.objects.filter(activo=True).values_list("username", "empleado__cedula")
+    return [(_normalizar(valor), valor, etiqueta) for valor, etiqueta in rows.iterator()]
+
+
+class AutocompleteIndex(CatalogChangeListener):
+    def __init__(self, open_loans: Optional[OpenLoanIndex] = None, max_age_seconds: float = 300.0) -> None:
+        self.open_loans = open_loans
+        self.max_age_seconds = max_age_seconds
+        self._listas: Dict[str, _Lista] = {}
+        self._generaciones: Dict[str, int] = {tipo: 0 for tipo in TIPOS}
+        self._lock = threading.Lock()
+        self._refresco = RefrescoPeriodico(self.recargar, max_age_seconds, "prs-autocomplete")
+
+    # --------- Carga ---------
+    def _cargar_tipo(self, tipo: str) -> _Lista:
+        """Carga la lista del tipo; solo se guarda si no hubo una invalidación mientras tanto."""
+        generacion = self._generaciones[tipo]
+        lista = _Lista(_cargar(tipo))
+        with self._lock:
+            if self._generaciones[tipo] == generacion:
+                self._listas[tipo] = lista
+        return lista
+
+    def recargar(self) -> None:
+        """Recarga los tipos ya consultados en el proceso (hilo de refresco)."""
+        for tipo in list(self._listas):
+            self._cargar_tipo(tipo)
+
+    def _lista(self, tipo: str) -> _Lista:
+        lista = self._listas.get(tipo)
+        if lista is None:
+            lista = self._cargar_tipo(tipo)
+            self._refresco.iniciar()
+        return lista
+
+    def invalidar(self, tipo: str) -> None:
+        with self._lock:
+            self._generaciones[tipo] += 1
+        self._refresco.solicitar()
+
+    def catalogo_cambiado(self, aggregate: str, id_ref: str) -> None:
+        for tipo in _AFECTADOS.get(aggregate, ()):
+            transaction.on_commit(lambda t=tipo: self.invalidar(t))
+
+    def sugerir(self, tipo: str, prefijo: str, limite: int = 10) -> List[Sugerencia]:
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de autocompletado desconocido: {tipo}")
+        clave = _normalizar(prefijo)
+        if not clave:
+            return []
+        lista = self._lista(tipo)
+        filas = []
+        i = bisect_left(lista.llaves, clave)
+        while i < len(lista.llaves) and len(filas) < limite and lista.llaves[i].startswith(clave):
+            filas.append(lista.filas[i])
+            i += 1
+        return [
+            Sugerencia(valor=valor, etiqueta=etiqueta, prestado=self._prestado(tipo, valor))
+            for _, valor, etiqueta in filas
+        ]
+
+    def _prestado(self, tipo: str, valor: str) -> bool:
+        if self.open_loans is None:
+            return False
+        return self.open_loans.esta_abierto(**{tipo: valor})
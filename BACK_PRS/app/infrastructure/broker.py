@@ -0,0 +1,124 @@
+"""
+Infraestructura :: Broker pub/sub para notificaciones push (SSE).
+
+`InMemoryBroker` reparte mensajes entre suscriptores del mismo proceso. Para
+varios workers se reemplaza por un broker externo (Redis, etc.) que implemente
+la misma interfaz (`publish`, `subscribe`) y se configura en `PRS_EVENT_BROKER`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from ..domain.events import PrestamoEvent
+from ..domain.ports.events import PrestamoEventPublisher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROKER = "app.infrastructure.broker.InMemoryBroker"
+
+
+class Subscription:
+    """Cola asíncrona de un suscriptor, ligada al event loop que la creó."""
+
+    def __init__(self, broker: "InMemoryBroker", topic: str, max_queue: int) -> None:
+        self._broker = broker
+        self.topic = topic
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def _offer(self, message: Dict[str, Any]) -> None:
+        # Se ejecuta en el loop del suscriptor: si el cliente va lento se descarta lo más antiguo
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    def deliver(self, message: Dict[str, Any]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._offer, message)
+        except RuntimeError:
+            # Loop cerrado: el cliente se desconectó sin cancelar la suscripción
+            self.close()
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Broker en proceso; `publish` es seguro desde cualquier hilo."""
+
+    def __init__(self, max_queue: int = 100) -> None:
+        self.max_queue = max_queue
+        self._subs: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Debe llamarse desde una corrutina (usa el event loop en ejecución)."""
+        sub = Subscription(self, topic, self.max_queue)
+        with self._lock:
+            self._subs.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.get(sub.topic, set()).discard(sub)
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            subs = list(self._subs.get(topic, ()))
+        for sub in subs:
+            sub.deliver(message)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Instancia única del broker configurado en `PRS_EVENT_BROKER`."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                cls = import_string(getattr(settings, "PRS_EVENT_BROKER", DEFAULT_BROKER))
+                _broker = cls()
+    return _broker
+
+
+class BrokerPrestamoEventPublisher(PrestamoEventPublisher):
+    """
+    Publica eventos de préstamos en el broker una vez confirmada la transacción.
+    `serialize` convierte la entidad al payload JSON que verán los clientes.
+    """
+
+    TOPIC = "prestamos"
+
+    def __init__(self, serialize: Callable[[Any], Dict[str, Any]], broker_factory: Callable[[], Any] = get_broker) -> None:
+        self.serialize = serialize
+        self.broker_factory = broker_factory
+
+    def publish(self, event: PrestamoEvent) -> None:
+        message = {
+            "action": event.action,
+            "at": event.at.isoformat(),
+            "prestamo": self.serialize(event.prestamo),
+        }
+        transaction.on_commit(lambda: self._send(message))
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        try:
+            self.broker_factory().publish(self.TOPIC, message)
+        except Exception:  # el push es best-effort: nunca debe romper el caso de uso
+            logger.exception("No fue posible publicar evento de préstamo")
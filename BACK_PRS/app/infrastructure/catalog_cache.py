@@ -0,0 +1,297 @@
+"""
+Infraestructura :: Caché de catálogos (Empleado, RadioFrecuencia, SapUsuario).
+
+Los repositorios `Cached*Repository` envuelven a los de Django y responden las
+búsquedas por llave (`obtener_por_*`) desde una caché en memoria del proceso con
+TTL y desalojo LRU. Los listados y escrituras pasan directo al repositorio real.
+
+La invalidación llega por `CatalogChangeListener` (lo notifica `CatalogosService`)
+y se aplica al confirmar la transacción. Cada catálogo tiene un número de
+generación: invalidar lo incrementa y las entradas de generaciones anteriores
+dejan de servirse. Si se configura un backend compartido (`SHARED_ALIAS`, un
+alias de `CACHES` como Redis o Memcached) la generación vive allí, de modo que
+todos los workers descartan su copia local ante un cambio hecho en cualquiera.
+Los cambios que no pasan por el servicio (admin, imports) quedan acotados por el TTL.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from ..domain.entities import Empleado, RadioFrecuencia, SapUsuario
+from ..domain.ports.events import CatalogChangeListener
+from ..domain.ports.repositories import EmpleadoRepository, Pagina, RadioRepository, SapUsuarioRepository
+
+DEFAULTS = {
+    "TTL_SECONDS": 60.0,
+    "MAX_ENTRIES": 5000,
+    "SHARED_ALIAS": None,
+}
+
+_AUSENTE = object()  # se cachea también "no existe" para no repetir la consulta
+
+
+class TTLCache:
+    """Diccionario acotado con expiración por entrada y desalojo LRU; seguro entre hilos."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CatalogCache(CatalogChangeListener):
+    """Cachés por catálogo con invalidación por generación (local o compartida)."""
+
+    EMPLEADO = "Empleado"
+    RADIO = "RadioFrecuencia"
+    SAP = "SapUsuario"
+
+    # SapUsuario expone datos del empleado vinculado: un cambio en Empleado también lo invalida
+    _DEPENDENCIAS = {EMPLEADO: (EMPLEADO, SAP), RADIO: (RADIO,), SAP: (SAP,)}
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULTS["TTL_SECONDS"],
+        max_entries: int = DEFAULTS["MAX_ENTRIES"],
+        shared_alias: Optional[str] = DEFAULTS["SHARED_ALIAS"],
+    ) -> None:
+        self.shared_alias = shared_alias
+        self._caches = {
+            nombre: TTLCache(ttl_seconds, max_entries) for nombre in (self.EMPLEADO, self.RADIO, self.SAP)
+        }
+        self._generaciones: Dict[str, int] = {nombre: 0 for nombre in self._caches}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "CatalogCache":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_CATALOG_CACHE", {})}
+        return cls(
+            ttl_seconds=conf["TTL_SECONDS"],
+            max_entries=conf["MAX_ENTRIES"],
+            shared_alias=conf["SHARED_ALIAS"],
+        )
+
+    # --------- Generaciones ---------
+    def _shared_key(self, catalogo: str) -> str:
+        return f"prs:catalogos:{catalogo}:gen"
+
+    def _generacion(self, catalogo: str) -> int:
+        if self.shared_alias is None:
+            return self._generaciones[catalogo]
+        gen = caches[self.shared_alias].get(self._shared_key(catalogo))
+        return 0 if gen is None else int(gen)
+
+    def invalidar(self, catalogo: str) -> None:
+        with self._lock:
+            self._generaciones[catalogo] += 1
+            self._caches[catalogo].clear()
+        if self.shared_alias is not None:
+            backend = caches[self.shared_alias]
+            key = self._shared_key(catalogo)
+            # add() es no-op si ya existe; luego incr() es atómico en Redis/Memcached
+            backend.add(key, 0, timeout=None)
+            try:
+                backend.incr(key)
+            except ValueError:
+                backend.set(key, 1, timeout=None)
+
+    def catalogo_cambiado(self, aggregate: str, id_ref: str) -> None:
+        for catalogo in self._DEPENDENCIAS.get(aggregate, ()):
+            transaction.on_commit(lambda c=catalogo: self.invalidar(c))
+
+    # --------- Lectura ---------
+    def obtener(self, catalogo: str, key: str, cargar: Callable[[str], Any]) -> Any:
+        return self.obtener_varios(catalogo, [key], lambda keys: _uno(cargar, keys)).get(key)
+
+    def obtener_varios(
+        self,
+        catalogo: str,
+        keys: Iterable[str],
+        cargar: Callable[[List[str]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        cache = self._caches[catalogo]
+        gen = self._generacion(catalogo)
+        found: Dict[str, Any] = {}
+        faltantes: List[str] = []
+        for key in set(keys):
+            item = cache.get(key)
+            if item is not None and item[0] == gen:
+                if item[1] is not _AUSENTE:
+                    found[key] = item[1]
+            else:
+                faltantes.append(key)
+        if faltantes:
+            cargados = cargar(faltantes)
+            # Si hubo invalidación mientras se consultaba, no se guarda lo leído (podría ser viejo)
+            if self._generacion(catalogo) == gen:
+                for key in faltantes:
+                    cache.set(key, (gen, cargados.get(key, _AUSENTE)))
+            found.update(cargados)
+        return found
+
+
+def _uno(cargar: Callable[[str], Any], keys: List[str]) -> Dict[str, Any]:
+    value = cargar(keys[0])
+    return {} if value is None else {keys[0]: value}
+
+
+# -----------------------
+# Repositorios con caché
+# -----------------------
+
+class CachedEmpleadoRepository(EmpleadoRepository):
+    def __init__(self, inner: EmpleadoRepository, cache: CatalogCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def obtener_por_cedula(self, cedula: str) -> Optional[Empleado]:
+        return self.cache.obtener(CatalogCache.EMPLEADO, cedula, self.inner.obtener_por_cedula)
+
+    def obtener_por_cedulas(self, cedulas: Iterable[str]) -> Dict[str, Empleado]:
+        return self.cache.obtener_varios(CatalogCache.EMPLEADO, cedulas, self.inner.obtener_por_cedulas)
+
+    def listar(self, q: Optional[str] = None) -> List[Empleado]:
+        return self.inner.listar(q)
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[Empleado]:
+        return self.inner.listar_pagina(q, limite=limite, despues_de=despues_de)
+
+    def crear(self, *, cedula: str, nombre: str, activo: bool = True) -> Empleado:
+        return self.inner.crear(cedula=cedula, nombre=nombre, activo=activo)
+
+    def actualizar(self, *, cedula: str, cambios: Dict[str, object]) -> Empleado:
+        return self.inner.actualizar(cedula=cedula, cambios=cambios)
+
+    def eliminar(self, *, cedula: str) -> None:
+        self.inner.eliminar(cedula=cedula)
+
+    def crear_lote(self, empleados: List[Empleado]) -> None:
+        self.inner.crear_lote(empleados)
+
+    def actualizar_lote(self, empleados: List[Empleado]) -> None:
+        self.inner.actualizar_lote(empleados)
+
+    def cedulas_activas(self) -> Iterable[str]:
+        return self.inner.cedulas_activas()
+
+    def desactivar_lote(self, cedulas: Iterable[str]) -> int:
+        return self.inner.desactivar_lote(cedulas)
+
+    def version(self) -> str:
+        return self.inner.version()
+
+
+class CachedRadioRepository(RadioRepository):
+    def __init__(self, inner: RadioRepository, cache: CatalogCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def obtener_por_codigo(self, codigo: str) -> Optional[RadioFrecuencia]:
+        return self.cache.obtener(CatalogCache.RADIO, codigo, self.inner.obtener_por_codigo)
+
+    def obtener_por_codigos(self, codigos: Iterable[str]) -> Dict[str, RadioFrecuencia]:
+        return self.cache.obtener_varios(CatalogCache.RADIO, codigos, self.inner.obtener_por_codigos)
+
+    def listar(self, q: Optional[str] = None) -> List[RadioFrecuencia]:
+        return self.inner.listar(q)
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[RadioFrecuencia]:
+        return self.inner.listar_pagina(q, limite=limite, despues_de=despues_de)
+
+    def crear(self, *, codigo: str, descripcion: Optional[str] = None, activo: bool = True) -> RadioFrecuencia:
+        return self.inner.crear(codigo=codigo, descripcion=descripcion, activo=activo)
+
+    def actualizar(self, *, codigo: str, cambios: Dict[str, object]) -> RadioFrecuencia:
+        return self.inner.actualizar(codigo=codigo, cambios=cambios)
+
+    def eliminar(self, *, codigo: str) -> None:
+        self.inner.eliminar(codigo=codigo)
+
+    def crear_lote(self, radios: List[RadioFrecuencia]) -> None:
+        self.inner.crear_lote(radios)
+
+    def actualizar_lote(self, radios: List[RadioFrecuencia]) -> None:
+        self.inner.actualizar_lote(radios)
+
+    def version(self) -> str:
+        return self.inner.version()
+
+
+class CachedSapUsuarioRepository(SapUsuarioRepository):
+    def __init__(self, inner: SapUsuarioRepository, cache: CatalogCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def obtener_por_username(self, username: str) -> Optional[SapUsuario]:
+        return self.cache.obtener(CatalogCache.SAP, username, self.inner.obtener_por_username)
+
+    def obtener_por_usernames(self, usernames: Iterable[str]) -> Dict[str, SapUsuario]:
+        return self.cache.obtener_varios(CatalogCache.SAP, usernames, self.inner.obtener_por_usernames)
+
+    def listar(self, q: Optional[str] = None) -> List[SapUsuario]:
+        return self.inner.listar(q)
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[SapUsuario]:
+        return self.inner.listar_pagina(q, limite=limite, despues_de=despues_de)
+
+    def crear(self, *, username: str, empleado_cedula: Optional[str] = None, activo: bool = True) -> SapUsuario:
+        return self.inner.crear(username=username, empleado_cedula=empleado_cedula, activo=activo)
+
+    def actualizar(self, *, username: str, cambios: Dict[str, object]) -> SapUsuario:
+        return self.inner.actualizar(username=username, cambios=cambios)
+
+    def eliminar(self, *, username: str) -> None:
+        self.inner.eliminar(username=username)
+
+    def crear_lote(self, usuarios: List[SapUsuario]) -> None:
+        self.inner.crear_lote(usuarios)
+
+    def actualizar_lote(self, usuarios: List[SapUsuario]) -> None:
+        self.inner.actualizar_lote(usuarios)
+
+    def activos_por_empleados(self, cedulas: Iterable[str]) -> List[str]:
+        return self.inner.activos_por_empleados(cedulas)
+
+    def desactivar_lote(self, usernames: Iterable[str]) -> int:
+        return self.inner.desactivar_lote(usernames)
+
+    def version(self) -> str:
+        return self.inner.version()
@@ -0,0 +1,210 @@
+"""
+Infraestructura :: Estadísticas diarias de préstamos.
+
+`ConsolidacionEstadisticas` mantiene `prestamos_daily_stats`: una fila por día
+local, turno y radio con los préstamos, los devueltos y la suma de duraciones de
+los devueltos. Cada corrida lee solo los préstamos modificados después de la
+marca (updated_at, id) guardada en `consolidacion_marcas`, obtiene los días que
+tocan y recalcula esos días completos desde `prestamos`, con una consulta
+agrupada por tramo de días consecutivos. Recalcular el día entero hace la corrida
+idempotente: la devolución de un préstamo de ayer corrige la fila de ayer, y
+repetir una corrida interrumpida no duplica nada.
+
+Como el feed de cambios, la marca no pasa de `ahora - LAG_SECONDS` para no saltar
+transacciones que confirman tarde. El borrado físico de un préstamo no deja
+rastro en `updated_at`; `--full` reconstruye la tabla completa.
+
+`DjangoEstadisticasPrestamos` responde los reportes leyendo solo la tabla
+consolidada, de modo que su costo no crece con el histórico de préstamos.
+"""
+from __future__ import annotations
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..domain.ports.estadisticas import EstadisticaPrestamos, EstadisticasPrestamosReader, FiltrosEstadisticas
+from ..domain.value_objects import EstadoPrestamo
+from .models import MarcaConsolidacion, PrestamoDiaStat, PrestamoModel
+from .repositories import BULK_BATCH_SIZE
+
+DEFAULTS = {
+    "LAG_SECONDS": 60.0,
+    "DIAS_POR_LOTE": 31,
+}
+
+MARCA = "prestamos_daily_stats"
+
+Token = Tuple[datetime, int]  # (updated_at, id)
+
+_DEVUELTO = Q(estado=EstadoPrestamo.DEVUELTO.value, fecha_hora_devolucion__isnull=False)
+_DURACION = ExpressionWrapper(F("fecha_hora_devolucion") - F("fecha_hora_prestamo"), output_field=DurationField())
+
+
+@dataclass
+class ResumenConsolidacion:
+    dias: List[date] = field(default_factory=list)
+    filas: int = 0
+    marca: Optional[Token] = None
+    simulado: bool = False
+
+
+def _inicio_dia(dia: date) -> datetime:
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
+
+def _tramos(dias: Iterable[date], maximo: int) -> Iterator[List[date]]:
+    """Agrupa los días en tramos consecutivos de a lo sumo `maximo` días."""
+    tramo: List[date] = []
+    for dia in sorted(set(dias)):
+        if tramo and (dia - tramo[-1] != timedelta(days=1) or len(tramo) >= maximo):
+            yield tramo
+            tramo = []
+        tramo.append(dia)
+    if tramo:
+        yield tramo
+
+
+class ConsolidacionEstadisticas:
+    def __init__(self, *, lag_seconds: float = 60.0, dias_por_lote: int = 31) -> None:
+        self.lag_seconds = lag_seconds
+        self.dias_por_lote = dias_por_lote
+
+    @classmethod
+    def from_settings(cls) -> "ConsolidacionEstadisticas":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_ESTADISTICAS", {})}
+        return cls(lag_seconds=conf["LAG_SECONDS"], dias_por_lote=conf["DIAS_POR_LOTE"])
+
+    @staticmethod
+    def marca() -> Optional[Token]:
+        row = MarcaConsolidacion.objects.filter(nombre=MARCA).values_list("updated_at", "ultimo_id").first()
+        return (row[0], row[1]) if row else None
+
+    # --------- Lectura de prestamos ---------
+    @staticmethod
+    def _cambios(despues_de: Optional[Token], hasta: datetime):
+        qs = PrestamoModel.objects.filter(updated_at__lte=hasta).order_by()
+        if despues_de:
+            fecha, id_ = despues_de
+            qs = qs.filter(Q(updated_at__gt=fecha) | Q(updated_at=fecha, id__gt=id_))
+        return qs
+
+    @staticmethod
+    def _agregados(tramo: List[date]) -> List[PrestamoDiaStat]:
+        rows = (
+            PrestamoModel.objects.filter(
+                fecha_hora_prestamo__gte=_inicio_dia(tramo[0]),
+                fecha_hora_prestamo__lt=_inicio_dia(tramo[-1] + timedelta(days=1)),
+            )
+            .annotate(dia=TruncDate("fecha_hora_prestamo"))
+            .values("dia", "turno", "codigo_radio")
+            .annotate(
+                total=Count("id"),
+                total_devueltos=Count("id", filter=_DEVUELTO),
+                total_duracion=Sum(_DURACION, filter=_DEVUELTO),
+            )
+            .order_by()
+        )
+        return [
+            PrestamoDiaStat(
+                fecha=r["dia"],
+                turno=r["turno"],
+                codigo_radio=r["codigo_radio"],
+                prestamos=r["total"],
+                devueltos=r["total_devueltos"],
+                duracion_total=r["total_duracion"] or timedelta(0),
+            )
+            for r in rows.iterator()
+        ]
+
+    # --------- Consolidación ---------
+    def consolidar(
+        self,
+        *,
+        completo: bool = False,
+        simular: bool = False,
+        ahora: Optional[datetime] = None,
+        progreso: Optional[Callable[[ResumenConsolidacion], None]] = None,
+    ) -> ResumenConsolidacion:
+        """
+        Recalcula los días con préstamos modificados desde la marca. Con `completo`
+        recorre todo el histórico y reemplaza la tabla en una sola transacción.
+        """
+        hasta = (ahora or timezone.now()) - timedelta(seconds=self.lag_seconds)
+        anterior = None if completo else self.marca()
+        cambios = self._cambios(anterior, hasta)
+
+        resumen = ResumenConsolidacion(simulado=simular, marca=anterior)
+        marca = cambios.order_by("-updated_at", "-id").values_list("updated_at", "id").first()
+        if marca is None and not completo:
+            return resumen
+        resumen.dias = sorted(cambios.annotate(dia=TruncDate("fecha_hora_prestamo")).values_list("dia", flat=True).distinct())
+
+        with transaction.atomic() if completo and not simular else nullcontext():
+            if completo and not simular:
+                PrestamoDiaStat.objects.all().delete()
+            for tramo in _tramos(resumen.dias, self.dias_por_lote):
+                filas = self._agregados(tramo)
+                if not simular:
+                    with transaction.atomic():
+                        PrestamoDiaStat.objects.filter(fecha__gte=tramo[0], fecha__lte=tramo[-1]).delete()
+                        PrestamoDiaStat.objects.bulk_create(filas, batch_size=BULK_BATCH_SIZE)
+                resumen.filas += len(filas)
+                if progreso:
+                    progreso(resumen)
+            # La marca avanza al final: si la corrida se interrumpe, la siguiente repite los días
+            if marca is not None:
+                resumen.marca = (marca[0], marca[1])
+                if not simular:
+                    MarcaConsolidacion.objects.update_or_create(
+                        nombre=MARCA, defaults={"updated_at": marca[0], "ultimo_id": marca[1]}
+                    )
+        return resumen
+
+
+class DjangoEstadisticasPrestamos(EstadisticasPrestamosReader):
+    _CAMPOS = {"dia": "fecha", "turno": "turno", "radio": "codigo_radio"}
+
+    def consultar(self, filtros: FiltrosEstadisticas, agrupar: FrozenSet[str]) -> List[EstadisticaPrestamos]:
+        qs = PrestamoDiaStat.objects.filter(fecha__gte=filtros.desde, fecha__lte=filtros.hasta)
+        if filtros.turno:
+            qs = qs.filter(turno=filtros.turno.value)
+        if filtros.codigo_radio:
+            qs = qs.filter(codigo_radio=filtros.codigo_radio)
+
+        totales = {
+            "total": Sum("prestamos"),
+            "total_devueltos": Sum("devueltos"),
+            "total_duracion": Sum("duracion_total"),
+        }
+        campos = [campo for dimension, campo in self._CAMPOS.items() if dimension in agrupar]
+        if campos:
+            rows = list(qs.values(*campos).annotate(**totales).order_by(*campos))
+        else:
+            rows = [qs.aggregate(**totales)]
+
+        resultado = []
+        for r in rows:
+            devueltos = r["total_devueltos"] or 0
+            resultado.append(
+                EstadisticaPrestamos(
+                    fecha=r.get("fecha"),
+                    turno=r.get("turno"),
+                    codigo_radio=r.get("codigo_radio"),
+                    prestamos=r["total"] or 0,
+                    devueltos=devueltos,
+                    duracion_promedio_segundos=r["total_duracion"].total_seconds() / devueltos if devueltos else None,
+                )
+            )
+        return resultado
+
+    def actualizado_hasta(self) -> Optional[datetime]:
+        marca = ConsolidacionEstadisticas.marca()
+        return marca[0] if marca else None
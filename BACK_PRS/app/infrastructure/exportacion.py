@@ -0,0 +1,157 @@
+"""
+Infraestructura :: Exportación del histórico de préstamos.
+
+Los generadores reciben las filas planas de `PrestamoRepository.iterar_filas`
+(tuplas en el orden de `COLUMNAS_EXPORTACION`) y producen el archivo en fragmentos
+de bytes para un `StreamingHttpResponse`; la memoria no depende del número de filas.
+
+- CSV: se entrega cada `FILAS_POR_FRAGMENTO` filas, a medida que llegan de la base.
+- XLSX: un libro `write_only` de openpyxl vuelca las filas a un temporal en disco
+  mientras se leen. El zip solo puede cerrarse al final, así que el archivo se
+  entrega por fragmentos una vez completo. Al llegar al límite de filas de Excel
+  se continúa en una hoja nueva.
+
+Las fechas se exportan en la hora local (`TIME_ZONE`), sin zona: Excel no las admite.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..domain.ports.repositories import COLUMNAS_EXPORTACION, FiltrosPrestamo, PrestamoRepository
+
+DEFAULTS = {
+    "CHUNK_SIZE": 2000,  # filas por lectura de la base
+}
+
+ENCABEZADOS = {
+    "id": "ID",
+    "cedula": "Cédula",
+    "empleado_nombre": "Empleado",
+    "usuario_sap": "Usuario SAP",
+    "codigo_radio": "RF",
+    "turno": "Turno",
+    "estado": "Estado",
+    "fecha_hora_prestamo": "Prestado",
+    "fecha_hora_devolucion": "Devuelto",
+    "usuario_registra_username": "Registrado por",
+}
+
+ANCHOS_XLSX = (10, 14, 32, 16, 12, 24, 12, 20, 20, 18)
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+FILAS_POR_FRAGMENTO = 500
+TAMANO_FRAGMENTO = 64 * 1024
+MAX_FILAS_HOJA = 1_048_576 - 1  # límite de Excel, menos el encabezado
+
+# Excel interpreta como fórmula el texto que empieza con estos caracteres
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+Fila = Tuple[Any, ...]
+
+
+def _fecha_local(valor: datetime) -> datetime:
+    return timezone.localtime(valor).replace(tzinfo=None)
+
+
+def _celda_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return _fecha_local(valor).strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, str) and valor.startswith(_INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def csv_stream(filas: Iterable[Fila], *, delimitador: str = ",") -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimitador, lineterminator="\r\n")
+    buffer.write("\ufeff")  # BOM: Excel reconoce el UTF-8 (tildes, ñ)
+    writer.writerow([ENCABEZADOS[c] for c in COLUMNAS_EXPORTACION])
+    for i, fila in enumerate(filas, 1):
+        writer.writerow([_celda_csv(v) for v in fila])
+        if i % FILAS_POR_FRAGMENTO == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_stream(filas: Iterable[Fila], *, titulo: str = "Prestamos") -> Iterator[bytes]:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+
+    def nueva_hoja(numero: int):
+        ws = wb.create_sheet(titulo if numero == 1 else f"{titulo} ({numero})")
+        for i, ancho in enumerate(ANCHOS_XLSX, 1):
+            ws.column_dimensions[get_column_letter(i)].width = ancho
+        encabezado = []
+        for c in COLUMNAS_EXPORTACION:
+            celda = WriteOnlyCell(ws, ENCABEZADOS[c])
+            celda.font = Font(bold=True)
+            encabezado.append(celda)
+        ws.append(encabezado)
+        return ws
+
+    def celda(ws, valor: Any):
+        if isinstance(valor, datetime):
+            return _fecha_local(valor)
+        if isinstance(valor, str) and valor.startswith("="):
+            texto = WriteOnlyCell(ws, valor)
+            texto.data_type = "s"  # openpyxl trataría el valor como fórmula
+            return texto
+        return valor
+
+    hojas, ws, en_hoja = 1, nueva_hoja(1), 0
+    for fila in filas:
+        if en_hoja == MAX_FILAS_HOJA:
+            hojas += 1
+            ws, en_hoja = nueva_hoja(hojas), 0
+        ws.append([celda(ws, v) for v in fila])
+        en_hoja += 1
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            fragmento = tmp.read(TAMANO_FRAGMENTO)
+            if not fragmento:
+                break
+            yield fragmento
+
+
+class ExportadorPrestamos:
+    def __init__(self, repo: PrestamoRepository, *, chunk_size: int = 2000) -> None:
+        self.repo = repo
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_settings(cls, repo: PrestamoRepository) -> "ExportadorPrestamos":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_EXPORTACION", {})}
+        return cls(repo, chunk_size=conf["CHUNK_SIZE"])
+
+    def exportar(
+        self, filtros: Optional[FiltrosPrestamo] = None, *, formato: str = "csv", delimitador: str = ","
+    ) -> Iterator[bytes]:
+        """Archivo del histórico filtrado, en fragmentos; la consulta corre al consumirlos."""
+        filas = self.repo.iterar_filas(filtros, chunk_size=self.chunk_size)
+        if formato == "xlsx":
+            return xlsx_stream(filas)
+        if formato == "csv":
+            return csv_stream(filas, delimitador=delimitador)
+        raise ValueError(f"Formato de exportación inválido: {formato!r}")
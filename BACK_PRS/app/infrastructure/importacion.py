@@ -0,0 +1,224 @@
+"""
+Infraestructura :: Lectura de archivos de catálogos para la importación masiva.
+
+Cada formato (xlsx, csv, parquet) tiene un lector que entrega filas crudas en
+streaming —primero el encabezado— sin cargar el archivo completo en memoria.
+Sobre esas filas, `leer_empleados`, `leer_radios` y `leer_sap_usuarios` ubican
+las columnas por sinónimos y entregan tuplas normalizadas. Las columnas
+opcionales ausentes (o celdas vacías) se entregan como `None`. Un valor más
+largo que su columna en la base rechaza el archivo indicando la fila.
+"""
+from __future__ import annotations
+
+import csv
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SINONIMOS_CEDULA = {"cedula", "cédula", "documento", "doc", "cc", "dni", "identificacion", "identificación", "id"}
+SINONIMOS_NOMBRE = {"nombre", "nombres", "nombre completo", "apellidos y nombres", "empleado", "colaborador"}
+SINONIMOS_ACTIVO = {"activo", "vigente", "habilitado"}
+SINONIMOS_CODIGO_RADIO = {"codigo", "código", "codigo radio", "código radio", "codigo_radio", "radio", "rf"}
+SINONIMOS_DESCRIPCION = {"descripcion", "descripción", "detalle", "observacion", "observación"}
+SINONIMOS_USUARIO_SAP = {"usuario", "usuario sap", "usuario_sap", "username", "sap", "login"}
+
+VALORES_ACTIVO = {"1", "true", "si", "sí", "s", "x", "activo", "vigente", "habilitado"}
+VALORES_INACTIVO = {"0", "false", "no", "n", "inactivo", "retirado", "deshabilitado"}
+
+# Longitudes de las columnas en la base (ver `models.py`)
+MAX_CEDULA = 15
+MAX_NOMBRE = 150
+MAX_CODIGO_RADIO = 25
+MAX_DESCRIPCION = 255
+MAX_USUARIO_SAP = 50
+
+HOJA_EMPLEADOS = "Base de datos"  # hoja del Excel de RRHH
+FILAS_POR_BLOQUE_PARQUET = 10_000
+
+Fila = Sequence[object]
+
+
+class ArchivoInvalido(Exception):
+    """El archivo no tiene el formato, la hoja o las columnas esperadas."""
+
+
+def _norm_header(s: Optional[object]) -> str:
+    return str(s or "").strip().lower()
+
+
+def _digits(s: Optional[object]) -> str:
+    if s is None:
+        return ""
+    if isinstance(s, float) and s.is_integer():
+        s = int(s)  # celdas numéricas: 1023456.0 -> "1023456"
+    return "".join(ch for ch in str(s).strip() if ch.isdigit())
+
+
+def _strclean(s: Optional[object]) -> str:
+    return str(s or "").strip()
+
+
+def _activo(s: Optional[object]) -> Optional[bool]:
+    if s is None or isinstance(s, bool):
+        return s
+    valor = str(s).strip().lower()
+    if not valor:
+        return None
+    if valor in VALORES_ACTIVO:
+        return True
+    if valor in VALORES_INACTIVO:
+        return False
+    raise ArchivoInvalido(f"Valor de estado no reconocido: '{s}'.")
+
+
+def _opcional(s: Optional[object]) -> Optional[str]:
+    return _strclean(s) or None
+
+
+def _cedula_opcional(s: Optional[object]) -> Optional[str]:
+    return _digits(s) or None
+
+
+@dataclass(frozen=True)
+class Columna:
+    nombre: str
+    sinonimos: FrozenSet[str]
+    normalizar: Callable[[Optional[object]], Any]
+    requerida: bool = True
+    max_length: Optional[int] = None
+
+    def valor(self, crudo: Optional[object]) -> Any:
+        valor = self.normalizar(crudo)
+        if self.max_length is not None and isinstance(valor, str) and len(valor) > self.max_length:
+            raise ArchivoInvalido(f"{self.nombre} supera los {self.max_length} caracteres: '{valor[:self.max_length]}…'.")
+        return valor
+
+
+def ubicar_columnas(header: Fila, columnas: Sequence[Columna]) -> List[int]:
+    """Índice de cada columna en el encabezado (-1 si es opcional y no está)."""
+    headers = [_norm_header(h) for h in header]
+    indices = [next((i for i, h in enumerate(headers) if h in c.sinonimos), -1) for c in columnas]
+    faltantes = [c.nombre for c, i in zip(columnas, indices) if i == -1 and c.requerida]
+    if faltantes:
+        raise ArchivoInvalido(f"No se encontraron columnas para {' y '.join(faltantes)} en la primera fila.")
+    return indices
+
+
+COLUMNAS_EMPLEADO = (
+    Columna("cédula", frozenset(SINONIMOS_CEDULA), _digits, max_length=MAX_CEDULA),
+    Columna("nombre", frozenset(SINONIMOS_NOMBRE), _strclean, max_length=MAX_NOMBRE),
+    Columna("activo", frozenset(SINONIMOS_ACTIVO), _activo, requerida=False),
+)
+COLUMNAS_RADIO = (
+    Columna("código", frozenset(SINONIMOS_CODIGO_RADIO), _strclean, max_length=MAX_CODIGO_RADIO),
+    Columna("descripción", frozenset(SINONIMOS_DESCRIPCION), _opcional, requerida=False, max_length=MAX_DESCRIPCION),
+    Columna("activo", frozenset(SINONIMOS_ACTIVO), _activo, requerida=False),
+)
+COLUMNAS_SAP_USUARIO = (
+    Columna("usuario", frozenset(SINONIMOS_USUARIO_SAP), _strclean, max_length=MAX_USUARIO_SAP),
+    Columna("cédula", frozenset(SINONIMOS_CEDULA), _cedula_opcional, requerida=False, max_length=MAX_CEDULA),
+    Columna("activo", frozenset(SINONIMOS_ACTIVO), _activo, requerida=False),
+)
+
+
+# --------- Lectores por formato ---------
+
+def filas_xlsx(path: str, *, hoja: Optional[str] = None, **_) -> Iterator[Fila]:
+    """Filas de la hoja indicada o, si no se indica, de la primera del libro."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if hoja is None:
+            ws = wb.worksheets[0]
+        elif hoja in wb.sheetnames:
+            ws = wb[hoja]
+        else:
+            raise ArchivoInvalido(f"La hoja '{hoja}' no existe. Hojas disponibles: {', '.join(wb.sheetnames)}")
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()  # read_only mantiene el archivo abierto hasta cerrarlo
+
+
+def filas_csv(path: str, *, delimitador: Optional[str] = None, encoding: str = "utf-8-sig", **_) -> Iterator[Fila]:
+    with open(path, newline="", encoding=encoding) as fh:
+        if delimitador is None:
+            # Las exportaciones de Excel en configuración regional es-CO usan ';'
+            muestra = fh.read(8192)
+            fh.seek(0)
+            try:
+                delimitador = csv.Sniffer().sniff(muestra, delimiters=",;\t|").delimiter
+            except csv.Error:
+                delimitador = ","
+        yield from csv.reader(fh, delimiter=delimitador)
+
+
+def filas_parquet(path: str, **_) -> Iterator[Fila]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ArchivoInvalido("Leer Parquet requiere el paquete opcional 'pyarrow' (pip install pyarrow).")
+
+    pf = pq.ParquetFile(path)
+    try:
+        yield tuple(pf.schema_arrow.names)
+        for batch in pf.iter_batches(batch_size=FILAS_POR_BLOQUE_PARQUET):
+            yield from zip(*(col.to_pylist() for col in batch.columns))
+    finally:
+        pf.close()
+
+
+LECTORES: Dict[str, Callable[..., Iterator[Fila]]] = {
+    "xlsx": filas_xlsx,
+    "csv": filas_csv,
+    "parquet": filas_parquet,
+}
+
+
+def formato_de(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    formato = {"xlsm": "xlsx", "txt": "csv", "pq": "parquet"}.get(ext, ext)
+    if formato not in LECTORES:
+        raise ArchivoInvalido(f"Formato no soportado: '.{ext}'. Formatos: {', '.join(LECTORES)}.")
+    return formato
+
+
+# --------- Normalización ---------
+
+def _normalizar(filas: Iterable[Fila], columnas: Sequence[Columna]) -> Iterator[Tuple[Any, ...]]:
+    filas = iter(filas)
+    header = next(filas, None)
+    if header is None:
+        raise ArchivoInvalido("El archivo está vacío.")
+    indices = ubicar_columnas(header, columnas)
+    for n, row in enumerate(filas, start=2):
+        try:
+            yield tuple(
+                c.valor(row[i] if 0 <= i < len(row) else None)
+                for c, i in zip(columnas, indices)
+            )
+        except ArchivoInvalido as exc:
+            raise ArchivoInvalido(f"Fila {n}: {exc}")
+
+
+def _leer(path: str, columnas: Sequence[Columna], formato: Optional[str], opciones: Dict[str, Any]) -> Iterator[Tuple[Any, ...]]:
+    lector = LECTORES[formato or formato_de(path)]
+    return _normalizar(lector(path, **opciones), columnas)
+
+
+def leer_empleados(path: str, *, formato: Optional[str] = None, **opciones) -> Iterator[Tuple[str, str, Optional[bool]]]:
+    """
+    Filas `(cedula, nombre, activo)` del archivo. El formato se deduce de la
+    extensión salvo que se indique; `opciones` van al lector (`hoja`, `delimitador`).
+    """
+    return _leer(path, COLUMNAS_EMPLEADO, formato, opciones)
+
+
+def leer_radios(path: str, *, formato: Optional[str] = None, **opciones) -> Iterator[Tuple[str, Optional[str], Optional[bool]]]:
+    """Filas `(codigo, descripcion, activo)` del archivo."""
+    return _leer(path, COLUMNAS_RADIO, formato, opciones)
+
+
+def leer_sap_usuarios(path: str, *, formato: Optional[str] = None, **opciones) -> Iterator[Tuple[str, Optional[str], Optional[bool]]]:
+    """Filas `(username, empleado_cedula, activo)` del archivo."""
+    return _leer(path, COLUMNAS_SAP_USUARIO, formato, opciones)
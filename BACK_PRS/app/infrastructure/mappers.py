@@ -50,14 +50,15 @@ def sap_from_model(obj: SapUsuarioModel) -> SapUsuario:
 
 # --- Prestamo ---
 
-def prestamo_from_model(obj: PrestamoModel) -> Prestamo:
+def prestamo_from_model(obj: PrestamoModel, usuario_registra_username: Optional[str] = None) -> Prestamo:
     """
     Inyecta usuario_registra_username para evitar queries desde interfaces.
+    Si el llamador ya conoce el username se usa tal cual y no se toca la FK.
     """
-    username: Optional[str] = None
+    username: Optional[str] = usuario_registra_username
     # Como el modelo usa FK a AUTH_USER_MODEL, podemos traer el username directamente.
     # Se recomienda que el repositorio haga select_related('usuario_registra') para evitar N+1.
-    if getattr(obj, "usuario_registra", None):
+    if username is None and getattr(obj, "usuario_registra", None):
         username = getattr(obj.usuario_registra, "username", None)
 
     return Prestamo(
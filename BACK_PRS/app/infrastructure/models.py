@@ -19,6 +19,8 @@ class EmpleadoModel(TimeStampedMixin):
     class Meta:
         db_table = "empleados"
         indexes = [
+            # Versión del catálogo (Max) para los ETag de los listados
+            models.Index(fields=["updated_at"]),
             models.Index(fields=["cedula"]),
             models.Index(fields=["activo"]),
         ]
@@ -36,6 +38,8 @@ class RadioFrecuenciaModel(TimeStampedMixin):
     class Meta:
         db_table = "radios"
         indexes = [
+            # Versión del catálogo (Max) para los ETag de los listados
+            models.Index(fields=["updated_at"]),
             models.Index(fields=["codigo"]),
             models.Index(fields=["activo"]),
         ]
@@ -55,6 +59,8 @@ class SapUsuarioModel(TimeStampedMixin):
     class Meta:
         db_table = "sap_usuarios"
         indexes = [
+            # Versión del catálogo (Max) para los ETag de los listados
+            models.Index(fields=["updated_at"]),
             models.Index(fields=["username"]),
             models.Index(fields=["activo"]),
         ]
@@ -88,20 +94,80 @@ class PrestamoModel(TimeStampedMixin):
             models.Index(fields=["cedula", "estado"]),
             models.Index(fields=["codigo_radio", "estado"]),
             models.Index(fields=["usuario_sap", "estado"]),
+            # Histórico paginado por llave (fecha_hora_prestamo, id) con filtros
+            models.Index(fields=["-fecha_hora_prestamo", "-id"]),
+            models.Index(fields=["estado", "-fecha_hora_prestamo", "-id"]),
+            models.Index(fields=["turno", "-fecha_hora_prestamo", "-id"]),
+            models.Index(fields=["usuario_sap", "-fecha_hora_prestamo", "-id"]),
+            models.Index(fields=["cedula", "-fecha_hora_prestamo", "-id"]),
+            models.Index(fields=["codigo_radio", "-fecha_hora_prestamo", "-id"]),
+            # Feed incremental de cambios por token (updated_at, id)
+            models.Index(fields=["updated_at", "id"]),
+        ]
+        constraints = [
+            # Un solo préstamo abierto por cédula, usuario SAP y radio (índices únicos parciales)
+            models.UniqueConstraint(
+                fields=["cedula"], condition=models.Q(estado="ASIGNADO"), name="uniq_prestamo_abierto_cedula"
+            ),
+            models.UniqueConstraint(
+                fields=["usuario_sap"], condition=models.Q(estado="ASIGNADO"), name="uniq_prestamo_abierto_usuario_sap"
+            ),
+            models.UniqueConstraint(
+                fields=["codigo_radio"], condition=models.Q(estado="ASIGNADO"), name="uniq_prestamo_abierto_codigo_radio"
+            ),
         ]
 
     def __str__(self):
         return f"{self.codigo_radio} -> {self.cedula} ({self.estado})"
 
 
+# --- Estadísticas diarias de préstamos (consolidadas por `consolidar_estadisticas`) ---
+
+class PrestamoDiaStat(models.Model):
+    fecha = models.DateField()                                  # día local de fecha_hora_prestamo
+    turno = models.CharField(max_length=40)
+    codigo_radio = models.CharField(max_length=25)
+    prestamos = models.IntegerField()
+    devueltos = models.IntegerField()
+    duracion_total = models.DurationField()                     # suma de duraciones de los devueltos
+
+    class Meta:
+        db_table = "prestamos_daily_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["fecha", "turno", "codigo_radio"], name="uniq_prestamos_daily_stats"),
+        ]
+        indexes = [
+            # Reporte de un radio o de un turno por rango de días
+            models.Index(fields=["codigo_radio", "fecha"]),
+            models.Index(fields=["turno", "fecha"]),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} {self.turno} {self.codigo_radio}: {self.prestamos}"
+
+
+class MarcaConsolidacion(models.Model):
+    """Última posición (updated_at, id) de `prestamos` incluida en una consolidación."""
+    nombre = models.CharField(max_length=64, primary_key=True)
+    updated_at = models.DateTimeField()
+    ultimo_id = models.BigIntegerField()
+    ejecutado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "consolidacion_marcas"
+
+    def __str__(self):
+        return f"{self.nombre}: ({self.updated_at}, {self.ultimo_id})"
+
+
 # --- Auditoría (Infraestructura para AdminChangeEvent) ---
 
 class AuditEntry(models.Model):
-    aggregate = models.CharField(max_length=64, db_index=True)  # Empleado | RadioFrecuencia | SapUsuario
-    action = models.CharField(max_length=16, db_index=True)     # CREATED | UPDATED | DELETED
-    id_ref = models.CharField(max_length=128, db_index=True)    # cedula | codigo | username
-    at = models.DateTimeField(db_index=True)                    # UTC recomendado
-    actor_user_id = models.IntegerField(db_index=True)
+    aggregate = models.CharField(max_length=64)     # Empleado | RadioFrecuencia | SapUsuario
+    action = models.CharField(max_length=16)        # CREATED | UPDATED | DELETED | SYNC
+    id_ref = models.CharField(max_length=128)       # cedula | codigo | username
+    at = models.DateTimeField()                     # UTC recomendado
+    actor_user_id = models.IntegerField()
     before = models.JSONField(null=True, blank=True)
     after = models.JSONField(null=True, blank=True)
     reason = models.TextField(null=True, blank=True)
@@ -110,10 +176,27 @@ class AuditEntry(models.Model):
         db_table = "audit_log"
         ordering = ["-at"]
         indexes = [
-            models.Index(fields=["aggregate", "action"]),
-            models.Index(fields=["at"]),
-            models.Index(fields=["actor_user_id"]),
+            # Keyset (at, id) descendente de la consulta, sola o con cada filtro. La
+            # acción (pocos valores) se filtra sobre el recorrido del agregado.
+            models.Index(fields=["-at", "-id"]),
+            models.Index(fields=["aggregate", "-at", "-id"]),
+            models.Index(fields=["actor_user_id", "-at", "-id"]),
+            models.Index(fields=["id_ref", "-at", "-id"]),
         ]
 
     def __str__(self):
         return f"[{self.at}] {self.aggregate}:{self.action} ({self.id_ref})"
+
+
+# --- Revocación de tokens JWT (autenticación sin consultar auth_user) ---
+
+class RevocacionToken(models.Model):
+    user_id = models.IntegerField(db_index=True)               # sin FK: sobrevive al borrado del usuario
+    revocado_en = models.DateTimeField(db_index=True)          # tokens emitidos antes quedan inválidos
+    motivo = models.CharField(max_length=32)                   # DESACTIVADO | PASSWORD | ROL | ELIMINADO
+
+    class Meta:
+        db_table = "token_revocaciones"
+
+    def __str__(self):
+        return f"[{self.revocado_en}] user {self.user_id}: {self.motivo}"
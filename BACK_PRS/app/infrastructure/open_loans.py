@@ -0,0 +1,135 @@
+"""
+Infraestructura :: Índice en memoria de préstamos abiertos.
+
+Mapea cédula, usuario SAP y código de radio al id del préstamo ASIGNADO que los
+ocupa, para resolver los conflictos de `PrestamosService.asignar` sin recorrer
+la tabla. Se construye de forma perezosa al primer uso del proceso y se mantiene
+con hooks `on_commit` del repositorio. Para acotar el desfase frente a escrituras
+de otros workers, un hilo (`RefrescoPeriodico`) lo reconstruye cada
+`max_age_seconds`: arma mapas nuevos sin bloquear las búsquedas, les aplica las
+altas y bajas confirmadas mientras tanto y los reemplaza de una vez.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from django.db import transaction
+
+from ..domain.value_objects import EstadoPrestamo
+from .models import PrestamoModel
+from .refresco import RefrescoPeriodico
+
+Claves = Tuple[str, str, str]  # (cedula, usuario_sap, codigo_radio)
+
+
+class _Mapas:
+    """Mapas de una carga; se reemplazan completos al reconstruir."""
+
+    __slots__ = ("por_cedula", "por_sap", "por_radio", "claves")
+
+    def __init__(self) -> None:
+        self.por_cedula: Dict[str, int] = {}
+        self.por_sap: Dict[str, int] = {}
+        self.por_radio: Dict[str, int] = {}
+        self.claves: Dict[int, Claves] = {}
+
+    def agregar(self, id_: int, cedula: str, usuario_sap: str, codigo_radio: str) -> None:
+        self.claves[id_] = (cedula, usuario_sap, codigo_radio)
+        self.por_cedula[cedula] = id_
+        self.por_sap[usuario_sap] = id_
+        self.por_radio[codigo_radio] = id_
+
+    def quitar(self, id_: int) -> None:
+        claves = self.claves.pop(id_, None)
+        if claves is None:
+            return
+        cedula, usuario_sap, codigo_radio = claves
+        for mapa, clave in ((self.por_cedula, cedula), (self.por_sap, usuario_sap), (self.por_radio, codigo_radio)):
+            if mapa.get(clave) == id_:
+                del mapa[clave]
+
+
+Operacion = Callable[[_Mapas], None]
+
+
+class OpenLoanIndex:
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._carga_lock = threading.Lock()             # una reconstrucción a la vez
+        self._mapas: Optional[_Mapas] = None
+        self._diario: Optional[List[Operacion]] = None  # altas/bajas confirmadas durante una reconstrucción
+        self._refresco = RefrescoPeriodico(self.rebuild, max_age_seconds, "prs-open-loans")
+
+    # --------- Carga ---------
+    def rebuild(self) -> None:
+        with self._carga_lock:
+            with self._lock:
+                self._diario = []
+            try:
+                mapas = _Mapas()
+                rows = PrestamoModel.objects.filter(estado=EstadoPrestamo.ASIGNADO.value).values_list(
+                    "id", "cedula", "usuario_sap", "codigo_radio"
+                )
+                for id_, cedula, usuario_sap, codigo_radio in rows.iterator():
+                    mapas.agregar(id_, cedula, usuario_sap, codigo_radio)
+                with self._lock:
+                    for operacion in self._diario:
+                        operacion(mapas)
+                    self._mapas = mapas
+            finally:
+                with self._lock:
+                    self._diario = None
+
+    def invalidate(self) -> None:
+        """Adelanta la reconstrucción en segundo plano; las búsquedas siguen con los mapas actuales."""
+        self._refresco.solicitar()
+
+    def _ensure_loaded(self) -> None:
+        if self._mapas is None:
+            self.rebuild()
+            self._refresco.iniciar()
+
+    # --------- Consulta ---------
+    def candidatos(
+        self,
+        *,
+        cedula: Optional[str] = None,
+        usuario_sap: Optional[str] = None,
+        codigo_radio: Optional[str] = None,
+    ) -> Set[int]:
+        """Ids de préstamos abiertos que ocupan alguna de las claves indicadas."""
+        self._ensure_loaded()
+        with self._lock:
+            m = self._mapas
+            found = {
+                m.por_cedula.get(cedula) if cedula else None,
+                m.por_sap.get(usuario_sap) if usuario_sap else None,
+                m.por_radio.get(codigo_radio) if codigo_radio else None,
+            }
+        found.discard(None)
+        return found  # type: ignore[return-value]
+
+    def esta_abierto(self, *, cedula: Optional[str] = None, usuario_sap: Optional[str] = None, codigo_radio: Optional[str] = None) -> bool:
+        return bool(self.candidatos(cedula=cedula, usuario_sap=usuario_sap, codigo_radio=codigo_radio))
+
+    # --------- Mantenimiento ---------
+    def _aplicar(self, operacion: Operacion) -> None:
+        with self._lock:
+            if self._mapas is not None:
+                operacion(self._mapas)
+            if self._diario is not None:
+                self._diario.append(operacion)
+
+    def agregar(self, id_: int, cedula: str, usuario_sap: str, codigo_radio: str) -> None:
+        self._aplicar(lambda m: m.agregar(id_, cedula, usuario_sap, codigo_radio))
+
+    def quitar(self, id_: int) -> None:
+        self._aplicar(lambda m: m.quitar(id_))
+
+    def agregar_on_commit(self, id_: int, cedula: str, usuario_sap: str, codigo_radio: str) -> None:
+        transaction.on_commit(lambda: self.agregar(id_, cedula, usuario_sap, codigo_radio))
+
+    def quitar_on_commit(self, id_: int) -> None:
+        transaction.on_commit(lambda: self.quitar(id_))
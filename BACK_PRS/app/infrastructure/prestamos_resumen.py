@@ -0,0 +1,186 @@
+"""
+Infraestructura :: Contadores del tablero de préstamos.
+
+`ContadoresPrestamos` responde `/api/prestamos/resumen/` sin recorrer el histórico:
+mantiene en memoria los préstamos abiertos (turno, hora de préstamo y radio) y
+el conjunto de radios activas. `PrestamosService` le entrega cada asignación y
+devolución como `PrestamoEvent`, y `CatalogosService` le avisa los cambios de
+radios; ambos se aplican al confirmar la transacción.
+
+Los vencidos (abiertos hace más de `VENCIMIENTO_HORAS`) se cuentan con una
+búsqueda binaria sobre las horas de préstamo ordenadas. Solo la primera consulta
+del proceso carga desde la base; después `resumen()` es una lectura en memoria.
+Un hilo (`RefrescoPeriodico`) reconstruye el estado cada `MAX_AGE_SECONDS`, o en
+cuanto cambia el catálogo de radios, para acotar el desfase frente a otros
+workers o cambios hechos fuera del servicio (acciones del admin, imports). La
+reconstrucción arma un estado nuevo sin bloquear las lecturas, le aplica los
+eventos confirmados mientras tanto y lo reemplaza de una vez.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from ..domain.events import PrestamoEvent
+from ..domain.ports.events import CatalogChangeListener, PrestamoEventPublisher
+from ..domain.value_objects import EstadoPrestamo, Turno
+from .models import PrestamoModel, RadioFrecuenciaModel
+from .refresco import RefrescoPeriodico
+
+DEFAULTS = {
+    "VENCIMIENTO_HORAS": 8.0,  # un turno
+    "MAX_AGE_SECONDS": 60.0,
+}
+
+_CLAVE_TURNO = {Turno.T1.value: "1", Turno.T2.value: "2", Turno.T3.value: "3"}
+
+
+@dataclass(frozen=True)
+class ResumenPrestamos:
+    abiertos: int
+    abiertos_por_turno: Dict[str, int]  # "1" | "2" | "3", como el filtro `turno`
+    vencidos: int
+    radios_activas: int
+    radios_asignadas: int
+    radios_disponibles: int
+
+
+def _turno(valor) -> str:
+    return getattr(valor, "value", valor)
+
+
+class _Estado:
+    """Préstamos abiertos y radios activas de una carga; se reemplaza completo al reconstruir."""
+
+    __slots__ = ("abiertos", "por_turno", "fechas", "radios_activas", "ocupadas")
+
+    def __init__(self, radios_activas: Set[str]) -> None:
+        self.abiertos: Dict[int, Tuple[str, float, str]] = {}  # id -> (turno, ts préstamo, codigo_radio)
+        self.por_turno: Counter = Counter()
+        self.fechas: List[Tuple[float, int]] = []               # (ts préstamo, id) ordenado
+        self.radios_activas = radios_activas
+        self.ocupadas = 0                                        # abiertos sobre radios activas
+
+    def agregar(self, id_: int, turno: str, fecha: datetime, codigo_radio: str) -> None:
+        if id_ in self.abiertos:
+            return
+        ts = fecha.timestamp()
+        self.abiertos[id_] = (turno, ts, codigo_radio)
+        self.por_turno[turno] += 1
+        bisect.insort(self.fechas, (ts, id_))
+        if codigo_radio in self.radios_activas:
+            self.ocupadas += 1
+
+    def quitar(self, id_: int) -> None:
+        item = self.abiertos.pop(id_, None)
+        if item is None:
+            return
+        turno, ts, codigo_radio = item
+        self.por_turno[turno] -= 1
+        i = bisect.bisect_left(self.fechas, (ts, id_))
+        if i < len(self.fechas) and self.fechas[i] == (ts, id_):
+            del self.fechas[i]
+        if codigo_radio in self.radios_activas:
+            self.ocupadas -= 1
+
+
+Operacion = Callable[[_Estado], None]
+
+
+class ContadoresPrestamos(PrestamoEventPublisher, CatalogChangeListener):
+    def __init__(self, *, vencimiento: timedelta = timedelta(hours=8), max_age_seconds: float = 60.0) -> None:
+        self.vencimiento = vencimiento
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._carga_lock = threading.Lock()             # una reconstrucción a la vez
+        self._estado: Optional[_Estado] = None
+        self._diario: Optional[List[Operacion]] = None  # eventos confirmados durante una reconstrucción
+        self._refresco = RefrescoPeriodico(self.rebuild, max_age_seconds, "prs-prestamos-resumen")
+
+    @classmethod
+    def from_settings(cls) -> "ContadoresPrestamos":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_PRESTAMOS_RESUMEN", {})}
+        return cls(
+            vencimiento=timedelta(hours=conf["VENCIMIENTO_HORAS"]),
+            max_age_seconds=conf["MAX_AGE_SECONDS"],
+        )
+
+    # --------- Carga ---------
+    def rebuild(self) -> None:
+        """
+        Arma el estado desde la base sin tomar el lock de lectura: radios activas y
+        préstamos abiertos se leen juntos bajo `_carga_lock`. Los eventos que se
+        confirman mientras tanto quedan en el diario y se reaplican antes del reemplazo.
+        """
+        with self._carga_lock:
+            with self._lock:
+                self._diario = []
+            try:
+                estado = _Estado(set(RadioFrecuenciaModel.objects.filter(activo=True).values_list("codigo", flat=True)))
+                rows = PrestamoModel.objects.filter(estado=EstadoPrestamo.ASIGNADO.value).values_list(
+                    "id", "turno", "fecha_hora_prestamo", "codigo_radio"
+                )
+                for id_, turno, fecha, codigo_radio in rows.iterator():
+                    estado.agregar(id_, turno, fecha, codigo_radio)
+                with self._lock:
+                    for operacion in self._diario:
+                        operacion(estado)
+                    self._estado = estado
+            finally:
+                with self._lock:
+                    self._diario = None
+
+    def _ensure_loaded(self) -> None:
+        if self._estado is None:
+            self.rebuild()
+            self._refresco.iniciar()
+
+    # --------- Mantenimiento ---------
+    def _aplicar(self, event: PrestamoEvent) -> None:
+        p = event.prestamo
+        if p.id is None:
+            return
+        if event.action == EstadoPrestamo.ASIGNADO.value:
+            turno, fecha, codigo_radio = _turno(p.turno), p.fecha_hora_prestamo, p.codigo_radio
+            operacion: Operacion = lambda e: e.agregar(p.id, turno, fecha, codigo_radio)
+        else:
+            operacion = lambda e: e.quitar(p.id)
+        with self._lock:
+            if self._estado is not None:
+                operacion(self._estado)
+            if self._diario is not None:
+                self._diario.append(operacion)
+
+    # --------- PrestamoEventPublisher ---------
+    def publish(self, event: PrestamoEvent) -> None:
+        transaction.on_commit(lambda: self._aplicar(event))
+
+    # --------- CatalogChangeListener ---------
+    def catalogo_cambiado(self, aggregate: str, id_ref: str) -> None:
+        if aggregate == "RadioFrecuencia":
+            # Las radios activas se recargan con el estado completo, fuera de la request
+            transaction.on_commit(self._refresco.solicitar)
+
+    # --------- Consulta ---------
+    def resumen(self, ahora: datetime) -> ResumenPrestamos:
+        """Lectura en memoria; solo la primera llamada del proceso consulta la base."""
+        self._ensure_loaded()
+        limite = (ahora - self.vencimiento).timestamp()
+        with self._lock:
+            e = self._estado
+            activas = len(e.radios_activas)
+            return ResumenPrestamos(
+                abiertos=len(e.abiertos),
+                abiertos_por_turno={clave: e.por_turno[turno] for turno, clave in _CLAVE_TURNO.items()},
+                vencidos=bisect.bisect_left(e.fechas, (limite, -1)),
+                radios_activas=activas,
+                radios_asignadas=len(e.abiertos),
+                radios_disponibles=max(activas - e.ocupadas, 0),
+            )
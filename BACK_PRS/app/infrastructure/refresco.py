@@ -0,0 +1,56 @@
+"""
+Infraestructura :: Refresco periódico de los índices en memoria.
+
+`RefrescoPeriodico` ejecuta una acción (la reconstrucción de un índice) en un hilo
+daemon cada `intervalo` segundos, o antes si se pide con `solicitar()`. Así la
+reconciliación contra la base no la paga ninguna request: las consultas siguen
+leyendo la copia vigente mientras el hilo arma la nueva.
+
+El hilo se inicia con el primer `iniciar()`, es decir, con el primer uso del
+índice en el worker (nunca antes del fork de un servidor con precarga).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class RefrescoPeriodico:
+    def __init__(self, accion: Callable[[], None], intervalo: float, nombre: str) -> None:
+        self.accion = accion
+        self.intervalo = intervalo
+        self.nombre = nombre
+        self._solicitud = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def iniciar(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._solicitud.clear()  # lo pedido antes de la primera carga ya está incluido
+                self._thread = threading.Thread(target=self._run, name=self.nombre, daemon=True)
+                self._thread.start()
+
+    def solicitar(self) -> None:
+        """Adelanta la próxima ejecución (p. ej. tras una invalidación explícita)."""
+        if self._thread is not None:
+            self._solicitud.set()
+
+    def _run(self) -> None:
+        while True:
+            self._solicitud.wait(self.intervalo)
+            # Se limpia antes de ejecutar: una solicitud durante la acción provoca otra vuelta
+            self._solicitud.clear()
+            try:
+                self.accion()
+            except Exception:
+                logger.exception("Falló el refresco de %s", self.nombre)
+            finally:
+                connection.close()  # conexión propia del hilo; no se retiene entre vueltas
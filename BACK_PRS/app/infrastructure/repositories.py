@@ -1,19 +1,26 @@
 from __future__ import annotations
-from typing import Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
-from django.db import transaction
-from django.db.models import Q
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
 
 from ..domain.ports.repositories import (
     EmpleadoRepository,
     RadioRepository,
     SapUsuarioRepository,
     PrestamoRepository,
+    COLUMNAS_EXPORTACION,
+    FiltrosPrestamo,
+    LoteCambios,
+    Pagina,
 )
-from ..domain.ports.audit import AuditLogRepository
-from ..domain.ports.uow import UnitOfWork
+from ..domain.ports.audit import AuditLogReader, AuditLogRepository, FiltrosAuditoria
+from ..domain.ports.uow import TransactionParticipant, UnitOfWork
 from ..domain.entities import Empleado, RadioFrecuencia, SapUsuario, Prestamo
-from ..domain.errors import EntityNotFound
+from ..domain.errors import BusinessRuleViolation, EntityNotFound
 from ..domain.value_objects import EstadoPrestamo
 
 from .models import (
@@ -23,6 +30,8 @@ from .models import (
     PrestamoModel,
     AuditEntry,
 )
+from .open_loans import OpenLoanIndex
+from .search import filtro_empleados
 from .mappers import (
     empleado_from_model,
     radio_from_model,
@@ -37,13 +46,57 @@ from .mappers import (
 # -----------------------
 
 class DjangoUnitOfWork(UnitOfWork):
+    """
+    Unidad de trabajo sobre `transaction.atomic()`. Una instancia se comparte entre
+    requests y casos de uso anidados: cada hilo lleva su propia pila de bloques
+    atomic, así que es reentrante y segura entre hilos.
+
+    Los `participants` acompañan a la unidad más externa: `begin` al entrar,
+    `before_commit` justo antes de confirmar (aún dentro de la transacción) y
+    `rollback` si termina con excepción.
+    """
+
+    def __init__(self, participants: Sequence[TransactionParticipant] = ()) -> None:
+        self.participants = tuple(participants)
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
     def __enter__(self) -> "DjangoUnitOfWork":
-        self._ctx = transaction.atomic()
-        self._ctx.__enter__()
+        stack = self._stack()
+        ctx = transaction.atomic()
+        ctx.__enter__()
+        stack.append(ctx)
+        if len(stack) == 1:
+            for p in self.participants:
+                p.begin()
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
-        self._ctx.__exit__(exc_type, exc, tb)
+        stack = self._stack()
+        ctx = stack.pop()
+        if stack:
+            ctx.__exit__(exc_type, exc, tb)
+            return
+        if exc_type is None:
+            try:
+                for p in self.participants:
+                    p.before_commit()
+            except BaseException as error:
+                self._rollback_participants()
+                ctx.__exit__(type(error), error, error.__traceback__)
+                raise
+        else:
+            self._rollback_participants()
+        ctx.__exit__(exc_type, exc, tb)
+
+    def _rollback_participants(self) -> None:
+        for p in self.participants:
+            p.rollback()
 
     def commit(self) -> None:
         # No-op: transaction.atomic() se maneja vía __exit__
@@ -54,6 +107,72 @@ class DjangoUnitOfWork(UnitOfWork):
         pass
 
 
+# Filas por sentencia en bulk_create/bulk_update (bajo el límite de variables de SQLite)
+BULK_BATCH_SIZE = 500
+
+
+def _en_bloques(valores: Iterable[str], tamano: int = BULK_BATCH_SIZE) -> Iterable[List[str]]:
+    bloque: List[str] = []
+    for v in valores:
+        bloque.append(v)
+        if len(bloque) == tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def _desactivar_por_clave(model, campo: str, claves: Iterable[str]) -> int:
+    """Marca inactivos los registros activos de `claves`, en bloques de `IN`; devuelve cuántos cambiaron."""
+    ahora = timezone.now()  # update() no dispara auto_now
+    total = 0
+    for chunk in _en_bloques(claves):
+        total += model.objects.filter(**{f"{campo}__in": chunk, "activo": True}).update(activo=False, updated_at=ahora)
+    return total
+
+
+def _actualizar_por_id(model, campos: Sequence[str], filas: Iterable[Sequence[object]]) -> None:
+    """
+    Actualiza `campos` (+ updated_at) por id con un UPDATE parametrizado en `executemany`;
+    cada fila es `(id, *valores)`. `bulk_update` arma un CASE WHEN por fila cuyo costo
+    en el ORM domina los lotes grandes.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    fields = [opts.get_field(c) for c in campos]
+    updated_at = opts.get_field("updated_at")
+    asignaciones = ", ".join(f"{qn(f.column)} = %s" for f in [*fields, updated_at])
+    sql = f"UPDATE {qn(opts.db_table)} SET {asignaciones} WHERE {qn(opts.pk.column)} = %s"
+    # auto_now no aplica fuera de save(): se fija updated_at explícitamente
+    ahora = updated_at.get_db_prep_value(timezone.now(), connection)
+    params = [
+        (*(f.get_db_prep_save(v, connection) for f, v in zip(fields, valores)), ahora, id_)
+        for id_, *valores in filas
+    ]
+    if params:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+
+def _version_tabla(model) -> str:
+    """
+    Huella del contenido de una tabla de catálogo: conteo + último `updated_at`.
+    Cambia con cualquier alta, modificación o baja que pase por el ORM.
+    """
+    agg = model.objects.aggregate(n=Count("id"), ultimo=Max("updated_at"))
+    ultimo = agg["ultimo"].timestamp() if agg["ultimo"] else 0
+    return f"{agg['n']}:{ultimo}"
+
+
+def _pagina_por_llave(qs, llave: str, limite: int, despues_de: Optional[str], mapper) -> Pagina:
+    """Keyset ascendente sobre una llave única: trae limite+1 filas para saber si hay más."""
+    if despues_de is not None:
+        qs = qs.filter(**{f"{llave}__gt": despues_de})
+    rows = list(qs.order_by(llave)[: limite + 1])
+    siguiente = (getattr(rows[limite - 1], llave),) if len(rows) > limite else None
+    return Pagina(items=[mapper(x) for x in rows[:limite]], siguiente=siguiente)
+
+
 # -----------------------
 # Empleado Repository
 # -----------------------
@@ -63,11 +182,25 @@ class DjangoEmpleadoRepository(EmpleadoRepository):
         obj = EmpleadoModel.objects.filter(cedula=cedula).first()
         return empleado_from_model(obj) if obj else None
 
-    def listar(self, q: Optional[str] = None) -> List[Empleado]:
+    def obtener_por_cedulas(self, cedulas: Iterable[str]) -> Dict[str, Empleado]:
+        keys = set(cedulas)
+        if not keys:
+            return {}
+        return {x.cedula: empleado_from_model(x) for x in EmpleadoModel.objects.filter(cedula__in=keys)}
+
+    @staticmethod
+    def _buscar(q: Optional[str]):
         qs = EmpleadoModel.objects.all()
         if q:
-            qs = qs.filter(Q(cedula__icontains=q) | Q(nombre__icontains=q))
-        return [empleado_from_model(x) for x in qs.order_by("cedula")]
+            indice = filtro_empleados(q)
+            qs = qs.filter(indice if indice is not None else Q(cedula__icontains=q) | Q(nombre__icontains=q))
+        return qs
+
+    def listar(self, q: Optional[str] = None) -> List[Empleado]:
+        return [empleado_from_model(x) for x in self._buscar(q).order_by("cedula")]
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[Empleado]:
+        return _pagina_por_llave(self._buscar(q), "cedula", limite, despues_de, empleado_from_model)
 
     def crear(self, *, cedula: str, nombre: str, activo: bool = True) -> Empleado:
         obj = EmpleadoModel.objects.create(cedula=cedula, nombre=nombre, activo=activo)
@@ -79,7 +212,7 @@ class DjangoEmpleadoRepository(EmpleadoRepository):
             raise EntityNotFound(f"Empleado {cedula} no existe")
         for k, v in cambios.items():
             setattr(obj, k, v)
-        obj.save(update_fields=list(cambios.keys()) or None)
+        obj.save(update_fields=[*cambios.keys(), "updated_at"])
         return empleado_from_model(obj)
 
     def eliminar(self, *, cedula: str) -> None:
@@ -87,6 +220,24 @@ class DjangoEmpleadoRepository(EmpleadoRepository):
         if not deleted:
             raise EntityNotFound(f"Empleado {cedula} no existe")
 
+    def crear_lote(self, empleados: List[Empleado]) -> None:
+        EmpleadoModel.objects.bulk_create(
+            [EmpleadoModel(cedula=e.cedula, nombre=e.nombre, activo=e.activo) for e in empleados],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def actualizar_lote(self, empleados: List[Empleado]) -> None:
+        _actualizar_por_id(EmpleadoModel, ("nombre", "activo"), [(e.id, e.nombre, e.activo) for e in empleados])
+
+    def cedulas_activas(self) -> Iterable[str]:
+        return EmpleadoModel.objects.filter(activo=True).values_list("cedula", flat=True).iterator(chunk_size=5000)
+
+    def desactivar_lote(self, cedulas: Iterable[str]) -> int:
+        return _desactivar_por_clave(EmpleadoModel, "cedula", cedulas)
+
+    def version(self) -> str:
+        return _version_tabla(EmpleadoModel)
+
 
 # -----------------------
 # Radio Repository
@@ -97,11 +248,24 @@ class DjangoRadioRepository(RadioRepository):
         obj = RadioFrecuenciaModel.objects.filter(codigo=codigo).first()
         return radio_from_model(obj) if obj else None
 
-    def listar(self, q: Optional[str] = None) -> List[RadioFrecuencia]:
+    def obtener_por_codigos(self, codigos: Iterable[str]) -> Dict[str, RadioFrecuencia]:
+        keys = set(codigos)
+        if not keys:
+            return {}
+        return {x.codigo: radio_from_model(x) for x in RadioFrecuenciaModel.objects.filter(codigo__in=keys)}
+
+    @staticmethod
+    def _buscar(q: Optional[str]):
         qs = RadioFrecuenciaModel.objects.all()
         if q:
             qs = qs.filter(Q(codigo__icontains=q) | Q(descripcion__icontains=q))
-        return [radio_from_model(x) for x in qs.order_by("codigo")]
+        return qs
+
+    def listar(self, q: Optional[str] = None) -> List[RadioFrecuencia]:
+        return [radio_from_model(x) for x in self._buscar(q).order_by("codigo")]
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[RadioFrecuencia]:
+        return _pagina_por_llave(self._buscar(q), "codigo", limite, despues_de, radio_from_model)
 
     def crear(self, *, codigo: str, descripcion: Optional[str] = None, activo: bool = True) -> RadioFrecuencia:
         obj = RadioFrecuenciaModel.objects.create(
@@ -115,7 +279,7 @@ class DjangoRadioRepository(RadioRepository):
             raise EntityNotFound(f"Radio {codigo} no existe")
         for k, v in cambios.items():
             setattr(obj, k, v)
-        obj.save(update_fields=list(cambios.keys()) or None)
+        obj.save(update_fields=[*cambios.keys(), "updated_at"])
         return radio_from_model(obj)
 
     def eliminar(self, *, codigo: str) -> None:
@@ -123,6 +287,18 @@ class DjangoRadioRepository(RadioRepository):
         if not deleted:
             raise EntityNotFound(f"Radio {codigo} no existe")
 
+    def crear_lote(self, radios: List[RadioFrecuencia]) -> None:
+        RadioFrecuenciaModel.objects.bulk_create(
+            [RadioFrecuenciaModel(codigo=r.codigo, descripcion=r.descripcion, activo=r.activo) for r in radios],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def actualizar_lote(self, radios: List[RadioFrecuencia]) -> None:
+        _actualizar_por_id(RadioFrecuenciaModel, ("descripcion", "activo"), [(r.id, r.descripcion, r.activo) for r in radios])
+
+    def version(self) -> str:
+        return _version_tabla(RadioFrecuenciaModel)
+
 
 # -----------------------
 # SapUsuario Repository
@@ -133,15 +309,28 @@ class DjangoSapUsuarioRepository(SapUsuarioRepository):
         obj = SapUsuarioModel.objects.filter(username=username).first()
         return sap_from_model(obj) if obj else None
 
-    def listar(self, q: Optional[str] = None) -> List[SapUsuario]:
+    def obtener_por_usernames(self, usernames: Iterable[str]) -> Dict[str, SapUsuario]:
+        keys = set(usernames)
+        if not keys:
+            return {}
+        qs = SapUsuarioModel.objects.select_related("empleado").filter(username__in=keys)
+        return {x.username: sap_from_model(x) for x in qs}
+
+    @staticmethod
+    def _buscar(q: Optional[str]):
         qs = SapUsuarioModel.objects.select_related("empleado").all()
         if q:
-            qs = qs.filter(
-                Q(username__icontains=q)
-                | Q(empleado__cedula__icontains=q)
-                | Q(empleado__nombre__icontains=q)
-            )
-        return [sap_from_model(x) for x in qs.order_by("username")]
+            indice = filtro_empleados(q, campo_id="empleado_id")
+            if indice is None:
+                indice = Q(empleado__cedula__icontains=q) | Q(empleado__nombre__icontains=q)
+            qs = qs.filter(Q(username__icontains=q) | indice)
+        return qs
+
+    def listar(self, q: Optional[str] = None) -> List[SapUsuario]:
+        return [sap_from_model(x) for x in self._buscar(q).order_by("username")]
+
+    def listar_pagina(self, q: Optional[str] = None, *, limite: int, despues_de: Optional[str] = None) -> Pagina[SapUsuario]:
+        return _pagina_por_llave(self._buscar(q), "username", limite, despues_de, sap_from_model)
 
     def crear(self, *, username: str, empleado_cedula: Optional[str] = None, activo: bool = True) -> SapUsuario:
         empleado = None
@@ -171,19 +360,219 @@ class DjangoSapUsuarioRepository(SapUsuarioRepository):
         if not deleted:
             raise EntityNotFound(f"SAP Usuario {username} no existe")
 
+    def crear_lote(self, usuarios: List[SapUsuario]) -> None:
+        """Los vínculos llegan resueltos en `empleado_id`."""
+        SapUsuarioModel.objects.bulk_create(
+            [SapUsuarioModel(username=u.username, empleado_id=u.empleado_id, activo=u.activo) for u in usuarios],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def actualizar_lote(self, usuarios: List[SapUsuario]) -> None:
+        _actualizar_por_id(SapUsuarioModel, ("empleado", "activo"), [(u.id, u.empleado_id, u.activo) for u in usuarios])
+
+    def activos_por_empleados(self, cedulas: Iterable[str]) -> List[str]:
+        usernames: List[str] = []
+        for chunk in _en_bloques(cedulas):
+            usernames.extend(
+                SapUsuarioModel.objects.filter(activo=True, empleado__cedula__in=chunk).values_list("username", flat=True)
+            )
+        return usernames
+
+    def desactivar_lote(self, usernames: Iterable[str]) -> int:
+        return _desactivar_por_clave(SapUsuarioModel, "username", usernames)
+
+    def version(self) -> str:
+        # Al borrar un empleado el ORM desvincula sus usuarios SAP con un UPDATE que no
+        # toca updated_at, por eso la versión incluye también la tabla de empleados.
+        return f"{_version_tabla(SapUsuarioModel)}/{_version_tabla(EmpleadoModel)}"
+
 
 # -----------------------
 # Prestamo Repository
 # -----------------------
 
+_RESTRICCIONES_ABIERTO = (
+    ("codigo_radio", "Radio {codigo_radio} ya está asignada"),
+    ("usuario_sap", "SAP Usuario {usuario_sap} ya tiene préstamo abierto"),
+    ("cedula", "Empleado {cedula} ya tiene préstamo abierto"),
+)
+
+
+def _violacion_prestamo_abierto(exc: IntegrityError, prestamo: Prestamo) -> BusinessRuleViolation:
+    """
+    Traduce la violación de un índice único parcial de préstamos abiertos.
+    PostgreSQL reporta el nombre de la restricción y SQLite la columna ("prestamos.cedula").
+    """
+    msg = str(exc)
+    for campo, plantilla in _RESTRICCIONES_ABIERTO:
+        if f"uniq_prestamo_abierto_{campo}" in msg or f"prestamos.{campo}" in msg:
+            return BusinessRuleViolation(plantilla.format(**prestamo.__dict__))
+    return BusinessRuleViolation("Ya existe un préstamo abierto para la cédula, el usuario SAP o el radio")
+
+_CAMPOS_PRESTAMO = (
+    "id", "cedula", "empleado_nombre", "usuario_sap", "codigo_radio",
+    "fecha_hora_prestamo", "turno", "estado", "usuario_registra", "fecha_hora_devolucion",
+)
+
+
+def _soporta_update_returning() -> bool:
+    """UPDATE ... RETURNING: PostgreSQL y SQLite >= 3.35 (MySQL/MariaDB no lo soportan en UPDATE)."""
+    return connection.vendor in ("postgresql", "sqlite") and connection.features.can_return_columns_from_insert
+
+
+def _cerrar_prestamos_returning(ids: List[int], fecha_hora: datetime) -> List[Prestamo]:
+    """
+    Cierra los préstamos abiertos de `ids` en una sola sentencia y devuelve las filas
+    afectadas, con el username de quien registró resuelto por subconsulta.
+    """
+    qn = connection.ops.quote_name
+    opts = PrestamoModel._meta
+    tabla = qn(opts.db_table)
+    campos = [opts.get_field(nombre) for nombre in _CAMPOS_PRESTAMO]
+    User = get_user_model()
+    username_col = User._meta.get_field(User.USERNAME_FIELD).column
+
+    estado = opts.get_field("estado")
+    devolucion = opts.get_field("fecha_hora_devolucion")
+    updated_at = opts.get_field("updated_at")
+    marcadores = ", ".join(["%s"] * len(ids))
+    sql = (
+        f"UPDATE {tabla} SET {qn(estado.column)} = %s, {qn(devolucion.column)} = %s, {qn(updated_at.column)} = %s "
+        f"WHERE {qn('id')} IN ({marcadores}) AND {qn(estado.column)} = %s "
+        f"RETURNING {', '.join(f'{tabla}.{qn(f.column)}' for f in campos)}, "
+        f"(SELECT u.{qn(username_col)} FROM {qn(User._meta.db_table)} u "
+        f"WHERE u.{qn(User._meta.pk.column)} = {tabla}.{qn(opts.get_field('usuario_registra').column)})"
+    )
+    params = [
+        EstadoPrestamo.DEVUELTO.value,
+        devolucion.get_db_prep_value(fecha_hora, connection),
+        updated_at.get_db_prep_value(timezone.now(), connection),
+        *ids,
+        EstadoPrestamo.ASIGNADO.value,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    # Aplica los mismos conversores que el ORM (p. ej. fechas en SQLite llegan como texto)
+    conversores = []
+    for f in campos:
+        col = f.get_col(opts.db_table)
+        conversores.append((col, connection.ops.get_db_converters(col) + f.get_db_converters(connection)))
+
+    prestamos = []
+    for row in rows:
+        valores = {}
+        for (col, convs), f, valor in zip(conversores, campos, row):
+            for conv in convs:
+                valor = conv(valor, col, connection)
+            valores[f.attname] = valor
+        obj = PrestamoModel(**valores)
+        prestamos.append(prestamo_from_model(obj, usuario_registra_username=row[-1]))
+    return prestamos
+
+
 class DjangoPrestamoRepository(PrestamoRepository):
+    def __init__(self, indice: Optional[OpenLoanIndex] = None) -> None:
+        self.indice = indice
+
     def crear(self, prestamo: Prestamo) -> Prestamo:
         fields = prestamo_to_model_fields(prestamo)
-        obj = PrestamoModel.objects.create(**fields)
+        try:
+            # Savepoint: en PostgreSQL un IntegrityError invalida la transacción externa
+            with transaction.atomic():
+                obj = PrestamoModel.objects.create(**fields)
+        except IntegrityError as exc:
+            raise _violacion_prestamo_abierto(exc, prestamo) from exc
+        if self.indice is not None:
+            self.indice.agregar_on_commit(obj.id, obj.cedula, obj.usuario_sap, obj.codigo_radio)
+        if prestamo.usuario_registra_username is not None:
+            return prestamo_from_model(obj, usuario_registra_username=prestamo.usuario_registra_username)
         # select_related para garantizar username
         obj = PrestamoModel.objects.select_related("usuario_registra").get(id=obj.id)
         return prestamo_from_model(obj)
 
+    def crear_lote(self, prestamos: List[Prestamo]) -> List[Prestamo]:
+        """
+        Inserta varios préstamos con un solo bulk_create. Si alguno viola la unicidad de
+        abiertos se revierte el lote completo y se lanza BusinessRuleViolation.
+        """
+        if not prestamos:
+            return []
+        objs = [PrestamoModel(**prestamo_to_model_fields(p)) for p in prestamos]
+        try:
+            with transaction.atomic():
+                objs = PrestamoModel.objects.bulk_create(objs)
+        except IntegrityError as exc:
+            raise BusinessRuleViolation("El lote choca con préstamos abiertos concurrentes") from exc
+        if self.indice is not None:
+            for obj in objs:
+                self.indice.agregar_on_commit(obj.id, obj.cedula, obj.usuario_sap, obj.codigo_radio)
+        faltantes = {p.usuario_registra_id for p in prestamos if p.usuario_registra_username is None}
+        usernames = dict(
+            get_user_model().objects.filter(id__in=faltantes).values_list("id", "username")
+        ) if faltantes else {}
+        return [
+            prestamo_from_model(
+                obj,
+                usuario_registra_username=p.usuario_registra_username or usernames.get(p.usuario_registra_id, ""),
+            )
+            for obj, p in zip(objs, prestamos)
+        ]
+
+    def obtener_abiertos(
+        self,
+        *,
+        cedulas: Iterable[str] = (),
+        usuarios_sap: Iterable[str] = (),
+        codigos_radio: Iterable[str] = (),
+    ) -> List[Prestamo]:
+        """Préstamos abiertos que ocupan cualquiera de las claves dadas, en una sola consulta."""
+        cond = Q()
+        for campo, valores in (("cedula", cedulas), ("usuario_sap", usuarios_sap), ("codigo_radio", codigos_radio)):
+            valores = set(valores)
+            if valores:
+                cond |= Q(**{f"{campo}__in": valores})
+        if not cond:
+            return []
+        qs = PrestamoModel.objects.select_related("usuario_registra").filter(cond, estado=EstadoPrestamo.ASIGNADO.value)
+        return [prestamo_from_model(x) for x in qs]
+
+    def obtener_conflictos_abiertos(
+        self,
+        *,
+        cedula: Optional[str] = None,
+        usuario_sap: Optional[str] = None,
+        codigo_radio: Optional[str] = None,
+    ) -> List[Prestamo]:
+        """
+        Préstamos abiertos que ocupan la cédula, el usuario SAP o el radio.
+        Con índice en memoria: si reporta ocupación se confirma por PK; si no, no se consulta
+        la BD y la unicidad queda a cargo de los índices únicos parciales al insertar.
+        Sin índice se resuelve con una sola consulta OR.
+        """
+        base = PrestamoModel.objects.select_related("usuario_registra").filter(estado=EstadoPrestamo.ASIGNADO.value)
+        if self.indice is not None:
+            ids = self.indice.candidatos(cedula=cedula, usuario_sap=usuario_sap, codigo_radio=codigo_radio)
+            if ids:
+                rows = list(base.filter(id__in=ids))
+                for id_ in ids - {x.id for x in rows}:
+                    self.indice.quitar(id_)  # cerrado por otra vía (admin, otro worker)
+                if rows:
+                    return [prestamo_from_model(x) for x in rows]
+            return []
+
+        cond = Q()
+        if cedula:
+            cond |= Q(cedula=cedula)
+        if usuario_sap:
+            cond |= Q(usuario_sap=usuario_sap)
+        if codigo_radio:
+            cond |= Q(codigo_radio=codigo_radio)
+        if not cond:
+            return []
+        return [prestamo_from_model(x) for x in base.filter(cond)]
+
     def obtener_prestamo_abierto(
         self,
         *,
@@ -201,31 +590,168 @@ class DjangoPrestamoRepository(PrestamoRepository):
         obj = qs.order_by("-fecha_hora_prestamo").first()
         return prestamo_from_model(obj) if obj else None
 
+    def _cerrar(self, ids: List[int], fecha_hora: datetime) -> List[Prestamo]:
+        """
+        UPDATE condicional (`estado='ASIGNADO'`): solo cierra lo que sigue abierto, de modo
+        que dos devoluciones concurrentes no pueden cerrar dos veces el mismo préstamo.
+        """
+        if _soporta_update_returning():
+            cerrados = _cerrar_prestamos_returning(ids, fecha_hora)
+        else:
+            with transaction.atomic():
+                n = PrestamoModel.objects.filter(id__in=ids, estado=EstadoPrestamo.ASIGNADO.value).update(
+                    estado=EstadoPrestamo.DEVUELTO.value,
+                    fecha_hora_devolucion=fecha_hora,
+                    updated_at=timezone.now(),  # update() no dispara auto_now
+                )
+                rows = [] if not n else list(
+                    PrestamoModel.objects.select_related("usuario_registra").filter(
+                        id__in=ids, estado=EstadoPrestamo.DEVUELTO.value, fecha_hora_devolucion=fecha_hora
+                    )
+                )
+            cerrados = [prestamo_from_model(x) for x in rows]
+        if self.indice is not None:
+            for prestamo in cerrados:
+                self.indice.quitar_on_commit(prestamo.id)
+        return cerrados
+
     def marcar_devolucion(self, id_: int, fecha_hora: datetime) -> Prestamo:
-        obj = PrestamoModel.objects.select_related("usuario_registra").filter(id=id_).first()
-        if not obj:
-            raise EntityNotFound(f"Préstamo {id_} no existe")
-        obj.estado = EstadoPrestamo.DEVUELTO.value
-        obj.fecha_hora_devolucion = fecha_hora
-        obj.save(update_fields=["estado", "fecha_hora_devolucion", "updated_at"])
-        return prestamo_from_model(obj)
+        cerrados = self._cerrar([id_], fecha_hora)
+        if cerrados:
+            return cerrados[0]
+        # Nada cambió: o no existe o alguien lo devolvió primero (carrera perdida)
+        if PrestamoModel.objects.filter(id=id_).exists():
+            raise BusinessRuleViolation(f"El préstamo {id_} ya fue devuelto")
+        raise EntityNotFound(f"Préstamo {id_} no existe")
+
+    def marcar_devolucion_lote(self, ids: Iterable[int], fecha_hora: datetime) -> List[Prestamo]:
+        """
+        Cierra varios préstamos con un solo UPDATE ... WHERE id IN (...) AND estado='ASIGNADO'.
+        Retorna solo los que este llamado cerró; los que ya estaban devueltos se omiten.
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return []
+        return self._cerrar(ids, fecha_hora)
+
+    def _filtrar(self, qs, filtros: Optional[FiltrosPrestamo]):
+        if not filtros:
+            return qs
+        if filtros.cedula:
+            qs = qs.filter(cedula=filtros.cedula)
+        if filtros.codigo_radio:
+            qs = qs.filter(codigo_radio=filtros.codigo_radio)
+        if filtros.usuario_sap:
+            qs = qs.filter(usuario_sap=filtros.usuario_sap)
+        if filtros.estado:
+            qs = qs.filter(estado=filtros.estado.value)
+        if filtros.turno:
+            qs = qs.filter(turno=filtros.turno.value)
+        if filtros.desde:
+            qs = qs.filter(fecha_hora_prestamo__gte=filtros.desde)
+        if filtros.hasta:
+            qs = qs.filter(fecha_hora_prestamo__lt=filtros.hasta)
+        if filtros.empleado_nombre:
+            qs = qs.filter(empleado_nombre__icontains=filtros.empleado_nombre)
+        return qs
+
+    def listar(self, filtros: Optional[FiltrosPrestamo] = None) -> List[Prestamo]:
+        qs = self._filtrar(PrestamoModel.objects.select_related("usuario_registra"), filtros)
+        return [prestamo_from_model(x) for x in qs.order_by("-fecha_hora_prestamo", "-id")]
+
+    def listar_pagina(
+        self,
+        filtros: Optional[FiltrosPrestamo] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+    ) -> Pagina[Prestamo]:
+        """
+        Keyset sobre (fecha_hora_prestamo, id) descendente: el costo depende del
+        tamaño de página y no de la profundidad del histórico.
+        """
+        qs = self._filtrar(PrestamoModel.objects.select_related("usuario_registra"), filtros)
+        if despues_de:
+            fecha, id_ = despues_de
+            qs = qs.filter(
+                Q(fecha_hora_prestamo__lt=fecha) | Q(fecha_hora_prestamo=fecha, id__lt=id_)
+            )
+        rows = list(qs.order_by("-fecha_hora_prestamo", "-id")[: limite + 1])
+        items = [prestamo_from_model(x) for x in rows[:limite]]
+        siguiente = None
+        if len(rows) > limite:
+            ultimo = items[-1]
+            siguiente = (ultimo.fecha_hora_prestamo, ultimo.id)
+        return Pagina(items=items, siguiente=siguiente)
+
+    def listar_cambios(
+        self,
+        filtros: Optional[FiltrosPrestamo] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+        hasta: datetime,
+    ) -> LoteCambios[Prestamo]:
+        """
+        Préstamos creados o modificados después del token (updated_at, id), en orden
+        ascendente. `hasta` acota la ventana para no adelantar el token sobre
+        transacciones que aún no han confirmado: el token avanza hasta la última fila
+        entregada, así que una fila con `updated_at <= hasta` que confirme después ya
+        no se entrega. `hasta` debe dejar un margen mayor que la transacción de
+        escritura más larga (`PRS_CAMBIOS_LAG_SEGUNDOS`).
+        """
+        qs = self._filtrar(PrestamoModel.objects.select_related("usuario_registra"), filtros)
+        qs = qs.filter(updated_at__lte=hasta)
+        if despues_de:
+            fecha, id_ = despues_de
+            qs = qs.filter(Q(updated_at__gt=fecha) | Q(updated_at=fecha, id__gt=id_))
+        rows = list(qs.order_by("updated_at", "id")[: limite + 1])
+        entregados = rows[:limite]
+        if not entregados:
+            return LoteCambios(items=[], token=despues_de, hay_mas=False)
+        ultimo = entregados[-1]
+        return LoteCambios(
+            items=[prestamo_from_model(x) for x in entregados],
+            token=(ultimo.updated_at, ultimo.id),
+            hay_mas=len(rows) > limite,
+        )
+
+    def token_cambios(self, *, hasta: datetime) -> Optional[Tuple[datetime, int]]:
+        row = (
+            PrestamoModel.objects.filter(updated_at__lte=hasta)
+            .order_by("-updated_at", "-id")
+            .values_list("updated_at", "id")
+            .first()
+        )
+        return (row[0], row[1]) if row else None
+
+    # Ruta ORM de cada columna de COLUMNAS_EXPORTACION
+    _CAMPOS_EXPORTACION = {"usuario_registra_username": "usuario_registra__username"}
+
+    def iterar_filas(
+        self, filtros: Optional[FiltrosPrestamo] = None, *, chunk_size: int = 2000
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Histórico en el orden del listado, como tuplas planas en el orden de
+        `COLUMNAS_EXPORTACION`. Sin instanciar modelos y leído por bloques de
+        `chunk_size` (cursor del lado del servidor donde el motor lo soporta), de modo
+        que la memoria no depende del tamaño del histórico.
+        """
+        campos = [self._CAMPOS_EXPORTACION.get(c, c) for c in COLUMNAS_EXPORTACION]
+        qs = self._filtrar(PrestamoModel.objects.all(), filtros)
+        return qs.order_by("-fecha_hora_prestamo", "-id").values_list(*campos).iterator(chunk_size=chunk_size)
 
-    def listar(self, *, cedula: Optional[str] = None, codigo_radio: Optional[str] = None) -> List[Prestamo]:
-        qs = PrestamoModel.objects.select_related("usuario_registra").all()
-        if cedula:
-            qs = qs.filter(cedula=cedula)
-        if codigo_radio:
-            qs = qs.filter(codigo_radio=codigo_radio)
-        return [prestamo_from_model(x) for x in qs.order_by("-fecha_hora_prestamo")]
-    
 
 # -----------------------
 # AuditLog Repository
 # -----------------------
 
-class DjangoAuditLogRepository(AuditLogRepository):
-    def append(self, event) -> None:
-        AuditEntry.objects.create(
+class DjangoAuditLogRepository(AuditLogRepository, AuditLogReader):
+    CAMPOS = ("id", "aggregate", "action", "id_ref", "at", "actor_user_id", "before", "after", "reason")
+
+    @staticmethod
+    def _to_model(event) -> AuditEntry:
+        return AuditEntry(
             aggregate=event.aggregate,
             action=event.action,
             id_ref=event.id_ref,
@@ -235,3 +761,49 @@ class DjangoAuditLogRepository(AuditLogRepository):
             after=event.after,
             reason=event.reason,
         )
+
+    def append(self, event) -> None:
+        self._to_model(event).save()
+
+    def append_many(self, events) -> None:
+        AuditEntry.objects.bulk_create([self._to_model(e) for e in events], batch_size=BULK_BATCH_SIZE)
+
+    @staticmethod
+    def _filtrar(qs, filtros: Optional[FiltrosAuditoria]):
+        if not filtros:
+            return qs
+        if filtros.aggregate:
+            qs = qs.filter(aggregate=filtros.aggregate)
+        if filtros.action:
+            qs = qs.filter(action=filtros.action)
+        if filtros.id_ref:
+            qs = qs.filter(id_ref=filtros.id_ref)
+        if filtros.actor_user_id is not None:
+            qs = qs.filter(actor_user_id=filtros.actor_user_id)
+        if filtros.desde:
+            qs = qs.filter(at__gte=filtros.desde)
+        if filtros.hasta:
+            qs = qs.filter(at__lt=filtros.hasta)
+        return qs
+
+    def listar_pagina(
+        self,
+        filtros: Optional[FiltrosAuditoria] = None,
+        *,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, int]] = None,
+    ) -> Pagina[Dict]:
+        """
+        Keyset sobre (at, id) descendente, apoyado en los índices compuestos de
+        `audit_log`: el costo depende del tamaño de página y no de la antigüedad.
+        """
+        qs = self._filtrar(AuditEntry.objects.all(), filtros)
+        if despues_de:
+            at, id_ = despues_de
+            qs = qs.filter(Q(at__lt=at) | Q(at=at, id__lt=id_))
+        rows = list(qs.order_by("-at", "-id").values(*self.CAMPOS)[: limite + 1])
+        items = rows[:limite]
+        siguiente = None
+        if len(rows) > limite:
+            siguiente = (items[-1]["at"], items[-1]["id"])
+        return Pagina(items=items, siguiente=siguiente)
@@ -0,0 +1,100 @@
+"""
+Infraestructura :: Resolución cacheada del rol administrador.
+
+Un usuario es admin si es superusuario o pertenece al grupo "admin". La
+pertenencia al grupo se cachea por id de usuario en memoria del proceso (TTL),
+de modo que autorizar una request no consulta la base. Los cambios de
+pertenencia (`user.groups`, `group.user_set`) y el renombrado o borrado del
+grupo invalidan la caché al confirmar la transacción; los hechos en otro worker
+quedan acotados por el TTL.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .catalog_cache import TTLCache
+
+ADMIN_GROUP = "admin"
+
+DEFAULTS = {
+    "TTL_SECONDS": 60.0,
+    "MAX_ENTRIES": 5000,
+}
+
+
+class RoleCache:
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 5000) -> None:
+        self._cache = TTLCache(ttl_seconds, max_entries)
+
+    @classmethod
+    def from_settings(cls) -> "RoleCache":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_ROLE_CACHE", {})}
+        return cls(ttl_seconds=conf["TTL_SECONDS"], max_entries=conf["MAX_ENTRIES"])
+
+    def es_admin(self, user) -> bool:
+        if not (user and user.is_authenticated):
+            return False
+        if user.is_superuser:
+            return True
+        en_grupo = self._cache.get(user.pk)
+        if en_grupo is None:
+            # Por id: no obliga a cargar la fila del usuario si viene de un token sin estado
+            en_grupo = Group.objects.filter(name=ADMIN_GROUP, user__id=user.pk).exists()
+            self._cache.set(user.pk, en_grupo)
+        return en_grupo
+
+    def invalidar(self, user_ids: Optional[Iterable[int]] = None) -> None:
+        """Descarta los usuarios indicados, o toda la caché si no se indican."""
+        if user_ids is None:
+            self._cache.clear()
+            return
+        for user_id in user_ids:
+            self._cache.discard(user_id)
+
+
+_roles: Optional[RoleCache] = None
+_roles_lock = threading.Lock()
+
+
+def get_role_cache() -> RoleCache:
+    """Instancia única de la caché de roles configurada en `PRS_ROLE_CACHE`."""
+    global _roles
+    if _roles is None:
+        with _roles_lock:
+            if _roles is None:
+                _roles = RoleCache.from_settings()
+    return _roles
+
+
+# --------- Invalidación ---------
+
+def _invalidar_on_commit(user_ids: Optional[Iterable[int]] = None) -> None:
+    ids = None if user_ids is None else list(user_ids)
+    transaction.on_commit(lambda: get_role_cache().invalidar(ids))
+
+
+def _grupos_cambiados(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    if not reverse:
+        _invalidar_on_commit([instance.pk])      # user.groups.add/remove/clear
+    else:
+        _invalidar_on_commit(pk_set)             # group.user_set...; clear() no trae ids
+
+
+def _grupo_cambiado(sender, instance, **kwargs) -> None:
+    # Renombrar o borrar un grupo (el borrado no emite m2m_changed)
+    _invalidar_on_commit()
+
+
+def conectar_invalidacion() -> None:
+    m2m_changed.connect(_grupos_cambiados, sender=get_user_model().groups.through, dispatch_uid="prs_roles_m2m")
+    post_save.connect(_grupo_cambiado, sender=Group, dispatch_uid="prs_roles_group_save")
+    post_delete.connect(_grupo_cambiado, sender=Group, dispatch_uid="prs_roles_group_delete")
@@ -0,0 +1,160 @@
+"""
+Infraestructura :: Índice de búsqueda de empleados (cédula y nombre).
+
+- SQLite: tabla virtual FTS5 `empleados_fts` (contenido externo sobre `empleados`,
+  tokenizador unicode61 sin diacríticos) sincronizada por triggers.
+- PostgreSQL: índices GIN trigram sobre `prs_unaccent(lower(nombre))` y `cedula`.
+
+Ambos permiten coincidencia por prefijo e insensible a tildes ("Jose" ~ "José").
+Una búsqueda solo de dígitos conserva la coincidencia por subcadena en la cédula
+(como el `icontains` anterior); en PostgreSQL la resuelve el índice trigram.
+En otros motores `filtro_empleados` devuelve None y se usa `icontains`.
+"""
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import EmpleadoModel
+
+FTS_TABLE = "empleados_fts"
+
+_SQLITE_INSTALAR = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        cedula, nombre, content='empleados', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON empleados BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, cedula, nombre) VALUES (new.id, new.cedula, new.nombre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON empleados BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, cedula, nombre) VALUES ('delete', old.id, old.cedula, old.nombre);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF cedula, nombre ON empleados BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, cedula, nombre) VALUES ('delete', old.id, old.cedula, old.nombre);
+        INSERT INTO {FTS_TABLE}(rowid, cedula, nombre) VALUES (new.id, new.cedula, new.nombre);
+    END""",
+]
+_SQLITE_TRIGGERS = {f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"}
+_SQLITE_DESINSTALAR = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_PG_INSTALAR = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() no es IMMUTABLE; el envoltorio con diccionario fijo sí puede indexarse
+    """CREATE OR REPLACE FUNCTION prs_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$""",
+    "CREATE INDEX IF NOT EXISTS empleados_nombre_trgm ON empleados USING gin (prs_unaccent(lower(nombre)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS empleados_cedula_trgm ON empleados USING gin (cedula gin_trgm_ops)",
+]
+_PG_DESINSTALAR = [
+    "DROP INDEX IF EXISTS empleados_cedula_trgm",
+    "DROP INDEX IF EXISTS empleados_nombre_trgm",
+    "DROP FUNCTION IF EXISTS prs_unaccent(text)",
+]
+
+_disponible: Optional[bool] = None
+
+
+def instalar_indice_empleados(conn=connection) -> None:
+    """
+    Crea (idempotente) el índice del motor actual. En SQLite, si faltan los triggers
+    (p. ej. porque una migración reconstruyó la tabla `empleados`) se recrean y el
+    índice se reconstruye desde la tabla.
+    """
+    global _disponible
+    with conn.cursor() as cursor:
+        if conn.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f"{FTS_TABLE}_%"])
+            completos = _SQLITE_TRIGGERS <= {row[0] for row in cursor.fetchall()}
+            if completos:
+                return
+            for sql in _SQLITE_INSTALAR:
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == "postgresql":
+            for sql in _PG_INSTALAR:
+                cursor.execute(sql)
+    _disponible = None
+
+
+def desinstalar_indice_empleados(conn=connection) -> None:
+    global _disponible
+    sentencias = {"sqlite": _SQLITE_DESINSTALAR, "postgresql": _PG_DESINSTALAR}.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in sentencias:
+            cursor.execute(sql)
+    _disponible = None
+
+
+def reparar_indice_empleados(conn=connection) -> None:
+    """
+    Receptor de `post_migrate`: en SQLite las migraciones que alteran `empleados`
+    reconstruyen la tabla y se pierden los triggers; si el índice existe se reinstala.
+    """
+    if conn.vendor == "sqlite" and FTS_TABLE in conn.introspection.table_names():
+        instalar_indice_empleados(conn)
+
+
+def _indice_disponible() -> bool:
+    global _disponible
+    if _disponible is None:
+        if connection.vendor == "sqlite":
+            _disponible = FTS_TABLE in connection.introspection.table_names()
+        elif connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT to_regprocedure('prs_unaccent(text)') IS NOT NULL")
+                _disponible = bool(cursor.fetchone()[0])
+        else:
+            _disponible = False
+    return _disponible
+
+
+def _terminos(q: str) -> List[str]:
+    return re.findall(r"\w+", q or "")
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filtro_empleados(q: str, campo_id: str = "id") -> Optional[Q]:
+    """
+    Q que restringe `campo_id` a los empleados cuyo nombre o cédula coinciden con
+    todos los términos de `q` (por prefijo, sin tildes); si `q` es solo dígitos, a
+    los que contienen `q` en la cédula. None si el motor no tiene índice o `q` no
+    trae términos; el llamador decide el respaldo.
+    """
+    terminos = _terminos(q)
+    if not terminos or not _indice_disponible():
+        return None
+
+    tabla = EmpleadoModel._meta.db_table
+    if q.strip().isdigit():
+        sql = f"SELECT id FROM {tabla} WHERE cedula LIKE %s"
+        return Q(**{f"{campo_id}__in": RawSQL(sql, ["%" + q.strip() + "%"])})
+
+    if connection.vendor == "sqlite":
+        # Cada término entre comillas (sin operadores FTS) y con * para prefijo
+        expresion = " ".join('"{}"*'.format(t.replace('"', '""')) for t in terminos)
+        sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        return Q(**{f"{campo_id}__in": RawSQL(sql, [expresion])})
+
+    condiciones, params = [], []
+    for termino in terminos:
+        condiciones.append(
+            "(prs_unaccent(lower(nombre)) LIKE '%%' || prs_unaccent(lower(%s)) || '%%' OR cedula LIKE %s)"
+        )
+        params += [_like_escape(termino), _like_escape(termino) + "%"]
+    sql = f"SELECT id FROM {tabla} WHERE " + " AND ".join(condiciones)
+    return Q(**{f"{campo_id}__in": RawSQL(sql, params)})
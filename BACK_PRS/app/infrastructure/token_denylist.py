@@ -0,0 +1,155 @@
+"""
+Infraestructura :: Lista de revocación de tokens JWT.
+
+La autenticación sin estado confía en los claims del token y no lee `auth_user`,
+así que desactivar un usuario, cambiar su contraseña o sus flags de rol debe
+invalidar los tokens ya emitidos. Cada uno de esos cambios registra una fila en
+`token_revocaciones`; los tokens del usuario con `iat` anterior quedan rechazados.
+
+`TokenDenylist` mantiene en memoria el último instante de revocación por usuario
+(solo de las filas dentro de la vida de un refresh token, así que es pequeña) y la
+recarga cada `REFRESH_SECONDS`. Como `iat` tiene resolución de segundos, la
+revocación se guarda truncada al segundo: un token emitido en el mismo segundo
+(p. ej. el login que sigue a un cambio de contraseña) sigue siendo válido. Las revocaciones del propio proceso se aplican al
+confirmar la transacción; las de otros workers, en la siguiente recarga.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .models import RevocacionToken
+
+DEFAULTS = {
+    "REFRESH_SECONDS": 30.0,
+}
+
+# Campos de auth_user cuyo cambio invalida los tokens emitidos
+_CAMPOS_REVOCAN = {
+    "is_active": "DESACTIVADO",
+    "password": "PASSWORD",
+    "is_superuser": "ROL",
+    "is_staff": "ROL",
+    "username": "ROL",
+}
+
+
+def _ventana() -> timedelta:
+    """Vida máxima de un token: revocaciones más antiguas ya no afectan a ninguno."""
+    jwt = getattr(settings, "SIMPLE_JWT", {})
+    return max(
+        jwt.get("ACCESS_TOKEN_LIFETIME", timedelta(minutes=5)),
+        jwt.get("REFRESH_TOKEN_LIFETIME", timedelta(days=1)),
+    )
+
+
+class TokenDenylist:
+    def __init__(self, refresh_seconds: float = 30.0) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._revocados: Dict[int, int] = {}  # user_id -> segundo (epoch) de revocación
+
+    @classmethod
+    def from_settings(cls) -> "TokenDenylist":
+        conf = {**DEFAULTS, **getattr(settings, "PRS_TOKEN_DENYLIST", {})}
+        return cls(refresh_seconds=conf["REFRESH_SECONDS"])
+
+    # --------- Carga ---------
+    def recargar(self) -> None:
+        rows = (
+            RevocacionToken.objects.filter(revocado_en__gte=timezone.now() - _ventana())
+            .values("user_id")
+            .annotate(ultimo=Max("revocado_en"))
+            .values_list("user_id", "ultimo")
+        )
+        revocados = {user_id: math.floor(ultimo.timestamp()) for user_id, ultimo in rows}
+        with self._lock:
+            self._revocados = revocados
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            self.recargar()
+
+    # --------- Consulta ---------
+    def esta_revocado(self, user_id: int, emitido_en: Optional[float]) -> bool:
+        """True si el token del usuario, emitido en `emitido_en` (claim `iat`), fue revocado."""
+        self._ensure_loaded()
+        revocado_en = self._revocados.get(user_id)
+        if revocado_en is None:
+            return False
+        # `iat` y la revocación se comparan en segundos enteros
+        return emitido_en is None or emitido_en < revocado_en
+
+    # --------- Escritura ---------
+    def revocar(self, user_id: int, motivo: str) -> None:
+        revocado_en = timezone.now()
+        RevocacionToken.objects.create(user_id=user_id, revocado_en=revocado_en, motivo=motivo)
+        transaction.on_commit(lambda: self._aplicar(user_id, math.floor(revocado_en.timestamp())))
+
+    def _aplicar(self, user_id: int, revocado_en: int) -> None:
+        with self._lock:
+            if self._loaded_at is not None:
+                self._revocados[user_id] = max(revocado_en, self._revocados.get(user_id, 0))
+
+
+_denylist: Optional[TokenDenylist] = None
+_denylist_lock = threading.Lock()
+
+
+def get_token_denylist() -> TokenDenylist:
+    """Instancia única de la lista de revocación configurada en `PRS_TOKEN_DENYLIST`."""
+    global _denylist
+    if _denylist is None:
+        with _denylist_lock:
+            if _denylist is None:
+                _denylist = TokenDenylist.from_settings()
+    return _denylist
+
+
+# --------- Señales de auth_user ---------
+
+def _usuario_por_guardar(sender, instance, update_fields=None, **kwargs) -> None:
+    instance._prs_revocar = None
+    if instance.pk is None:
+        return
+    campos = set(_CAMPOS_REVOCAN)
+    if update_fields is not None:
+        campos &= set(update_fields)  # p. ej. el last_login del login no consulta nada
+    if not campos:
+        return
+    anterior = sender.objects.filter(pk=instance.pk).values(*campos).first()
+    if anterior is None:
+        return
+    cambiados = [c for c in sorted(campos) if anterior[c] != getattr(instance, c)]
+    if cambiados:
+        instance._prs_revocar = _CAMPOS_REVOCAN[cambiados[0]]
+
+
+def _usuario_guardado(sender, instance, created, **kwargs) -> None:
+    motivo = getattr(instance, "_prs_revocar", None)
+    if motivo and not created:
+        get_token_denylist().revocar(instance.pk, motivo)
+
+
+def _usuario_eliminado(sender, instance, **kwargs) -> None:
+    get_token_denylist().revocar(instance.pk, "ELIMINADO")
+
+
+def conectar_revocacion() -> None:
+    User = get_user_model()
+    pre_save.connect(_usuario_por_guardar, sender=User, dispatch_uid="prs_tokens_pre_save")
+    post_save.connect(_usuario_guardado, sender=User, dispatch_uid="prs_tokens_post_save")
+    post_delete.connect(_usuario_eliminado, sender=User, dispatch_uid="prs_tokens_post_delete")
@@ -0,0 +1,109 @@
+"""
+Autenticación JWT sin consulta a `auth_user` por request.
+
+`StatelessJWTAuthentication` valida la firma del token y construye el usuario
+desde sus claims (`user_id`, `username`, `is_staff`, `is_superuser`, que agrega
+`ClaimsTokenObtainPairSerializer` al emitirlo). La revocación se comprueba contra
+`TokenDenylist` en memoria. `LazyTokenUser` solo carga la fila del usuario si una
+vista pide algo que no viene en el token.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..infrastructure.token_denylist import get_token_denylist
+
+
+def _user_id(token) -> Any:
+    # simplejwt serializa el id como texto; se devuelve con el tipo de la pk
+    return get_user_model()._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+
+
+def _revocado(token) -> bool:
+    return get_token_denylist().esta_revocado(_user_id(token), token.get("iat"))
+
+
+class LazyTokenUser(TokenUser):
+    """Usuario respaldado por el token; el modelo se carga al primer atributo ajeno a los claims."""
+
+    @cached_property
+    def id(self) -> Any:
+        return _user_id(self.token)
+
+    @cached_property
+    def usuario(self):
+        return get_user_model().objects.get(pk=self.id)
+
+    @cached_property
+    def username(self) -> str:
+        # Tokens emitidos antes de agregar los claims no traen `username`
+        return self.token.get("username") or self.usuario.get_username()
+
+    @property
+    def groups(self):
+        return self.usuario.groups
+
+    @property
+    def user_permissions(self):
+        return self.usuario.user_permissions
+
+    def get_group_permissions(self, obj: Optional[object] = None) -> set:
+        return self.usuario.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj: Optional[object] = None) -> set:
+        return self.usuario.get_all_permissions(obj)
+
+    def has_perm(self, perm: str, obj: Optional[object] = None) -> bool:
+        return self.usuario.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj: Optional[object] = None) -> bool:
+        return self.usuario.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module: str) -> bool:
+        return self.usuario.has_module_perms(module)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.usuario, attr)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if _revocado(validated_token):
+            raise InvalidToken("El token fue revocado.")
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Agrega al token los claims que necesita `StatelessJWTAuthentication`."""
+
+    @classmethod
+    def get_token(cls, user) -> RefreshToken:
+        token = super().get_token(user)
+        token["username"] = user.get_username()
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        return token
+
+
+class DenylistTokenRefreshSerializer(TokenRefreshSerializer):
+    """No renueva refresh tokens revocados (cambio de contraseña, rol o desactivación)."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if api_settings.USER_ID_CLAIM in refresh and _revocado(refresh):
+            raise InvalidToken("El token fue revocado.")
+        return super().validate(attrs)
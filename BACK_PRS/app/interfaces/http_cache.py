@@ -0,0 +1,37 @@
+"""
+GET condicional (ETag débil) para los listados de catálogos.
+
+El ETag se deriva de la versión que reporta el repositorio (conteo + último
+`updated_at`) y de los parámetros que cambian la respuesta, de modo que un
+`If-None-Match` vigente se responde con 304 sin cargar ni serializar filas.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+CACHE_CONTROL = "private, no-cache"  # el navegador guarda la copia pero revalida siempre
+
+
+def weak_etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join("" if p is None else str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _headers(response: HttpResponse, etag: str) -> HttpResponse:
+    response["ETag"] = etag
+    response["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def not_modified(request, etag: str) -> Optional[HttpResponse]:
+    """Respuesta 304 si el cliente ya tiene la representación `etag`; None en otro caso."""
+    response = get_conditional_response(request, etag=etag)
+    return _headers(response, etag) if response is not None else None
+
+
+def with_etag(response: HttpResponse, etag: str) -> HttpResponse:
+    return _headers(response, etag)
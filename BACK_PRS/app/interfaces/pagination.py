@@ -0,0 +1,77 @@
+"""
+Utilidades de paginación por llave (keyset / cursor) para los viewsets.
+
+El cursor es opaco para el cliente: una lista JSON codificada en base64 url-safe
+con los valores de la llave de orden del último elemento entregado.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from rest_framework.exceptions import ValidationError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable en cursor: {type(value).__name__}")
+
+
+def encode_cursor(values: Optional[Sequence[Any]]) -> Optional[str]:
+    if values is None:
+        return None
+    raw = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(raw: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decodifica un cursor y valida que tenga `size` componentes."""
+    if not raw:
+        return None
+    try:
+        padded = raw + "=" * (-len(raw) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise ValidationError({"cursor": "Cursor inválido."})
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError({"cursor": "Cursor inválido."})
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValidationError({"cursor": "Cursor inválido."})
+
+
+def is_paginated(request) -> bool:
+    """La respuesta paginada se activa con `page_size` o `cursor`; sin ellos se conserva la lista plana."""
+    params = request.query_params
+    return "page_size" in params or "cursor" in params
+
+
+def parse_page_size(request, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    raw = request.query_params.get("page_size")
+    if raw in (None, ""):
+        return default
+    try:
+        size = int(raw)
+    except (TypeError, ValueError):
+        raise ValidationError({"page_size": "Debe ser un entero valido."})
+    return max(1, min(size, maximum))
+
+
+def page_payload(results: list, siguiente: Optional[Sequence[Any]]) -> dict:
+    return {
+        "results": results,
+        "next_cursor": encode_cursor(siguiente),
+        "has_more": siguiente is not None,
+    }
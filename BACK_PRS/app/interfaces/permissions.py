@@ -1,12 +1,13 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from ..infrastructure.roles import get_role_cache
+
 class IsAdmin(BasePermission):
     """
-    Admin: superuser o miembro del grupo "admin".
+    Admin: superuser o miembro del grupo "admin" (resuelto desde la caché de roles).
     """
     def has_permission(self, request, view):
-        u = request.user
-        return bool(u and u.is_authenticated and (u.is_superuser or u.groups.filter(name="admin").exists()))
+        return get_role_cache().es_admin(request.user)
 
 class IsAuthenticatedReadOnlyOrAdmin(BasePermission):
     """
@@ -17,4 +18,4 @@ class IsAuthenticatedReadOnlyOrAdmin(BasePermission):
         u = request.user
         if request.method in SAFE_METHODS:
             return bool(u and u.is_authenticated)
-        return bool(u and u.is_authenticated and (u.is_superuser or u.groups.filter(name="admin").exists()))
+        return get_role_cache().es_admin(u)
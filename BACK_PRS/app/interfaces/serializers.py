@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import Optional
 from rest_framework import serializers
 
+from ..domain.ports.estadisticas import DIMENSIONES
+
 # ---- Empleado ----
 
 class EmpleadoRequestSerializer(serializers.Serializer):
@@ -57,6 +59,22 @@ class SapUsuarioResponseSerializer(serializers.Serializer):
     activo = serializers.BooleanField()
 
 
+class EmpleadoPageResponseSerializer(serializers.Serializer):
+    results = EmpleadoResponseSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+class RadioPageResponseSerializer(serializers.Serializer):
+    results = RadioResponseSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+class SapUsuarioPageResponseSerializer(serializers.Serializer):
+    results = SapUsuarioResponseSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+
 # ---- Auditoria ----
 
 class AuditEntryResponseSerializer(serializers.Serializer):
@@ -72,6 +90,28 @@ class AuditEntryResponseSerializer(serializers.Serializer):
     reason = serializers.CharField(allow_null=True)
 
 
+class AuditFiltrosSerializer(serializers.Serializer):
+    """Filtros de query string de la auditoría."""
+    aggregate = serializers.ChoiceField(choices=["Empleado", "RadioFrecuencia", "SapUsuario"], required=False, allow_blank=True)
+    action = serializers.ChoiceField(choices=["CREATED", "UPDATED", "DELETED", "SYNC"], required=False, allow_blank=True)
+    id_ref = serializers.CharField(max_length=128, required=False, allow_blank=True)
+    actor_user_id = serializers.IntegerField(required=False, min_value=1)
+    desde = serializers.DateTimeField(required=False)   # inclusivo
+    hasta = serializers.DateTimeField(required=False)   # exclusivo
+
+    def validate(self, attrs):
+        desde, hasta = attrs.get("desde"), attrs.get("hasta")
+        if desde and hasta and desde >= hasta:
+            raise serializers.ValidationError({"hasta": "Debe ser mayor que 'desde'."})
+        return attrs
+
+
+class AuditPageResponseSerializer(serializers.Serializer):
+    results = AuditEntryResponseSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+
 # ---- Usuarios de aplicacion ----
 
 class AppUserResponseSerializer(serializers.Serializer):
@@ -103,6 +143,15 @@ class AsignarPrestamoRequestSerializer(serializers.Serializer):
     usuario_sap = serializers.CharField(max_length=50)
     ahora = serializers.DateTimeField(required=False)  # si no llega, se tomará hora local del servidor
 
+class AsignarLoteItemSerializer(serializers.Serializer):
+    cedula = serializers.CharField(max_length=15)
+    codigo_radio = serializers.CharField(max_length=25)
+    usuario_sap = serializers.CharField(max_length=50)
+
+class AsignarLoteRequestSerializer(serializers.Serializer):
+    items = AsignarLoteItemSerializer(many=True, allow_empty=False, max_length=200)
+    ahora = serializers.DateTimeField(required=False)
+
 class DevolverPrestamoRequestSerializer(serializers.Serializer):
     """
     Debe venir EXACTAMENTE uno de los siguientes campos:
@@ -115,6 +164,12 @@ class DevolverPrestamoRequestSerializer(serializers.Serializer):
     usuario_sap = serializers.CharField(max_length=50, required=False, allow_blank=True)
     ahora = serializers.DateTimeField(required=False)
 
+class DevolverLoteRequestSerializer(serializers.Serializer):
+    codigos_radio = serializers.ListField(child=serializers.CharField(max_length=25), required=False, max_length=500)
+    cedulas = serializers.ListField(child=serializers.CharField(max_length=15), required=False, max_length=500)
+    usuarios_sap = serializers.ListField(child=serializers.CharField(max_length=50), required=False, max_length=500)
+    ahora = serializers.DateTimeField(required=False)
+
 class PrestamoResponseSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     cedula = serializers.CharField()
@@ -127,3 +182,118 @@ class PrestamoResponseSerializer(serializers.Serializer):
     usuario_registra_id = serializers.IntegerField()
     fecha_hora_devolucion = serializers.DateTimeField(allow_null=True)
     usuario_registra_username = serializers.CharField(allow_null=True)
+
+class PrestamoFiltrosSerializer(serializers.Serializer):
+    """Filtros de query string para el histórico de préstamos."""
+    cedula = serializers.CharField(max_length=15, required=False, allow_blank=True)
+    codigo_radio = serializers.CharField(max_length=25, required=False, allow_blank=True)
+    usuario_sap = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    empleado_nombre = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    estado = serializers.ChoiceField(choices=["ASIGNADO", "DEVUELTO"], required=False, allow_blank=True)
+    turno = serializers.ChoiceField(choices=["1", "2", "3"], required=False, allow_blank=True)
+    desde = serializers.DateField(required=False)   # inclusivo (día local)
+    hasta = serializers.DateField(required=False)   # inclusivo (día local)
+
+    def validate(self, attrs):
+        desde, hasta = attrs.get("desde"), attrs.get("hasta")
+        if desde and hasta and desde > hasta:
+            raise serializers.ValidationError({"hasta": "Debe ser mayor o igual a 'desde'."})
+        return attrs
+
+class ExportarPrestamosQuerySerializer(serializers.Serializer):
+    """Formato de la exportación; los filtros son los de `PrestamoFiltrosSerializer`."""
+    formato = serializers.ChoiceField(choices=["csv", "xlsx"], required=False, default="csv")
+    delimitador = serializers.ChoiceField(choices=[",", ";"], required=False, default=",")  # solo CSV
+
+class PrestamoPageResponseSerializer(serializers.Serializer):
+    results = PrestamoResponseSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+class PrestamoResumenResponseSerializer(serializers.Serializer):
+    abiertos = serializers.IntegerField()
+    abiertos_por_turno = serializers.DictField(child=serializers.IntegerField())  # claves "1" | "2" | "3"
+    vencidos = serializers.IntegerField()
+    radios_activas = serializers.IntegerField()
+    radios_asignadas = serializers.IntegerField()
+    radios_disponibles = serializers.IntegerField()
+
+class EstadisticasQuerySerializer(serializers.Serializer):
+    """Parámetros del reporte de estadísticas diarias (días locales, ambos inclusivos)."""
+    MAX_DIAS = 366
+
+    desde = serializers.DateField(required=False)   # por defecto, 30 días antes de `hasta`
+    hasta = serializers.DateField(required=False)   # por defecto, hoy
+    agrupar = serializers.CharField(required=False)  # "dia", "turno", "radio" separados por coma; por defecto "dia"
+    turno = serializers.ChoiceField(choices=["1", "2", "3"], required=False, allow_blank=True)
+    codigo_radio = serializers.CharField(max_length=25, required=False, allow_blank=True)
+
+    def validate_agrupar(self, value):
+        dimensiones = {d.strip() for d in value.split(",") if d.strip()}
+        invalidas = dimensiones - set(DIMENSIONES)
+        if invalidas:
+            raise serializers.ValidationError(f"Dimensiones inválidas: {', '.join(sorted(invalidas))}.")
+        return frozenset(dimensiones)
+
+    def validate(self, attrs):
+        desde, hasta = attrs.get("desde"), attrs.get("hasta")
+        if desde and hasta:
+            if desde > hasta:
+                raise serializers.ValidationError({"hasta": "Debe ser mayor o igual a 'desde'."})
+            if (hasta - desde).days >= self.MAX_DIAS:
+                raise serializers.ValidationError({"desde": f"El rango no puede superar {self.MAX_DIAS} días."})
+        return attrs
+
+class EstadisticaPrestamosSerializer(serializers.Serializer):
+    fecha = serializers.DateField(allow_null=True)
+    turno = serializers.CharField(allow_null=True)
+    codigo_radio = serializers.CharField(allow_null=True)
+    prestamos = serializers.IntegerField()
+    devueltos = serializers.IntegerField()
+    duracion_promedio_segundos = serializers.FloatField(allow_null=True)
+
+class EstadisticasResponseSerializer(serializers.Serializer):
+    desde = serializers.DateField()
+    hasta = serializers.DateField()
+    agrupar = serializers.ListField(child=serializers.CharField())
+    actualizado_hasta = serializers.DateTimeField(allow_null=True)
+    results = EstadisticaPrestamosSerializer(many=True)
+
+class PrestamoCambiosResponseSerializer(serializers.Serializer):
+    results = PrestamoResponseSerializer(many=True)
+    token = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+class ResultadoLoteItemSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    ok = serializers.BooleanField()
+    status = serializers.IntegerField()
+    detail = serializers.CharField(allow_null=True)
+    prestamo = PrestamoResponseSerializer(allow_null=True)
+
+class AsignarLoteResponseSerializer(serializers.Serializer):
+    creados = serializers.IntegerField()
+    fallidos = serializers.IntegerField()
+    results = ResultadoLoteItemSerializer(many=True)
+
+class NoAbiertosSerializer(serializers.Serializer):
+    codigos_radio = serializers.ListField(child=serializers.CharField())
+    cedulas = serializers.ListField(child=serializers.CharField())
+    usuarios_sap = serializers.ListField(child=serializers.CharField())
+
+class DevolverLoteResponseSerializer(serializers.Serializer):
+    devueltos = PrestamoResponseSerializer(many=True)
+    no_abiertos = NoAbiertosSerializer()
+
+
+# ---- Autocompletar ----
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    tipo = serializers.ChoiceField(choices=["cedula", "codigo_radio", "usuario_sap"])
+    q = serializers.CharField(max_length=50, allow_blank=True, trim_whitespace=True)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50, default=10)
+
+class AutocompleteItemSerializer(serializers.Serializer):
+    valor = serializers.CharField()
+    etiqueta = serializers.CharField(allow_null=True)
+    prestado = serializers.BooleanField()
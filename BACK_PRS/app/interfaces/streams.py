@@ -0,0 +1,78 @@
+"""
+Canal push (Server-Sent Events) para asignaciones y devoluciones de préstamos.
+
+Requiere servir la app por ASGI (`uvicorn core.asgi:application`): bajo WSGI la
+respuesta asíncrona se consumiría de forma bloqueante. Como `EventSource` no
+permite cabeceras, el JWT de acceso puede enviarse en `?token=`.
+"""
+from __future__ import annotations
+
+import json
+from typing import AsyncIterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from ..infrastructure.broker import BrokerPrestamoEventPublisher, get_broker
+from .authentication import StatelessJWTAuthentication
+
+HEARTBEAT_SECONDS = 15.0
+RETRY_MILLISECONDS = 3000
+
+_jwt = StatelessJWTAuthentication()
+
+
+def _raw_token(request) -> Optional[str]:
+    token = request.GET.get("token")
+    if token:
+        return token
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    parts = header.split()
+    if len(parts) == 2 and parts[0] == "Bearer":
+        return parts[1]
+    return None
+
+
+def _authenticate(request):
+    raw = _raw_token(request)
+    if not raw:
+        return None
+    try:
+        user = _jwt.get_user(_jwt.get_validated_token(raw))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+
+async def _event_stream(topic: str) -> AsyncIterator[str]:
+    sub = get_broker().subscribe(topic)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            message = await sub.get(timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                # Comentario SSE: mantiene viva la conexión a través de proxies
+                yield ": ping\n\n"
+                continue
+            yield f"event: prestamo\ndata: {json.dumps(message, separators=(',', ':'))}\n\n"
+    finally:
+        sub.close()
+
+
+async def prestamos_stream(request):
+    """GET /api/prestamos/stream/ -> eventos `prestamo` con {action, at, prestamo}."""
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({"detail": "No autenticado"}, status=401)
+
+    response = StreamingHttpResponse(
+        _event_stream(BrokerPrestamoEventPublisher.TOPIC),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
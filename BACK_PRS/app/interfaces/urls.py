@@ -7,7 +7,9 @@ from .views import (
     PrestamoViewSet,
     AuditLogViewSet,
     AppUserViewSet,
+    AutocompleteViewSet,
 )
+from .streams import prestamos_stream
 
 router = DefaultRouter()
 router.register(r"empleados", EmpleadoViewSet, basename="empleado")
@@ -16,8 +18,10 @@ router.register(r"sap-usuarios", SapUsuarioViewSet, basename="sapusuario")
 router.register(r"prestamos", PrestamoViewSet, basename="prestamo")
 router.register(r"audit-log", AuditLogViewSet, basename="auditlog")
 router.register(r"usuarios-app", AppUserViewSet, basename="usuariosapp")
+router.register(r"autocomplete", AutocompleteViewSet, basename="autocomplete")
 
 urlpatterns = [
+    path("prestamos/stream/", prestamos_stream, name="prestamos-stream"),
     path("", include(router.urls)),
 ]
 
@@ -1,43 +1,81 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Sequence
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Optional, Tuple
 from functools import wraps
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    PolymorphicProxySerializer,
+    extend_schema,
+)
 
+from .http_cache import not_modified, weak_etag, with_etag
+from .pagination import (
+    decode_cursor,
+    encode_cursor,
+    is_paginated,
+    page_payload,
+    parse_cursor_datetime,
+    parse_page_size,
+)
 from .permissions import IsAdmin, IsAuthenticatedReadOnlyOrAdmin
 from .serializers import (
+    AsignarLoteRequestSerializer,
+    AsignarLoteResponseSerializer,
     AsignarPrestamoRequestSerializer,
+    AutocompleteItemSerializer,
+    AutocompleteQuerySerializer,
+    DevolverLoteRequestSerializer,
+    DevolverLoteResponseSerializer,
     DevolverPrestamoRequestSerializer,
+    EstadisticasQuerySerializer,
+    EstadisticasResponseSerializer,
+    ExportarPrestamosQuerySerializer,
+    EmpleadoPageResponseSerializer,
     EmpleadoRequestSerializer,
     EmpleadoResponseSerializer,
     EmpleadoUpdateSerializer,
+    PrestamoCambiosResponseSerializer,
+    PrestamoFiltrosSerializer,
+    PrestamoPageResponseSerializer,
     PrestamoResponseSerializer,
+    PrestamoResumenResponseSerializer,
+    RadioPageResponseSerializer,
     RadioRequestSerializer,
     RadioResponseSerializer,
     RadioUpdateSerializer,
+    SapUsuarioPageResponseSerializer,
     SapUsuarioRequestSerializer,
     SapUsuarioResponseSerializer,
     SapUsuarioUpdateSerializer,
     AuditEntryResponseSerializer,
+    AuditFiltrosSerializer,
+    AuditPageResponseSerializer,
     AppUserCreateSerializer,
     AppUserResponseSerializer,
     AppUserUpdateSerializer,
 )
 from ..application.catalogos_service import CatalogosService
-from ..application.services import PrestamosService
+from ..application.services import PrestamosService, SolicitudAsignacion
 from ..application.use_cases import (
     ActualizarEmpleadoCmd,
     ActualizarRadioCmd,
     ActualizarSapUsuarioCmd,
+    AsignarLoteCmd,
     AsignarPrestamoCmd,
+    DevolverLoteCmd,
     CatalogosUseCases,
     CrearEmpleadoCmd,
     CrearRadioCmd,
@@ -50,33 +88,78 @@ from ..application.use_cases import (
     EliminarSapUsuarioCmd,
     PrestamoUseCases,
 )
-from ..domain.errors import BusinessRuleViolation, EntityNotFound, InactiveEntity
+from ..domain.errors import DomainError, EntityNotFound, InactiveEntity
+from ..domain.ports.audit import FiltrosAuditoria
+from ..domain.ports.estadisticas import FiltrosEstadisticas
+from ..domain.ports.repositories import FiltrosPrestamo
+from ..domain.value_objects import EstadoPrestamo, Turno
 from ..infrastructure.repositories import (
-    DjangoAuditLogRepository,
     DjangoEmpleadoRepository,
     DjangoPrestamoRepository,
     DjangoRadioRepository,
     DjangoSapUsuarioRepository,
     DjangoUnitOfWork,
 )
-from ..infrastructure.models import AuditEntry
+from ..infrastructure.audit import ActorUsernameMap, BufferedAuditLogRepository
+from ..infrastructure.audit_archive import ArchivoAuditoria
+from ..infrastructure.broker import BrokerPrestamoEventPublisher
+from ..infrastructure.estadisticas import DjangoEstadisticasPrestamos
+from ..infrastructure.exportacion import CONTENT_TYPES, ExportadorPrestamos
+from ..infrastructure.open_loans import OpenLoanIndex
+from ..infrastructure.prestamos_resumen import ContadoresPrestamos
+from ..infrastructure.autocomplete import AutocompleteIndex
+from ..infrastructure.catalog_cache import (
+    CachedEmpleadoRepository,
+    CachedRadioRepository,
+    CachedSapUsuarioRepository,
+    CatalogCache,
+)
 
 
 empleados_repo = DjangoEmpleadoRepository()
 radios_repo = DjangoRadioRepository()
 sap_repo = DjangoSapUsuarioRepository()
-prestamos_repo = DjangoPrestamoRepository()
-audit_repo = DjangoAuditLogRepository()
-uow = DjangoUnitOfWork()
-
-prestamos_svc = PrestamosService(empleados_repo, radios_repo, sap_repo, prestamos_repo, uow)
-catalogos_svc = CatalogosService(empleados_repo, radios_repo, sap_repo, audit_repo, uow)
+open_loans = OpenLoanIndex()
+prestamos_repo = DjangoPrestamoRepository(indice=open_loans)
+audit_repo = BufferedAuditLogRepository.from_settings()
+actor_usernames = ActorUsernameMap.from_settings()
+audit_archivo = ArchivoAuditoria.from_settings()
+uow = DjangoUnitOfWork(participants=[audit_repo])
+prestamo_eventos = BrokerPrestamoEventPublisher(lambda p: PrestamoResponseSerializer(p.__dict__).data)
+prestamos_contadores = ContadoresPrestamos.from_settings()
+prestamos_estadisticas = DjangoEstadisticasPrestamos()
+prestamos_exportador = ExportadorPrestamos.from_settings(prestamos_repo)
+
+# Los préstamos leen catálogos por la caché; la administración usa los repos directos
+# (lecturas frescas para validar y auditar) y es quien invalida la caché.
+catalog_cache = CatalogCache.from_settings()
+
+prestamos_svc = PrestamosService(
+    CachedEmpleadoRepository(empleados_repo, catalog_cache),
+    CachedRadioRepository(radios_repo, catalog_cache),
+    CachedSapUsuarioRepository(sap_repo, catalog_cache),
+    prestamos_repo,
+    uow,
+    [prestamo_eventos, prestamos_contadores],
+)
+autocomplete_index = AutocompleteIndex(open_loans)
+catalogos_svc = CatalogosService(
+    empleados_repo, radios_repo, sap_repo, audit_repo, uow, listeners=[catalog_cache, autocomplete_index, prestamos_contadores]
+)
 
 prestamo_uc = PrestamoUseCases(prestamos_svc)
 catalogos_uc = CatalogosUseCases(catalogos_svc)
 UserModel = get_user_model()
 
 
+def _domain_error_status(exc: DomainError) -> int:
+    if isinstance(exc, InactiveEntity):
+        return status.HTTP_409_CONFLICT
+    if isinstance(exc, EntityNotFound):
+        return status.HTTP_404_NOT_FOUND
+    return status.HTTP_400_BAD_REQUEST
+
+
 def _handle_domain_errors(func):
     """Traducir errores de dominio a respuestas HTTP."""
 
@@ -84,16 +167,70 @@ def _handle_domain_errors(func):
     def wrapper(self, request, *args, **kwargs):
         try:
             return func(self, request, *args, **kwargs)
-        except InactiveEntity as exc:
-            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
-        except BusinessRuleViolation as exc:
-            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-        except EntityNotFound as exc:
-            return Response({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        except DomainError as exc:
+            return Response({"detail": str(exc)}, status=_domain_error_status(exc))
 
     return wrapper
 
 
+_TURNOS = {"1": Turno.T1, "2": Turno.T2, "3": Turno.T3}
+
+
+def _filtros_prestamo(request) -> FiltrosPrestamo:
+    """Construye los filtros del histórico a partir del query string."""
+    serializer = PrestamoFiltrosSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    desde = data.get("desde")
+    hasta = data.get("hasta")
+    return FiltrosPrestamo(
+        cedula=data.get("cedula") or None,
+        codigo_radio=data.get("codigo_radio") or None,
+        usuario_sap=data.get("usuario_sap") or None,
+        empleado_nombre=data.get("empleado_nombre") or None,
+        estado=EstadoPrestamo(data["estado"]) if data.get("estado") else None,
+        turno=_TURNOS.get(data.get("turno") or ""),
+        desde=timezone.make_aware(datetime.combine(desde, time.min)) if desde else None,
+        hasta=timezone.make_aware(datetime.combine(hasta + timedelta(days=1), time.min)) if hasta else None,
+    )
+
+
+def _cursor_fecha_id(request, param: str = "cursor") -> Optional[Tuple[datetime, int]]:
+    values = decode_cursor(request.query_params.get(param), 2)
+    if values is None:
+        return None
+    if not isinstance(values[1], int):
+        raise ValidationError({param: "Cursor inválido."})
+    return parse_cursor_datetime(values[0]), values[1]
+
+
+def _cursor_llave(request) -> Optional[str]:
+    values = decode_cursor(request.query_params.get("cursor"), 1)
+    if values is None:
+        return None
+    if not isinstance(values[0], str):
+        raise ValidationError({"cursor": "Cursor inválido."})
+    return values[0]
+
+
+_CATALOGO_PAGE_PARAMS = [
+    OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Activa la respuesta paginada (1-500)."),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor `next_cursor` de la página anterior."),
+]
+
+_PRESTAMO_FILTER_PARAMS = [
+    OpenApiParameter("cedula", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por cédula"),
+    OpenApiParameter("codigo_radio", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por código de radio"),
+    OpenApiParameter("usuario_sap", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por usuario SAP"),
+    OpenApiParameter("empleado_nombre", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Contiene (sin distinguir mayúsculas) en el nombre del empleado"),
+    OpenApiParameter("estado", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["ASIGNADO", "DEVUELTO"]),
+    OpenApiParameter("turno", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["1", "2", "3"]),
+    OpenApiParameter("desde", OpenApiTypes.DATE, OpenApiParameter.QUERY, description="Fecha de préstamo desde (inclusive)"),
+    OpenApiParameter("hasta", OpenApiTypes.DATE, OpenApiParameter.QUERY, description="Fecha de préstamo hasta (inclusive)"),
+]
+
+
 # ----------------- Empleados -----------------
 
 
@@ -109,15 +246,31 @@ class EmpleadoViewSet(viewsets.ViewSet):
                 location=OpenApiParameter.QUERY,
                 description="Filtrar por nombre o cédula",
             )
-        ],
-        responses={200: EmpleadoResponseSerializer(many=True)},
+        ] + _CATALOGO_PAGE_PARAMS,
+        responses={
+            200: PolymorphicProxySerializer(
+                component_name="EmpleadoListResponse",
+                serializers=[EmpleadoResponseSerializer(many=True), EmpleadoPageResponseSerializer],
+                resource_type_field_name=None,
+            )
+        },
         tags=["Empleados"],
+        description="Con `page_size` o `cursor` responde `{results, next_cursor, has_more}` ordenado por cédula.",
     )
     def list(self, request):
         q = request.query_params.get("q")
+        params = request.query_params
+        etag = weak_etag("empleados", empleados_repo.version(), q, params.get("page_size"), params.get("cursor"))
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        if is_paginated(request):
+            pagina = empleados_repo.listar_pagina(q, limite=parse_page_size(request), despues_de=_cursor_llave(request))
+            data = EmpleadoResponseSerializer([emp.__dict__ for emp in pagina.items], many=True).data
+            return with_etag(Response(page_payload(data, pagina.siguiente)), etag)
         empleados = empleados_repo.listar(q=q)
-        data = [EmpleadoResponseSerializer(emp.__dict__).data for emp in empleados]
-        return Response(data)
+        data = EmpleadoResponseSerializer([emp.__dict__ for emp in empleados], many=True).data
+        return with_etag(Response(data), etag)
 
     @extend_schema(
         parameters=[OpenApiParameter("cedula", OpenApiTypes.STR, OpenApiParameter.PATH)],
@@ -125,10 +278,14 @@ class EmpleadoViewSet(viewsets.ViewSet):
         tags=["Empleados"],
     )
     def retrieve(self, request, cedula: Optional[str] = None):
+        etag = weak_etag("empleados", empleados_repo.version(), cedula)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         empleado = empleados_repo.obtener_por_cedula(cedula)
         if not empleado:
             return Response({"detail": "No encontrado"}, status=404)
-        return Response(EmpleadoResponseSerializer(empleado.__dict__).data)
+        return with_etag(Response(EmpleadoResponseSerializer(empleado.__dict__).data), etag)
 
     @extend_schema(
         request=EmpleadoRequestSerializer,
@@ -210,15 +367,31 @@ class RadioViewSet(viewsets.ViewSet):
                 location=OpenApiParameter.QUERY,
                 description="Filtrar por código o descripción",
             )
-        ],
-        responses={200: RadioResponseSerializer(many=True)},
+        ] + _CATALOGO_PAGE_PARAMS,
+        responses={
+            200: PolymorphicProxySerializer(
+                component_name="RadioListResponse",
+                serializers=[RadioResponseSerializer(many=True), RadioPageResponseSerializer],
+                resource_type_field_name=None,
+            )
+        },
         tags=["Radios"],
+        description="Con `page_size` o `cursor` responde `{results, next_cursor, has_more}` ordenado por código.",
     )
     def list(self, request):
         q = request.query_params.get("q")
+        params = request.query_params
+        etag = weak_etag("radios", radios_repo.version(), q, params.get("page_size"), params.get("cursor"))
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        if is_paginated(request):
+            pagina = radios_repo.listar_pagina(q, limite=parse_page_size(request), despues_de=_cursor_llave(request))
+            data = RadioResponseSerializer([radio.__dict__ for radio in pagina.items], many=True).data
+            return with_etag(Response(page_payload(data, pagina.siguiente)), etag)
         radios = radios_repo.listar(q=q)
-        data = [RadioResponseSerializer(radio.__dict__).data for radio in radios]
-        return Response(data)
+        data = RadioResponseSerializer([radio.__dict__ for radio in radios], many=True).data
+        return with_etag(Response(data), etag)
 
     @extend_schema(
         parameters=[OpenApiParameter("codigo", OpenApiTypes.STR, OpenApiParameter.PATH)],
@@ -226,10 +399,14 @@ class RadioViewSet(viewsets.ViewSet):
         tags=["Radios"],
     )
     def retrieve(self, request, codigo: Optional[str] = None):
+        etag = weak_etag("radios", radios_repo.version(), codigo)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         radio = radios_repo.obtener_por_codigo(codigo)
         if not radio:
             return Response({"detail": "No encontrado"}, status=404)
-        return Response(RadioResponseSerializer(radio.__dict__).data)
+        return with_etag(Response(RadioResponseSerializer(radio.__dict__).data), etag)
 
     @extend_schema(
         request=RadioRequestSerializer,
@@ -311,15 +488,31 @@ class SapUsuarioViewSet(viewsets.ViewSet):
                 location=OpenApiParameter.QUERY,
                 description="Filtrar por usuario o cédula asociada",
             )
-        ],
-        responses={200: SapUsuarioResponseSerializer(many=True)},
+        ] + _CATALOGO_PAGE_PARAMS,
+        responses={
+            200: PolymorphicProxySerializer(
+                component_name="SapUsuarioListResponse",
+                serializers=[SapUsuarioResponseSerializer(many=True), SapUsuarioPageResponseSerializer],
+                resource_type_field_name=None,
+            )
+        },
         tags=["SAP Usuarios"],
+        description="Con `page_size` o `cursor` responde `{results, next_cursor, has_more}` ordenado por usuario SAP.",
     )
     def list(self, request):
         q = request.query_params.get("q")
+        params = request.query_params
+        etag = weak_etag("users", sap_repo.version(), q, params.get("page_size"), params.get("cursor"))
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        if is_paginated(request):
+            pagina = sap_repo.listar_pagina(q, limite=parse_page_size(request), despues_de=_cursor_llave(request))
+            data = SapUsuarioResponseSerializer([user.__dict__ for user in pagina.items], many=True).data
+            return with_etag(Response(page_payload(data, pagina.siguiente)), etag)
         users = sap_repo.listar(q=q)
-        data = [SapUsuarioResponseSerializer(user.__dict__).data for user in users]
-        return Response(data)
+        data = SapUsuarioResponseSerializer([user.__dict__ for user in users], many=True).data
+        return with_etag(Response(data), etag)
 
     @extend_schema(
         parameters=[OpenApiParameter("username", OpenApiTypes.STR, OpenApiParameter.PATH)],
@@ -327,10 +520,14 @@ class SapUsuarioViewSet(viewsets.ViewSet):
         tags=["SAP Usuarios"],
     )
     def retrieve(self, request, username: Optional[str] = None):
+        etag = weak_etag("users", sap_repo.version(), username)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
         user = sap_repo.obtener_por_username(username)
         if not user:
             return Response({"detail": "No encontrado"}, status=404)
-        return Response(SapUsuarioResponseSerializer(user.__dict__).data)
+        return with_etag(Response(SapUsuarioResponseSerializer(user.__dict__).data), etag)
 
     @extend_schema(
         request=SapUsuarioRequestSerializer,
@@ -401,23 +598,106 @@ class SapUsuarioViewSet(viewsets.ViewSet):
         return Response(status=204)
 
 
+# ----------------- Autocompletar -----------------
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    http_method_names = ["get"]
+
+    def get_permissions(self):  # type: ignore[override]
+        from rest_framework.permissions import IsAuthenticated
+
+        return [IsAuthenticated()]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("tipo", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True, enum=["cedula", "codigo_radio", "usuario_sap"]),
+            OpenApiParameter("q", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True, description="Prefijo escrito por el operador."),
+            OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Máximo de sugerencias (1-50, por defecto 10)."),
+        ],
+        responses={200: AutocompleteItemSerializer(many=True)},
+        tags=["Prestamos"],
+        description=(
+            "Sugerencias por prefijo entre los registros activos del catálogo, servidas desde un índice "
+            "en memoria. `prestado` indica si ya tiene un préstamo abierto."
+        ),
+    )
+    def list(self, request):
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        sugerencias = autocomplete_index.sugerir(data["tipo"], data["q"], data["limit"])
+        return Response(AutocompleteItemSerializer([x.__dict__ for x in sugerencias], many=True).data)
+
+
 # ----------------- Auditoria -----------------
 
 
+_AUDIT_FILTER_PARAMS = [
+    OpenApiParameter("aggregate", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por aggregate (Empleado|RadioFrecuencia|SapUsuario)."),
+    OpenApiParameter("action", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por accion (CREATED|UPDATED|DELETED|SYNC)."),
+    OpenApiParameter("id_ref", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por clave de negocio (cedula, codigo, username)."),
+    OpenApiParameter("actor_user_id", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Filtrar por id del usuario que hizo el cambio."),
+    OpenApiParameter("desde", OpenApiTypes.DATETIME, OpenApiParameter.QUERY, description="Eventos desde este instante (inclusivo, ISO 8601)."),
+    OpenApiParameter("hasta", OpenApiTypes.DATETIME, OpenApiParameter.QUERY, description="Eventos antes de este instante (exclusivo, ISO 8601)."),
+]
+
+
+def _filtros_auditoria(request) -> FiltrosAuditoria:
+    serializer = AuditFiltrosSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    return FiltrosAuditoria(
+        aggregate=data.get("aggregate") or None,
+        action=data.get("action") or None,
+        id_ref=data.get("id_ref") or None,
+        actor_user_id=data.get("actor_user_id"),
+        desde=data.get("desde"),
+        hasta=data.get("hasta"),
+    )
+
+
+def _con_actor_username(entries: list) -> list:
+    usernames = actor_usernames.resolver(entry["actor_user_id"] for entry in entries)
+    for entry in entries:
+        entry["actor_username"] = usernames.get(entry["actor_user_id"])
+    return entries
+
+
 class AuditLogViewSet(viewsets.ViewSet):
     permission_classes = [IsAdmin]
     http_method_names = ["get"]
 
     @extend_schema(
-        parameters=[
-            OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Cantidad maxima de eventos a retornar (1-200)."),
-            OpenApiParameter("aggregate", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por aggregate (Empleado|RadioFrecuencia|SapUsuario)."),
+        parameters=_AUDIT_FILTER_PARAMS + [
+            OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Cantidad maxima de eventos a retornar sin paginar (1-200)."),
+            OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Activa la respuesta paginada (1-500)."),
+            OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor `next_cursor` de la página anterior."),
         ],
-        responses={200: AuditEntryResponseSerializer(many=True)},
+        responses={
+            200: PolymorphicProxySerializer(
+                component_name="AuditListResponse",
+                serializers=[AuditEntryResponseSerializer(many=True), AuditPageResponseSerializer],
+                resource_type_field_name=None,
+            )
+        },
         tags=["Auditoria"],
-        description="Obtiene los eventos de auditoria mas recientes.",
+        description=(
+            "Obtiene los eventos de auditoria, los mas recientes primero. Con `page_size` o `cursor` "
+            "responde `{results, next_cursor, has_more}` paginando por llave (at, id)."
+        ),
     )
     def list(self, request):
+        filtros = _filtros_auditoria(request)
+        if is_paginated(request):
+            pagina = audit_repo.listar_pagina(
+                filtros,
+                limite=parse_page_size(request),
+                despues_de=_cursor_fecha_id(request),
+            )
+            data = AuditEntryResponseSerializer(_con_actor_username(pagina.items), many=True).data
+            return Response(page_payload(data, pagina.siguiente))
+
         limit_raw = request.query_params.get("limit")
         try:
             limit = int(limit_raw) if limit_raw is not None else 20
@@ -425,20 +705,32 @@ class AuditLogViewSet(viewsets.ViewSet):
             raise ValidationError({"limit": "Debe ser un entero valido."})
         limit = max(1, min(limit, 200))
 
-        aggregate = request.query_params.get("aggregate")
-        qs = AuditEntry.objects.all().order_by("-at")
-        if aggregate:
-            qs = qs.filter(aggregate=aggregate)
-        entries: Sequence[AuditEntry] = list(qs[:limit])
-
-        actor_ids = {entry.actor_user_id for entry in entries}
-        user_map = {user.id: user.username for user in UserModel.objects.filter(id__in=actor_ids)}
-        for entry in entries:
-            setattr(entry, "actor_username", user_map.get(entry.actor_user_id))
-
-        serializer = AuditEntryResponseSerializer(entries, many=True)
+        pagina = audit_repo.listar_pagina(filtros, limite=limit)
+        serializer = AuditEntryResponseSerializer(_con_actor_username(pagina.items), many=True)
         return Response(serializer.data)
 
+    @extend_schema(
+        parameters=_AUDIT_FILTER_PARAMS + [
+            OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Tamaño de página (1-500)."),
+            OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor `next_cursor` de la página anterior."),
+        ],
+        responses={200: AuditPageResponseSerializer},
+        tags=["Auditoria"],
+        description=(
+            "Consulta la auditoria archivada por `archivar_auditoria` (fuera de la tabla viva), "
+            "con los mismos filtros y paginacion por llave (at, id). Acotar `desde`/`hasta` evita abrir meses innecesarios."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="archivo")
+    def archivo(self, request):
+        pagina = audit_archivo.listar_pagina(
+            _filtros_auditoria(request),
+            limite=parse_page_size(request),
+            despues_de=_cursor_fecha_id(request),
+        )
+        data = AuditEntryResponseSerializer(_con_actor_username(pagina.items), many=True).data
+        return Response(page_payload(data, pagina.siguiente))
+
 
 # ----------------- Usuarios de aplicacion -----------------
 
@@ -534,6 +826,7 @@ class AppUserViewSet(viewsets.ViewSet):
             return Response({"detail": "No puedes eliminar tu propio usuario."}, status=400)
 
         user.delete()
+        actor_usernames.invalidar()
         return Response(status=204)
 
 
@@ -544,29 +837,166 @@ class PrestamoViewSet(viewsets.ViewSet):
     permission_classes = [IsAdmin]
 
     def get_permissions(self):  # type: ignore[override]
-        if self.action in {"list", "create", "asignar", "devolver"}:
+        if self.action in {"list", "cambios", "resumen", "estadisticas", "exportar", "create", "asignar", "asignar_lote", "devolver", "devolver_lote"}:
             from rest_framework.permissions import IsAuthenticated
 
             return [IsAuthenticated()]
         return super().get_permissions()
 
     @extend_schema(
-        parameters=[
-            OpenApiParameter("cedula", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por cédula"),
-            OpenApiParameter("codigo_radio", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filtrar por código de radio"),
+        parameters=_PRESTAMO_FILTER_PARAMS + [
+            OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Activa la respuesta paginada (1-500)."),
+            OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor `next_cursor` de la página anterior."),
         ],
-        responses={200: PrestamoResponseSerializer(many=True)},
+        responses={
+            200: PolymorphicProxySerializer(
+                component_name="PrestamoListResponse",
+                serializers=[PrestamoResponseSerializer(many=True), PrestamoPageResponseSerializer],
+                resource_type_field_name=None,
+            )
+        },
         tags=["Prestamos"],
-        description="Lista préstamos. Si no se filtra, devuelve los más recientes primero.",
+        description=(
+            "Lista préstamos, los más recientes primero. Con `page_size` o `cursor` responde "
+            "`{results, next_cursor, has_more}` paginando por llave (fecha_hora_prestamo, id)."
+        ),
     )
     def list(self, request):
-        cedula: Optional[str] = request.query_params.get("cedula")
-        codigo_radio: Optional[str] = request.query_params.get("codigo_radio")
-        prestamos = prestamos_repo.listar(cedula=cedula, codigo_radio=codigo_radio)
+        filtros = _filtros_prestamo(request)
+        if is_paginated(request):
+            pagina = prestamos_repo.listar_pagina(
+                filtros,
+                limite=parse_page_size(request),
+                despues_de=_cursor_fecha_id(request),
+            )
+            data = PrestamoResponseSerializer([p.__dict__ for p in pagina.items], many=True).data
+            return Response(page_payload(data, pagina.siguiente))
+
+        prestamos = prestamos_repo.listar(filtros)
         payload = [prestamo.__dict__ for prestamo in prestamos]
         data = PrestamoResponseSerializer(payload, many=True).data
         return Response(data)
 
+    @extend_schema(
+        parameters=_PRESTAMO_FILTER_PARAMS + [
+            OpenApiParameter("token", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Token devuelto por la consulta anterior. Sin token solo se entrega el token actual."),
+            OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Máximo de cambios por respuesta (1-500)."),
+        ],
+        responses={200: PrestamoCambiosResponseSerializer},
+        tags=["Prestamos"],
+        description=(
+            "Feed incremental: préstamos creados o devueltos desde `token`, en orden de modificación. "
+            "Si `has_more` es verdadero se debe volver a consultar de inmediato con el nuevo token. "
+            "Solo se entregan cambios con más de `PRS_CAMBIOS_LAG_SEGUNDOS` de antigüedad, para no "
+            "adelantar el token sobre transacciones que aún no confirman."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="cambios")
+    def cambios(self, request):
+        filtros = _filtros_prestamo(request)
+        # El token nunca pasa de `hasta`: una transacción que confirme más de
+        # PRS_CAMBIOS_LAG_SEGUNDOS después de su `updated_at` quedaría detrás del
+        # token y no se entregaría, por eso el margen cubre la escritura más larga.
+        hasta = timezone.now() - timedelta(seconds=getattr(settings, "PRS_CAMBIOS_LAG_SEGUNDOS", 60))
+
+        if "token" not in request.query_params:
+            token = prestamos_repo.token_cambios(hasta=hasta)
+            return Response({"results": [], "token": encode_cursor(token), "has_more": False})
+
+        lote = prestamos_repo.listar_cambios(
+            filtros,
+            limite=parse_page_size(request),
+            despues_de=_cursor_fecha_id(request, "token"),
+            hasta=hasta,
+        )
+        data = PrestamoResponseSerializer([p.__dict__ for p in lote.items], many=True).data
+        return Response({"results": data, "token": encode_cursor(lote.token), "has_more": lote.hay_mas})
+
+    @extend_schema(
+        responses={200: PrestamoResumenResponseSerializer},
+        tags=["Prestamos"],
+        description=(
+            "Resumen para el tablero: préstamos abiertos (total y por turno), vencidos (abiertos hace más "
+            "de `PRS_PRESTAMOS_RESUMEN['VENCIMIENTO_HORAS']`) y radios activas asignadas/disponibles. "
+            "Se sirve desde contadores en memoria, sin recorrer el histórico."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="resumen")
+    def resumen(self, request):
+        resumen = prestamos_contadores.resumen(timezone.now())
+        return Response(PrestamoResumenResponseSerializer(resumen).data)
+
+    @extend_schema(
+        parameters=_PRESTAMO_FILTER_PARAMS + [
+            OpenApiParameter("formato", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["csv", "xlsx"], description="Por defecto `csv`."),
+            OpenApiParameter("delimitador", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=[",", ";"], description="Separador del CSV (por defecto `,`)."),
+        ],
+        responses={
+            (200, CONTENT_TYPES["csv"]): OpenApiTypes.BINARY,
+            (200, CONTENT_TYPES["xlsx"]): OpenApiTypes.BINARY,
+        },
+        tags=["Prestamos"],
+        description=(
+            "Descarga el histórico con los mismos filtros y orden que el listado, en CSV o XLSX. "
+            "Se transmite por fragmentos leyendo la base por bloques, sin cargarlo completo en memoria."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="exportar")
+    def exportar(self, request):
+        filtros = _filtros_prestamo(request)
+        serializer = ExportarPrestamosQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        formato = serializer.validated_data["formato"]
+
+        contenido = prestamos_exportador.exportar(
+            filtros, formato=formato, delimitador=serializer.validated_data["delimitador"]
+        )
+        response = StreamingHttpResponse(contenido, content_type=CONTENT_TYPES[formato])
+        response["Content-Disposition"] = f'attachment; filename="prestamos-{timezone.localtime():%Y%m%d-%H%M}.{formato}"'
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("desde", OpenApiTypes.DATE, OpenApiParameter.QUERY, description="Día inicial (inclusivo). Por defecto, 30 días antes de `hasta`."),
+            OpenApiParameter("hasta", OpenApiTypes.DATE, OpenApiParameter.QUERY, description="Día final (inclusivo). Por defecto, hoy."),
+            OpenApiParameter("agrupar", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Dimensiones separadas por coma: `dia`, `turno`, `radio` (por defecto `dia`)."),
+            OpenApiParameter("turno", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["1", "2", "3"]),
+            OpenApiParameter("codigo_radio", OpenApiTypes.STR, OpenApiParameter.QUERY),
+        ],
+        responses={200: EstadisticasResponseSerializer},
+        tags=["Prestamos"],
+        description=(
+            "Préstamos, devoluciones y duración promedio por día, turno y/o radio. Se lee de la tabla "
+            "consolidada por `consolidar_estadisticas`; `actualizado_hasta` indica hasta dónde llega."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="estadisticas")
+    def estadisticas(self, request):
+        serializer = EstadisticasQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        hasta = data.get("hasta") or timezone.localdate()
+        desde = data.get("desde") or hasta - timedelta(days=30)
+        if desde > hasta or (hasta - desde).days >= EstadisticasQuerySerializer.MAX_DIAS:
+            raise ValidationError({"desde": f"Rango inválido: máximo {EstadisticasQuerySerializer.MAX_DIAS} días hasta `hasta`."})
+
+        filtros = FiltrosEstadisticas(
+            desde=desde,
+            hasta=hasta,
+            turno=_TURNOS.get(data.get("turno") or ""),
+            codigo_radio=data.get("codigo_radio") or None,
+        )
+        agrupar = data.get("agrupar", frozenset({"dia"}))
+        filas = prestamos_estadisticas.consultar(filtros, agrupar)
+        return Response(EstadisticasResponseSerializer({
+            "desde": desde,
+            "hasta": hasta,
+            "agrupar": sorted(agrupar),
+            "actualizado_hasta": prestamos_estadisticas.actualizado_hasta(),
+            "results": filas,
+        }).data)
+
     @extend_schema(
         request=AsignarPrestamoRequestSerializer,
         responses={201: PrestamoResponseSerializer},
@@ -585,10 +1015,45 @@ class PrestamoViewSet(viewsets.ViewSet):
             usuario_sap=serializer.validated_data["usuario_sap"],
             usuario_registra_id=request.user.id,
             ahora=ahora,
+            usuario_registra_username=request.user.username,
         )
         prestamo = prestamo_uc.asignar(cmd)
         return Response(PrestamoResponseSerializer(prestamo.__dict__).data, status=201)
 
+    @extend_schema(
+        request=AsignarLoteRequestSerializer,
+        responses={200: AsignarLoteResponseSerializer},
+        tags=["Prestamos"],
+        description=(
+            "Asigna varios radios en una sola petición (máx. 200). Las solicitudes válidas se crean "
+            "juntas; cada item informa su resultado con el status HTTP que tendría por separado."
+        ),
+    )
+    @action(detail=False, methods=["post"], url_path="asignar-lote")
+    def asignar_lote(self, request):
+        serializer = AsignarLoteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cmd = AsignarLoteCmd(
+            solicitudes=tuple(SolicitudAsignacion(**item) for item in serializer.validated_data["items"]),
+            usuario_registra_id=request.user.id,
+            ahora=serializer.validated_data.get("ahora") or timezone.localtime(),
+            usuario_registra_username=request.user.username,
+        )
+        resultados = prestamo_uc.asignar_lote(cmd)
+
+        items = []
+        for i, res in enumerate(resultados):
+            items.append({
+                "index": i,
+                "ok": res.ok,
+                "status": status.HTTP_201_CREATED if res.ok else _domain_error_status(res.error),
+                "detail": None if res.ok else str(res.error),
+                "prestamo": PrestamoResponseSerializer(res.prestamo.__dict__).data if res.ok else None,
+            })
+        creados = sum(1 for r in resultados if r.ok)
+        return Response({"creados": creados, "fallidos": len(resultados) - creados, "results": items})
+
     @extend_schema(
         request=DevolverPrestamoRequestSerializer,
         responses={200: PrestamoResponseSerializer, 400: OpenApiResponse(description="Petición inválida")},
@@ -628,3 +1093,35 @@ class PrestamoViewSet(viewsets.ViewSet):
             prestamo = prestamo_uc.devolver_por_usuario_sap(cmd)
 
         return Response(PrestamoResponseSerializer(prestamo.__dict__).data)
+
+    @extend_schema(
+        request=DevolverLoteRequestSerializer,
+        responses={200: DevolverLoteResponseSerializer, 400: OpenApiResponse(description="Petición inválida")},
+        tags=["Prestamos"],
+        description=(
+            "Registra la devolución de muchos radios a la vez por códigos, cédulas y/o usuarios SAP. "
+            "Informa los identificadores que no tenían préstamo abierto."
+        ),
+    )
+    @_handle_domain_errors
+    @action(detail=False, methods=["post"], url_path="devolver-lote")
+    def devolver_lote(self, request):
+        serializer = DevolverLoteRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        cmd = DevolverLoteCmd(
+            ahora=data.get("ahora") or timezone.localtime(),
+            codigos_radio=tuple(data.get("codigos_radio", ())),
+            cedulas=tuple(data.get("cedulas", ())),
+            usuarios_sap=tuple(data.get("usuarios_sap", ())),
+        )
+        resultado = prestamo_uc.devolver_lote(cmd)
+        return Response({
+            "devueltos": PrestamoResponseSerializer([p.__dict__ for p in resultado.devueltos], many=True).data,
+            "no_abiertos": {
+                "codigos_radio": resultado.no_abiertos["codigo_radio"],
+                "cedulas": resultado.no_abiertos["cedula"],
+                "usuarios_sap": resultado.no_abiertos["usuario_sap"],
+            },
+        })
@@ -0,0 +1,119 @@
+"""
+Base común de los comandos `importar_*`: argumentos, actor de auditoría,
+progreso por lote y resumen final. Cada comando define el lector y el servicio.
+
+El comando corre en su propio proceso: sus cambios no notifican a las cachés en
+memoria de los workers web. Solo la caché de catálogos puede invalidarse desde
+aquí, y únicamente si es compartida (`PRS_CATALOG_CACHE["SHARED_ALIAS"]`); el
+resto se pone al día por expiración (ver `EPILOGO_CACHES`).
+"""
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ...application.importacion import ImportacionCatalogo, ResumenImportacion
+from ...domain.errors import BusinessRuleViolation
+from ...domain.ports.events import CatalogChangeListener
+from ...infrastructure.catalog_cache import CatalogCache
+from ...infrastructure.importacion import LECTORES, ArchivoInvalido
+
+EPILOGO_CACHES = (
+    "Los workers web no reciben aviso de la importación. La caché de catálogos "
+    "se invalida al terminar solo si PRS_CATALOG_CACHE['SHARED_ALIAS'] está "
+    "configurado; si no, refleja los cambios al vencer su TTL "
+    "(PRS_CATALOG_CACHE['TTL_SECONDS'], 60 s por defecto). El autocompletado de la "
+    "mesa de préstamos se recarga cada 5 minutos y los contadores del tablero "
+    "recargan las radios activas en su reconciliación periódica "
+    "(PRS_PRESTAMOS_RESUMEN['MAX_AGE_SECONDS'], 60 s por defecto)."
+)
+
+
+def listeners_catalogo() -> List[CatalogChangeListener]:
+    """Solo una caché compartida propaga la invalidación a los workers; una local no la vería nadie."""
+    cache = CatalogCache.from_settings()
+    return [cache] if cache.shared_alias is not None else []
+
+
+class ImportarCatalogoCommand(BaseCommand, ABC):
+    hoja_por_defecto: Optional[str] = None
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        kwargs.setdefault("epilog", EPILOGO_CACHES)
+        return super().create_parser(prog_name, subcommand, **kwargs)
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta al .xlsx, .csv o .parquet")
+        parser.add_argument("--format", choices=sorted(LECTORES), default=None, help="Formato del archivo (por defecto según la extensión)")
+        parser.add_argument(
+            "--sheet",
+            default=self.hoja_por_defecto,
+            help=f"Hoja del xlsx (por defecto '{self.hoja_por_defecto}')" if self.hoja_por_defecto else "Hoja del xlsx (por defecto la primera)",
+        )
+        parser.add_argument("--delimiter", default=None, help="Separador del csv (por defecto se detecta)")
+        parser.add_argument("--dry-run", action="store_true", help="Calcula altas/cambios/desactivaciones sin escribir")
+        parser.add_argument("--actor", required=True, help="Usuario que figura como autor en la auditoría")
+        parser.add_argument("--reason", default=None, help="Motivo registrado en la auditoría")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Filas por lote/transacción (por defecto 2000)")
+
+    # --------- Puntos de extensión ---------
+    @abstractmethod
+    def leer(self, path: str, **opciones) -> Iterator[Tuple[Any, ...]]: ...
+
+    @abstractmethod
+    def servicio(self) -> ImportacionCatalogo: ...
+
+    def lineas_resumen(self, r: ResumenImportacion) -> Dict[str, int]:
+        return {
+            "Insertados": r.insertados,
+            "Actualizados": r.actualizados,
+            "Desactivados": r.desactivados,
+            "Sin cambios": r.sin_cambios,
+            "Omitidos": r.omitidos,
+        }
+
+    # --------- Ejecución ---------
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        try:
+            actor = User.objects.get(username=opts["actor"])
+        except User.DoesNotExist:
+            raise CommandError(f"El usuario '{opts['actor']}' no existe.")
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que 0.")
+
+        inicio = time.monotonic()
+
+        def progreso(r: ResumenImportacion) -> None:
+            detalle = ", ".join(f"{v} {k.lower()}" for k, v in self.lineas_resumen(r).items())
+            self.stdout.write(f"  {r.filas} filas ({r.filas / max(time.monotonic() - inicio, 1e-6):.0f}/s): {detalle}")
+
+        try:
+            resumen = self.servicio().importar(
+                self.leer(
+                    opts["archivo"],
+                    formato=opts["format"],
+                    hoja=opts["sheet"],
+                    delimitador=opts["delimiter"],
+                ),
+                actor_user_id=actor.id,
+                reason=opts["reason"],
+                tamano_lote=opts["chunk_size"],
+                simular=opts["dry_run"],
+                sincronizar=opts.get("sync", False),
+                progreso=progreso,
+            )
+        except (ArchivoInvalido, BusinessRuleViolation, OSError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc))
+
+        if resumen.simulado:
+            self.stdout.write(self.style.WARNING(f"Simulación (--dry-run) en {time.monotonic() - inicio:.1f}s: no se escribió nada."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Importación lista en {time.monotonic() - inicio:.1f}s."))
+        ancho = max(len(k) for k in self.lineas_resumen(resumen))
+        for etiqueta, valor in self.lineas_resumen(resumen).items():
+            self.stdout.write(f"  {etiqueta.ljust(ancho)}: {valor}")
@@ -0,0 +1,59 @@
+"""
+Mueve la auditoría anterior al horizonte de retención a archivos .jsonl.gz
+mensuales y la borra de `audit_log` por lotes.
+
+Uso:
+    python manage.py archivar_auditoria
+    python manage.py archivar_auditoria --days 365 --dir /var/lib/prs/auditoria --dry-run
+"""
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...infrastructure.audit import DEFAULTS
+from ...infrastructure.audit_archive import ArchivoAuditoria, ResumenArchivo
+
+
+class Command(BaseCommand):
+    help = "Archiva en .jsonl.gz mensuales la auditoría más antigua que la retención y la borra de la tabla."
+
+    def add_arguments(self, parser):
+        conf = {**DEFAULTS, **getattr(settings, "PRS_AUDIT", {})}
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=conf["RETENTION_DAYS"],
+            help=f"Días que se conservan en la tabla (por defecto {conf['RETENTION_DAYS']})",
+        )
+        parser.add_argument("--dir", default=None, help="Directorio del archivo (por defecto PRS_AUDIT['ARCHIVE_DIR'])")
+        parser.add_argument("--dry-run", action="store_true", help="Cuenta lo que se archivaría sin escribir ni borrar")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Entradas por lote/transacción (por defecto 5000)")
+
+    def handle(self, *args, **opts):
+        if opts["days"] < 0:
+            raise CommandError("--days no puede ser negativo.")
+        if opts["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que 0.")
+
+        archivo = ArchivoAuditoria(opts["dir"]) if opts["dir"] else ArchivoAuditoria.from_settings()
+        antes_de = ArchivoAuditoria.horizonte(opts["days"])
+        inicio = time.monotonic()
+
+        def progreso(r: ResumenArchivo) -> None:
+            self.stdout.write(f"  {r.archivados} entradas ({r.archivados / max(time.monotonic() - inicio, 1e-6):.0f}/s)")
+
+        try:
+            resumen = archivo.archivar(antes_de, tamano_lote=opts["chunk_size"], simular=opts["dry_run"], progreso=progreso)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if resumen.simulado:
+            self.stdout.write(self.style.WARNING(f"Simulación (--dry-run) en {time.monotonic() - inicio:.1f}s: no se escribió nada."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Archivo listo en {time.monotonic() - inicio:.1f}s ({archivo.directorio})."))
+        self.stdout.write(f"  Anteriores a : {antes_de.isoformat()}")
+        self.stdout.write(f"  Archivadas   : {resumen.archivados}")
+        self.stdout.write(f"  Particiones  : {', '.join(sorted(resumen.particiones)) or '-'}")
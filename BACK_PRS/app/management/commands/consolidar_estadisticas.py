@@ -0,0 +1,43 @@
+"""
+Consolida en `prestamos_daily_stats` los días con préstamos creados o devueltos
+desde la última corrida. Pensado para ejecutarse periódicamente (cron).
+
+Uso:
+    python manage.py consolidar_estadisticas
+    python manage.py consolidar_estadisticas --full
+    python manage.py consolidar_estadisticas --dry-run
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...infrastructure.estadisticas import ConsolidacionEstadisticas, ResumenConsolidacion
+
+
+class Command(BaseCommand):
+    help = "Recalcula las estadísticas diarias de préstamos de los días modificados desde la última marca."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Reconstruye todo el histórico e ignora la marca")
+        parser.add_argument("--dry-run", action="store_true", help="Calcula los días y filas afectados sin escribir")
+
+    def handle(self, *args, **opts):
+        consolidacion = ConsolidacionEstadisticas.from_settings()
+        inicio = time.monotonic()
+
+        def progreso(r: ResumenConsolidacion) -> None:
+            self.stdout.write(f"  {r.filas} filas ({time.monotonic() - inicio:.1f}s)")
+
+        resumen = consolidacion.consolidar(completo=opts["full"], simular=opts["dry_run"], progreso=progreso)
+
+        if resumen.simulado:
+            self.stdout.write(self.style.WARNING(f"Simulación (--dry-run) en {time.monotonic() - inicio:.1f}s: no se escribió nada."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Estadísticas consolidadas en {time.monotonic() - inicio:.1f}s."))
+        dias = resumen.dias
+        rango = f"{dias[0].isoformat()} a {dias[-1].isoformat()}" if dias else "-"
+        self.stdout.write(f"  Días recalculados : {len(dias)} ({rango})")
+        self.stdout.write(f"  Filas             : {resumen.filas}")
+        self.stdout.write(f"  Marca             : {resumen.marca[0].isoformat() if resumen.marca else '-'}")
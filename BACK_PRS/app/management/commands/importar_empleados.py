@@ -0,0 +1,57 @@
+"""
+python manage.py importar_empleados "BASE DE DATOS A&T.xlsx" --actor admin
+python manage.py importar_empleados empleados.csv --actor admin --dry-run
+python manage.py importar_empleados maestro.xlsx --actor admin --sync
+
+Importa o actualiza empleados desde un archivo de RRHH (xlsx, csv o parquet) por
+lotes, con auditoría. `--dry-run` solo calcula el resumen. `--sync` trata el
+archivo como maestro: desactiva a quienes no aparecen y a sus usuarios SAP.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator
+
+from ...application.importacion import FilaEmpleado, ImportacionEmpleadosService, ResumenImportacion
+from ...infrastructure.importacion import HOJA_EMPLEADOS, leer_empleados
+from ...infrastructure.repositories import (
+    DjangoAuditLogRepository,
+    DjangoEmpleadoRepository,
+    DjangoSapUsuarioRepository,
+    DjangoUnitOfWork,
+)
+from ._importacion import ImportarCatalogoCommand, listeners_catalogo
+
+
+class Command(ImportarCatalogoCommand):
+    help = "Importa o actualiza empleados (cédula, nombre, activo) desde xlsx/csv/parquet, por lotes y con auditoría."
+    hoja_por_defecto = HOJA_EMPLEADOS
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="El archivo es el maestro completo: desactiva empleados ausentes y sus usuarios SAP (una sola transacción)",
+        )
+
+    def leer(self, path: str, **opciones) -> Iterator[FilaEmpleado]:
+        return leer_empleados(path, **opciones)
+
+    def servicio(self) -> ImportacionEmpleadosService:
+        return ImportacionEmpleadosService(
+            DjangoEmpleadoRepository(),
+            DjangoAuditLogRepository(),
+            DjangoUnitOfWork(),
+            listeners=listeners_catalogo(),
+            sap=DjangoSapUsuarioRepository(),
+        )
+
+    def lineas_resumen(self, r: ResumenImportacion) -> Dict[str, int]:
+        lineas = super().lineas_resumen(r)
+        if self.sincronizando:
+            lineas.update({"Ausentes desactivados": r.ausentes, "SAP desactivados": r.sap_desactivados})
+        return lineas
+
+    def handle(self, *args, **opts):
+        self.sincronizando = opts["sync"]
+        super().handle(*args, **opts)
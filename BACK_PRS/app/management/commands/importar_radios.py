@@ -0,0 +1,32 @@
+"""
+python manage.py importar_radios radios.csv --actor admin [--dry-run]
+
+Importa o actualiza el catálogo de radios (código, descripción, activo) por lotes, con auditoría.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+from ...application.importacion import FilaRadio, ImportacionRadiosService
+from ...infrastructure.importacion import leer_radios
+from ...infrastructure.repositories import (
+    DjangoAuditLogRepository,
+    DjangoRadioRepository,
+    DjangoUnitOfWork,
+)
+from ._importacion import ImportarCatalogoCommand, listeners_catalogo
+
+
+class Command(ImportarCatalogoCommand):
+    help = "Importa o actualiza radios (código, descripción, activo) desde xlsx/csv/parquet, por lotes y con auditoría."
+
+    def leer(self, path: str, **opciones) -> Iterator[FilaRadio]:
+        return leer_radios(path, **opciones)
+
+    def servicio(self) -> ImportacionRadiosService:
+        return ImportacionRadiosService(
+            DjangoRadioRepository(),
+            DjangoAuditLogRepository(),
+            DjangoUnitOfWork(),
+            listeners=listeners_catalogo(),
+        )
@@ -0,0 +1,39 @@
+"""
+python manage.py importar_sap_usuarios usuarios_sap.xlsx --actor admin [--dry-run]
+
+Importa o actualiza usuarios SAP (usuario, cédula del empleado, activo) por lotes,
+con auditoría. Las cédulas se vinculan con una consulta por lote; las que no
+corresponden a un empleado se reportan y el vínculo no se modifica.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator
+
+from ...application.importacion import FilaSapUsuario, ImportacionSapUsuariosService, ResumenImportacion
+from ...infrastructure.importacion import leer_sap_usuarios
+from ...infrastructure.repositories import (
+    DjangoAuditLogRepository,
+    DjangoEmpleadoRepository,
+    DjangoSapUsuarioRepository,
+    DjangoUnitOfWork,
+)
+from ._importacion import ImportarCatalogoCommand, listeners_catalogo
+
+
+class Command(ImportarCatalogoCommand):
+    help = "Importa o actualiza usuarios SAP (usuario, cédula, activo) desde xlsx/csv/parquet, por lotes y con auditoría."
+
+    def leer(self, path: str, **opciones) -> Iterator[FilaSapUsuario]:
+        return leer_sap_usuarios(path, **opciones)
+
+    def servicio(self) -> ImportacionSapUsuariosService:
+        return ImportacionSapUsuariosService(
+            DjangoSapUsuarioRepository(),
+            DjangoEmpleadoRepository(),
+            DjangoAuditLogRepository(),
+            DjangoUnitOfWork(),
+            listeners=listeners_catalogo(),
+        )
+
+    def lineas_resumen(self, r: ResumenImportacion) -> Dict[str, int]:
+        return {**super().lineas_resumen(r), "Cédula sin empleado": r.sin_empleado}
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_remove_prestamomodel_prestamos_usuario_registra_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['-fecha_hora_prestamo', '-id'], name='prestamos_fecha_h_a16493_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['estado', '-fecha_hora_prestamo', '-id'], name='prestamos_estado_9acd9f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['turno', '-fecha_hora_prestamo', '-id'], name='prestamos_turno_536264_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['usuario_sap', '-fecha_hora_prestamo', '-id'], name='prestamos_usuario_bd57e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['cedula', '-fecha_hora_prestamo', '-id'], name='prestamos_cedula_2fd9ba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prestamomodel',
+            index=models.Index(fields=['codigo_radio', '-fecha_hora_prestamo', '-id'], name='prestamos_codigo__c60539_idx'),
+        ),
+    ]
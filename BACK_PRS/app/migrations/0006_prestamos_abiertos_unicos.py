@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:06
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def verificar_abiertos_duplicados(apps, schema_editor):
+    """Aborta con un mensaje claro si hay datos que violarían los índices únicos parciales."""
+    PrestamoModel = apps.get_model("app", "PrestamoModel")
+    for campo in ("cedula", "usuario_sap", "codigo_radio"):
+        duplicados = list(
+            PrestamoModel.objects.filter(estado="ASIGNADO")
+            .values(campo)
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+            .values_list(campo, flat=True)[:20]
+        )
+        if duplicados:
+            raise RuntimeError(
+                f"Hay préstamos ASIGNADO duplicados por {campo}: {', '.join(duplicados)}. "
+                "Ciérrelos antes de aplicar esta migración."
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_prestamos_cambios_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_abiertos_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='prestamomodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado', 'ASIGNADO')), fields=('cedula',), name='uniq_prestamo_abierto_cedula'),
+        ),
+        migrations.AddConstraint(
+            model_name='prestamomodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado', 'ASIGNADO')), fields=('usuario_sap',), name='uniq_prestamo_abierto_usuario_sap'),
+        ),
+        migrations.AddConstraint(
+            model_name='prestamomodel',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado', 'ASIGNADO')), fields=('codigo_radio',), name='uniq_prestamo_abierto_codigo_radio'),
+        ),
+    ]
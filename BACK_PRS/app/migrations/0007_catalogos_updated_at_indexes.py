@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_prestamos_abiertos_unicos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='empleadomodel',
+            index=models.Index(fields=['updated_at'], name='empleados_updated_ad0357_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='radiofrecuenciamodel',
+            index=models.Index(fields=['updated_at'], name='radios_updated_1c1f17_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sapusuariomodel',
+            index=models.Index(fields=['updated_at'], name='sap_usuario_updated_ade607_idx'),
+        ),
+    ]
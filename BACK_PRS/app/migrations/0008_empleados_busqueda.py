@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def instalar(apps, schema_editor):
+    from app.infrastructure.search import instalar_indice_empleados
+
+    instalar_indice_empleados(schema_editor.connection)
+
+
+def desinstalar(apps, schema_editor):
+    from app.infrastructure.search import desinstalar_indice_empleados
+
+    desinstalar_indice_empleados(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """Índice de búsqueda de empleados: FTS5 en SQLite, GIN trigram en PostgreSQL."""
+
+    dependencies = [
+        ('app', '0007_catalogos_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(instalar, desinstalar),
+    ]
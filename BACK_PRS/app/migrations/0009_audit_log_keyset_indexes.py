@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_empleados_busqueda'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditentry',
+            name='audit_log_aggrega_797e08_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditentry',
+            name='audit_log_at_1a4cfc_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditentry',
+            name='audit_log_actor_u_ae2850_idx',
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='action',
+            field=models.CharField(max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='actor_user_id',
+            field=models.IntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='aggregate',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='id_ref',
+            field=models.CharField(max_length=128),
+        ),
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['-at', '-id'], name='audit_log_at_5cbc62_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['aggregate', '-at', '-id'], name='audit_log_aggrega_d72ed4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['actor_user_id', '-at', '-id'], name='audit_log_actor_u_05a78e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['id_ref', '-at', '-id'], name='audit_log_id_ref_332a9a_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_audit_log_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevocacionToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(db_index=True)),
+                ('revocado_en', models.DateTimeField(db_index=True)),
+                ('motivo', models.CharField(max_length=32)),
+            ],
+            options={
+                'db_table': 'token_revocaciones',
+            },
+        ),
+    ]
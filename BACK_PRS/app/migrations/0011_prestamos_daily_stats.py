@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_token_revocaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaConsolidacion',
+            fields=[
+                ('nombre', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('updated_at', models.DateTimeField()),
+                ('ultimo_id', models.BigIntegerField()),
+                ('ejecutado_en', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'consolidacion_marcas',
+            },
+        ),
+        migrations.CreateModel(
+            name='PrestamoDiaStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('turno', models.CharField(max_length=40)),
+                ('codigo_radio', models.CharField(max_length=25)),
+                ('prestamos', models.IntegerField()),
+                ('devueltos', models.IntegerField()),
+                ('duracion_total', models.DurationField()),
+            ],
+            options={
+                'db_table': 'prestamos_daily_stats',
+                'indexes': [models.Index(fields=['codigo_radio', 'fecha'], name='prestamos_d_codigo__bd40c7_idx'), models.Index(fields=['turno', 'fecha'], name='prestamos_d_turno_79d676_idx')],
+                'constraints': [models.UniqueConstraint(fields=('fecha', 'turno', 'codigo_radio'), name='uniq_prestamos_daily_stats')],
+            },
+        ),
+    ]
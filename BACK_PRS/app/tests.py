@@ -1,3 +1,44 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .infrastructure.token_denylist import TokenDenylist
+
+
+class RevocacionTokenMismoSegundoTests(TestCase):
+    """`iat` tiene resolución de segundos: un token del mismo segundo que la revocación es válido."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("operador", password="clave-inicial")
+
+    def test_token_emitido_en_el_segundo_de_la_revocacion_es_valido(self):
+        denylist = TokenDenylist()
+        denylist.recargar()
+        revocado_en = datetime(2026, 10, 18, 12, 0, 0, 700000, tzinfo=dt_timezone.utc)
+        with mock.patch("app.infrastructure.token_denylist.timezone.now", return_value=revocado_en):
+            with self.captureOnCommitCallbacks(execute=True):
+                denylist.revocar(self.user.id, "PASSWORD")
+
+        segundo = int(revocado_en.timestamp())
+        self.assertFalse(denylist.esta_revocado(self.user.id, segundo))
+        self.assertTrue(denylist.esta_revocado(self.user.id, segundo - 1))
+
+        # La recarga desde la base aplica el mismo truncamiento
+        denylist.recargar()
+        self.assertFalse(denylist.esta_revocado(self.user.id, segundo))
+        self.assertTrue(denylist.esta_revocado(self.user.id, segundo - 1))
+
+    def test_login_inmediato_tras_cambiar_la_clave(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("clave-nueva")
+            self.user.save()
+
+        client = APIClient()
+        tokens = client.post("/api/token/", {"username": "operador", "password": "clave-nueva"}, format="json")
+        self.assertEqual(tokens.status_code, 200)
 
-# Create your tests here.
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens.json()['access']}")
+        self.assertEqual(client.get("/api/empleados/").status_code, 200)
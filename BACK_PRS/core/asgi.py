@@ -3,6 +3,11 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Es el punto de entrada requerido por el canal push de préstamos
+(`/api/prestamos/stream/`, Server-Sent Events), p. ej.:
+
+    uvicorn core.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -68,7 +68,8 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT sin estado: usuario desde los claims, revocación en memoria (PRS_TOKEN_DENYLIST)
+        "app.interfaces.authentication.StatelessJWTAuthentication",
     ],
 }
 
@@ -82,9 +83,88 @@ SPECTACULAR_SETTINGS = {
 # CORS para desarrollo
 
 CORS_ALLOW_ALL_ORIGINS = True
+# El frontend lee el nombre de archivo de las exportaciones
+CORS_EXPOSE_HEADERS = ["Content-Disposition"]
 
 from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=8),
-    "REFRESH_TOKEN_LIFETIME": timedelta(days=7), }
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_OBTAIN_SERIALIZER": "app.interfaces.authentication.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "app.interfaces.authentication.DenylistTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "app.interfaces.authentication.LazyTokenUser",
+}
+
+
+# Feed incremental de préstamos: el token no pasa de ahora - PRS_CAMBIOS_LAG_SEGUNDOS.
+# Una transacción que confirma más de este margen después de fijar su `updated_at`
+# queda detrás del token y el feed no la entrega nunca: debe ser al menos la
+# transacción de escritura más larga (lotes de asignación/devolución). Igual que
+# PRS_ESTADISTICAS["LAG_SECONDS"]; a cambio, el feed muestra los cambios con ese retraso.
+PRS_CAMBIOS_LAG_SEGUNDOS = 60
 
+# Broker del canal push de préstamos (SSE). El de memoria solo cubre un proceso;
+# con varios workers se debe apuntar a una implementación externa compatible.
+PRS_EVENT_BROKER = "app.infrastructure.broker.InMemoryBroker"
+
+# Caché de catálogos para el flujo de préstamos. SHARED_ALIAS: alias de CACHES
+# (Redis/Memcached) para que varios workers compartan la invalidación.
+PRS_CATALOG_CACHE = {
+    "TTL_SECONDS": 60,
+    "MAX_ENTRIES": 5000,
+    "SHARED_ALIAS": None,
+}
+
+# Auditoría de catálogos: se acumula por unidad de trabajo y se inserta en un solo
+# bulk_create antes del commit. MODE "background" la escribe tras el commit desde un
+# hilo con cola acotada (no atómica con el cambio; se drena al apagar el proceso).
+PRS_AUDIT = {
+    "MODE": "sync",
+    "QUEUE_SIZE": 10000,
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL_SECONDS": 1.0,
+    # Modo "background": un lote que falla se reintenta con espera exponencial
+    # y, agotados los intentos, se vuelca a SPILL_DIR hasta poder reinsertarlo.
+    "MAX_RETRIES": 5,
+    "RETRY_BACKOFF_SECONDS": 0.5,
+    "SPILL_DIR": BASE_DIR / "auditoria_pendiente",
+    "USERNAME_TTL_SECONDS": 300.0,  # cache id -> username de la consulta de auditoria
+    # Retencion: `archivar_auditoria` mueve lo anterior a RETENTION_DAYS a
+    # ARCHIVE_DIR (un .jsonl.gz por mes) y lo borra de la tabla.
+    "RETENTION_DAYS": 180,
+    "ARCHIVE_DIR": BASE_DIR / "archivo_auditoria",
+}
+
+# Caché del rol admin (grupo "admin") por usuario. Se invalida al cambiar la
+# pertenencia al grupo; en otros workers el cambio se ve al vencer el TTL.
+PRS_ROLE_CACHE = {
+    "TTL_SECONDS": 60.0,
+    "MAX_ENTRIES": 5000,
+}
+
+# Revocación de JWT (desactivación, cambio de contraseña o de rol). Cada worker
+# recarga la lista cada REFRESH_SECONDS; en el propio proceso aplica al instante.
+PRS_TOKEN_DENYLIST = {
+    "REFRESH_SECONDS": 30.0,
+}
+
+# Resumen del tablero (/api/prestamos/resumen/). Un préstamo abierto hace más de
+# VENCIMIENTO_HORAS (un turno) cuenta como vencido; los contadores en memoria se
+# reconstruyen desde la base en segundo plano cada MAX_AGE_SECONDS.
+PRS_PRESTAMOS_RESUMEN = {
+    "VENCIMIENTO_HORAS": 8.0,
+    "MAX_AGE_SECONDS": 60.0,
+}
+
+# Estadísticas diarias de préstamos (`consolidar_estadisticas`). La marca no pasa
+# de ahora - LAG_SECONDS para no saltar transacciones en curso; los días se
+# recalculan en tramos de hasta DIAS_POR_LOTE días consecutivos.
+PRS_ESTADISTICAS = {
+    "LAG_SECONDS": 60.0,
+    "DIAS_POR_LOTE": 31,
+}
+
+# Exportación del histórico (/api/prestamos/exportar/): filas leídas por bloque.
+PRS_EXPORTACION = {
+    "CHUNK_SIZE": 2000,
+}
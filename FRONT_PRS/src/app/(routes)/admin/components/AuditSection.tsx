@@ -16,12 +16,14 @@ const ACTION_LABELS: Record<string, string> = {
   CREATED: "Creado",
   UPDATED: "Actualizado",
   DELETED: "Eliminado",
+  SYNC: "Sincronizado",
 };
 
 const ACTION_COLORS: Record<string, { bg: string; color: string }> = {
   CREATED: { bg: "color-mix(in oklab, var(--surface) 60%, #22c55e 40%)", color: "var(--fg)" },
   UPDATED: { bg: "color-mix(in oklab, var(--surface) 60%, #f59e0b 40%)", color: "var(--fg)" },
   DELETED: { bg: "color-mix(in oklab, var(--surface) 55%, #ef4444 45%)", color: "var(--fg)" },
+  SYNC: { bg: "color-mix(in oklab, var(--surface) 60%, #3b82f6 40%)", color: "var(--fg)" },
 };
 
 const AGGREGATE_LABELS: Record<string, string> = {
@@ -135,6 +137,10 @@ function diffSummary(
   after: Record<string, unknown> | null,
   action: string
 ) {
+  if (action === "SYNC" && after) {
+    // Resumen de la sincronizacion con el maestro de RRHH: las listas completas quedan en el JSON
+    return `empleados desactivados: ${valueToText(after.desactivados)}, usuarios SAP desactivados: ${valueToText(after.sap_desactivados)}`;
+  }
   if (action === "CREATED" && after) {
     return listEntries(after);
   }
@@ -1,15 +1,15 @@
 "use client";
 
-import { useCallback, useEffect, useMemo, useState } from "react";
-import { apiDELETE, apiGET, apiPATCH, apiPOST } from "@/lib/api";
+import { useCallback, useEffect, useState } from "react";
+import { apiDELETE, apiPATCH, apiPOST } from "@/lib/api";
 import type { Empleado, Radio, SapUsuario } from "@/lib/types";
 import {
-  ITEMS_PER_PAGE,
   buttonClass,
   statusStyle,
   type NotifyFn,
 } from "./shared";
 import { useBusyMutation } from "./useBusyMutation";
+import { useKeysetList } from "./useKeysetList";
 import { Pagination } from "./Pagination";
 
 type CatalogTab = "empleados" | "radios" | "sap";
@@ -59,46 +59,10 @@ const SAP_ENDPOINT = "/sap-usuarios/";
 
 function useEmpleadosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unknown> | unknown) {
   const { busy, runMutation } = useBusyMutation(notify);
-  const [items, setItems] = useState<Empleado[]>([]);
   const [cedula, setCedula] = useState("");
   const [nombre, setNombre] = useState("");
-  const [filter, setFilter] = useState("");
-  const [page, setPage] = useState(1);
-
-  const load = useCallback(async () => {
-    const data = await apiGET<Empleado[]>(EMPLEADOS_ENDPOINT);
-    setItems(data);
-  }, []);
-
-  useEffect(() => {
-    void load().catch((error) => {
-      const message =
-        error instanceof Error ? error.message : "No se pudieron cargar los empleados.";
-      notify("error", message);
-    });
-  }, [load, notify]);
-
-  const filtered = useMemo(() => {
-    const value = filter.trim().toLowerCase();
-    if (!value) return items;
-    return items.filter(
-      (item) => item.cedula.toLowerCase().includes(value) || item.nombre.toLowerCase().includes(value)
-    );
-  }, [filter, items]);
-
-  const totalPages = useMemo(
-    () => Math.max(1, Math.ceil(filtered.length / ITEMS_PER_PAGE)),
-    [filtered.length]
-  );
-
-  const pageItems = useMemo(() => {
-    const start = (page - 1) * ITEMS_PER_PAGE;
-    return filtered.slice(start, start + ITEMS_PER_PAGE);
-  }, [filtered, page]);
-
-  useEffect(() => {
-    setPage(1);
-  }, [filter, filtered.length]);
+  const list = useKeysetList<Empleado>(EMPLEADOS_ENDPOINT, notify, "No se pudieron cargar los empleados.");
+  const load = list.reload;
 
   const create = useCallback(async () => {
     if (!cedula.trim() || !nombre.trim()) {
@@ -147,14 +111,7 @@ function useEmpleadosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<
 
   return {
     busy,
-    items,
-    filter,
-    setFilter,
-    page,
-    setPage,
-    totalPages,
-    pageItems,
-    totalCount: items.length,
+    ...list,
     create,
     update,
     remove,
@@ -167,47 +124,10 @@ function useEmpleadosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<
 
 function useRadiosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unknown> | unknown) {
   const { busy, runMutation } = useBusyMutation(notify);
-  const [items, setItems] = useState<Radio[]>([]);
   const [codigo, setCodigo] = useState("");
   const [descripcion, setDescripcion] = useState("");
-  const [filter, setFilter] = useState("");
-  const [page, setPage] = useState(1);
-
-  const load = useCallback(async () => {
-    const data = await apiGET<Radio[]>(RADIOS_ENDPOINT);
-    setItems(data);
-  }, []);
-
-  useEffect(() => {
-    void load().catch((error) => {
-      const message = error instanceof Error ? error.message : "No se pudieron cargar los radios.";
-      notify("error", message);
-    });
-  }, [load, notify]);
-
-  const filtered = useMemo(() => {
-    const value = filter.trim().toLowerCase();
-    if (!value) return items;
-    return items.filter(
-      (item) =>
-        item.codigo.toLowerCase().includes(value) ||
-        (item.descripcion ?? "").toLowerCase().includes(value)
-    );
-  }, [filter, items]);
-
-  const totalPages = useMemo(
-    () => Math.max(1, Math.ceil(filtered.length / ITEMS_PER_PAGE)),
-    [filtered.length]
-  );
-
-  const pageItems = useMemo(() => {
-    const start = (page - 1) * ITEMS_PER_PAGE;
-    return filtered.slice(start, start + ITEMS_PER_PAGE);
-  }, [filtered, page]);
-
-  useEffect(() => {
-    setPage(1);
-  }, [filter, filtered.length]);
+  const list = useKeysetList<Radio>(RADIOS_ENDPOINT, notify, "No se pudieron cargar los radios.");
+  const load = list.reload;
 
   const create = useCallback(async () => {
     if (!codigo.trim()) {
@@ -256,14 +176,7 @@ function useRadiosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unk
 
   return {
     busy,
-    items,
-    filter,
-    setFilter,
-    page,
-    setPage,
-    totalPages,
-    pageItems,
-    totalCount: items.length,
+    ...list,
     create,
     update,
     remove,
@@ -276,50 +189,10 @@ function useRadiosCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unk
 
 function useSapCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unknown> | unknown) {
   const { busy, runMutation } = useBusyMutation(notify);
-  const [items, setItems] = useState<SapUsuario[]>([]);
   const [username, setUsername] = useState("");
   const [cedula, setCedula] = useState("");
-  const [filter, setFilter] = useState("");
-  const [page, setPage] = useState(1);
-
-  const load = useCallback(async () => {
-    const data = await apiGET<SapUsuario[]>(SAP_ENDPOINT);
-    setItems(data);
-  }, []);
-
-  useEffect(() => {
-    void load().catch((error) => {
-      const message =
-        error instanceof Error ? error.message : "No se pudieron cargar los usuarios SAP.";
-      notify("error", message);
-    });
-  }, [load, notify]);
-
-  const filtered = useMemo(() => {
-    const value = filter.trim().toLowerCase();
-    if (!value) return items;
-    return items.filter((item) => {
-      const cedulaValue = (item as unknown as { empleado_cedula?: string | null }).empleado_cedula ?? "";
-      return (
-        item.username.toLowerCase().includes(value) ||
-        cedulaValue.toLowerCase().includes(value)
-      );
-    });
-  }, [filter, items]);
-
-  const totalPages = useMemo(
-    () => Math.max(1, Math.ceil(filtered.length / ITEMS_PER_PAGE)),
-    [filtered.length]
-  );
-
-  const pageItems = useMemo(() => {
-    const start = (page - 1) * ITEMS_PER_PAGE;
-    return filtered.slice(start, start + ITEMS_PER_PAGE);
-  }, [filtered, page]);
-
-  useEffect(() => {
-    setPage(1);
-  }, [filter, filtered.length]);
+  const list = useKeysetList<SapUsuario>(SAP_ENDPOINT, notify, "No se pudieron cargar los usuarios SAP.");
+  const load = list.reload;
 
   const create = useCallback(async () => {
     if (!username.trim()) {
@@ -368,14 +241,7 @@ function useSapCatalog(notify: NotifyFn, onCatalogMutated?: () => Promise<unknow
 
   return {
     busy,
-    items,
-    filter,
-    setFilter,
-    page,
-    setPage,
-    totalPages,
-    pageItems,
-    totalCount: items.length,
+    ...list,
     create,
     update,
     remove,
@@ -392,7 +258,7 @@ type SapCatalogState = ReturnType<typeof useSapCatalog>;
 
 function EmployeesCatalog({
   busy,
-  totalCount,
+  summary,
   filter,
   setFilter,
   pageItems,
@@ -429,7 +295,7 @@ function EmployeesCatalog({
       </div>
       <div className="card p-4 space-y-4">
         <div className="flex flex-col gap-2 md:flex-row md:items-center md:justify-between">
-          <span className="text-sm muted">{totalCount} registros</span>
+          <span className="text-sm muted">{summary}</span>
           <input
             className="input md:max-w-xs"
             placeholder="Buscar..."
@@ -476,7 +342,7 @@ function EmployeesCatalog({
 
 function RadiosCatalog({
   busy,
-  totalCount,
+  summary,
   filter,
   setFilter,
   pageItems,
@@ -513,7 +379,7 @@ function RadiosCatalog({
       </div>
       <div className="card p-4 space-y-4">
         <div className="flex flex-col gap-2 md:flex-row md:items-center md:justify-between">
-          <span className="text-sm muted">{totalCount} registros</span>
+          <span className="text-sm muted">{summary}</span>
           <input
             className="input md:max-w-xs"
             placeholder="Buscar..."
@@ -554,7 +420,7 @@ function RadiosCatalog({
 
 function SapCatalog({
   busy,
-  totalCount,
+  summary,
   filter,
   setFilter,
   pageItems,
@@ -591,7 +457,7 @@ function SapCatalog({
       </div>
       <div className="card p-4 space-y-4">
         <div className="flex flex-col gap-2 md:flex-row md:items-center md:justify-between">
-          <span className="text-sm muted">{totalCount} registros</span>
+          <span className="text-sm muted">{summary}</span>
           <input
             className="input md:max-w-xs"
             placeholder="Buscar..."
@@ -0,0 +1,72 @@
+"use client";
+
+import { useCallback, useEffect, useState } from "react";
+import { apiGET } from "@/lib/api";
+import type { PageResp } from "@/lib/types";
+import { ITEMS_PER_PAGE, type NotifyFn } from "./shared";
+
+const SEARCH_DEBOUNCE_MS = 300;
+
+/**
+ * Lista paginada en el servidor por cursor (`page_size` + `cursor`) con busqueda `q`.
+ * Solo se conocen las paginas ya visitadas y, si `has_more`, la siguiente.
+ */
+export function useKeysetList<T>(endpoint: string, notify: NotifyFn, loadError: string) {
+  const [filter, setFilter] = useState("");
+  const [query, setQuery] = useState("");
+  // cursors[i] es el cursor para pedir la pagina i + 1 (la primera no lleva cursor)
+  const [cursors, setCursors] = useState<Array<string | null>>([null]);
+  const [page, setPageState] = useState(1);
+  const [pageItems, setPageItems] = useState<T[]>([]);
+  const [hasMore, setHasMore] = useState(false);
+
+  useEffect(() => {
+    const next = filter.trim();
+    if (next === query) return;
+    const handle = setTimeout(() => {
+      setQuery(next);
+      setCursors([null]);
+      setPageState(1);
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(handle);
+  }, [filter, query]);
+
+  const cursor = cursors[page - 1] ?? null;
+
+  const load = useCallback(async () => {
+    const params = new URLSearchParams({ page_size: String(ITEMS_PER_PAGE) });
+    if (query) params.set("q", query);
+    if (cursor) params.set("cursor", cursor);
+    const data = await apiGET<PageResp<T>>(`${endpoint}?${params.toString()}`);
+    setPageItems(data.results);
+    setHasMore(data.has_more);
+    setCursors((prev) => {
+      const known = prev.slice(0, page);
+      return data.has_more ? [...known, data.next_cursor] : known;
+    });
+  }, [endpoint, query, cursor, page]);
+
+  useEffect(() => {
+    void load().catch((error) => {
+      notify("error", error instanceof Error ? error.message : loadError);
+    });
+  }, [load, notify, loadError]);
+
+  const setPage = useCallback(
+    (next: number) => {
+      if (next >= 1 && next <= cursors.length) setPageState(next);
+    },
+    [cursors.length]
+  );
+
+  return {
+    filter,
+    setFilter,
+    page,
+    setPage,
+    totalPages: cursors.length,
+    pageItems,
+    summary: hasMore ? `Pagina ${page}` : `Pagina ${page} de ${cursors.length}`,
+    reload: load,
+  };
+}
@@ -3,10 +3,8 @@
 
 import { useEffect, useMemo, useRef, useState } from "react";
 import Menu from "@/components/Menu";
-import { apiGET } from "@/lib/api";
-import type { PrestamoResp } from "@/lib/types";
-import { exportXLSX } from "@/lib/xlsx";
-import { rowsToCSV, downloadCSV } from "@/lib/csv";
+import { apiDownload, apiGET, openEventStream } from "@/lib/api";
+import type { CambiosResp, PageResp, PrestamoResp } from "@/lib/types";
 
 /* ----------------------------- Helpers ----------------------------- */
 type SortKey = keyof Pick<
@@ -23,19 +21,6 @@ type SortKey = keyof Pick<
 >;
 type Order = "asc" | "desc";
 
-const headers: Record<string, string> = {
-  id: "ID",
-  cedula: "Cédula",
-  empleado_nombre: "Empleado",
-  usuario_sap: "Usuario SAP",
-  codigo_radio: "RF",
-  turno: "Turno",
-  estado: "Estado",
-  fecha_hora_prestamo: "Prestado",
-  fecha_hora_devolucion: "Devuelto",
-  usuario_registra: "Registrado por",
-};
-
 function parseDate(v?: string | null): Date | null {
   if (!v) return null;
   const d = new Date(v);
@@ -102,24 +87,56 @@ export default function HistoricoPage() {
   const [sortKey, setSortKey] = useState<SortKey>("fecha_hora_prestamo");
   const [sortOrder, setSortOrder] = useState<Order>("desc");
 
-  // pagination
+  // paginación por cursor: cursors[i] pide la página i + 1 (la primera no lleva cursor)
+  const [cursors, setCursors] = useState<Array<string | null>>([null]);
   const [page, setPage] = useState(1);
+  const [hasMore, setHasMore] = useState(false);
   const pageSize = 12;
 
   // auto-refresh
   const [autoRefresh, setAutoRefresh] = useState(false);
   const timerRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
-  async function load() {
+  // token del feed incremental (/prestamos/cambios/)
+  const tokenRef = useRef<string | null>(null);
+  // filtros aplicados en la última carga (los del formulario pueden no estar aplicados aún)
+  const appliedRef = useRef<URLSearchParams>(new URLSearchParams());
+
+  function serverParams() {
+    const params = new URLSearchParams();
+    if (qCedula) params.set("cedula", qCedula.trim());
+    if (qRadio) params.set("codigo_radio", qRadio.trim());
+    if (qSAP) params.set("usuario_sap", qSAP.trim());
+    if (qNombre) params.set("empleado_nombre", qNombre.trim());
+    if (qEstado) params.set("estado", qEstado);
+    if (qTurno) params.set("turno", qTurno);
+    if (qDesde) params.set("desde", qDesde);
+    if (qHasta) params.set("hasta", qHasta);
+    return params;
+  }
+
+  // Pide una página al servidor (filtrada y ordenada por fecha de préstamo descendente)
+  async function fetchPage(n: number, known: Array<string | null>) {
+    const params = new URLSearchParams(appliedRef.current);
+    params.set("page_size", String(pageSize));
+    const cursor = known[n - 1];
+    if (cursor) params.set("cursor", cursor);
+    const data = await apiGET<PageResp<PrestamoResp>>(`/prestamos/?${params.toString()}`);
+    setRows(data.results);
+    setHasMore(data.has_more);
+    setCursors(data.has_more ? [...known.slice(0, n), data.next_cursor] : known.slice(0, n));
+    setPage(n);
+  }
+
+  async function load(filters: URLSearchParams = serverParams()) {
     setLoading(true);
     setErr(null);
     try {
-      const params = new URLSearchParams();
-      if (qCedula) params.set("cedula", qCedula.trim());
-      if (qRadio) params.set("codigo_radio", qRadio.trim());
-      const data = await apiGET<PrestamoResp[]>(`/prestamos/?${params.toString()}`);
-      setRows(Array.isArray(data) ? data : []);
-      setPage(1);
+      // El token se toma antes del listado para no perder cambios intermedios
+      const head = await apiGET<CambiosResp>(`/prestamos/cambios/`);
+      appliedRef.current = filters;
+      await fetchPage(1, [null]);
+      tokenRef.current = head.token;
       setLastUpdated(new Date());
     } catch (e: any) {
       setErr(e?.message || "No fue posible cargar los datos.");
@@ -128,6 +145,59 @@ export default function HistoricoPage() {
     }
   }
 
+  async function goToPage(n: number) {
+    if (n < 1 || n > cursors.length || n === page) return;
+    setLoading(true);
+    setErr(null);
+    try {
+      await fetchPage(n, cursors);
+    } catch (e: any) {
+      setErr(e?.message || "No fue posible cargar los datos.");
+    } finally {
+      setLoading(false);
+    }
+  }
+
+  async function poll() {
+    if (tokenRef.current === null) return load();
+    try {
+      const changed = new Map<number, PrestamoResp>();
+      let more = true;
+      while (more) {
+        // el estado cambia al devolver: el feed se consulta sin él
+        const params = new URLSearchParams(appliedRef.current);
+        params.delete("estado");
+        params.set("token", tokenRef.current ?? "");
+        const res = await apiGET<CambiosResp>(`/prestamos/cambios/?${params.toString()}`);
+        res.results.forEach((r) => changed.set(r.id, r));
+        tokenRef.current = res.token;
+        more = res.has_more;
+      }
+      if (changed.size) {
+        const estado = appliedRef.current.get("estado");
+        const known = new Set(rows.map((r) => r.id));
+        const nuevos = Array.from(changed.keys()).some((id) => !known.has(id));
+        if (nuevos && page === 1) {
+          // un préstamo nuevo entra arriba de la primera página: se vuelve a pedir
+          await fetchPage(1, [null]);
+        } else {
+          setRows((prev) =>
+            prev
+              .map((r) => changed.get(r.id) ?? r)
+              .filter((r) => !estado || r.estado === estado)
+          );
+        }
+      }
+      setLastUpdated(new Date());
+    } catch (e: any) {
+      setErr(e?.message || "No fue posible actualizar los datos.");
+    }
+  }
+
+  // poll lee la página vigente: el timer y el stream llaman siempre a la última versión
+  const pollRef = useRef(poll);
+  pollRef.current = poll;
+
   useEffect(() => {
     load(); // primera carga
     return () => {
@@ -142,39 +212,33 @@ export default function HistoricoPage() {
       timerRef.current = null;
     }
     if (autoRefresh) {
-      timerRef.current = setInterval(load, 30_000);
+      timerRef.current = setInterval(() => pollRef.current(), 30_000);
     }
   }, [autoRefresh]); // eslint-disable-line react-hooks/exhaustive-deps
 
-  // filtros client-side + orden
-  const filtered = useMemo(() => {
-    let r = rows;
-    if (qSAP) r = r.filter((x) => x.usuario_sap?.toLowerCase().includes(qSAP.toLowerCase()));
-    if (qNombre) r = r.filter((x) => x.empleado_nombre?.toLowerCase().includes(qNombre.toLowerCase()));
-    if (qEstado) r = r.filter((x) => x.estado === qEstado);
-    if (qTurno) {
-      const t = qTurno === "1" ? "Turno 1" : qTurno === "2" ? "Turno 2" : "Turno 3";
-      r = r.filter((x) => x.turno?.startsWith(t));
-    }
-    if (qDesde) {
-      const d = new Date(qDesde);
-      r = r.filter((x) => parseDate(x.fecha_hora_prestamo)! >= d);
-    }
-    if (qHasta) {
-      const d = new Date(qHasta);
-      d.setHours(23, 59, 59, 999);
-      r = r.filter((x) => parseDate(x.fecha_hora_prestamo)! <= d);
-    }
-    return sortRows(r, sortKey, sortOrder);
-  }, [rows, qSAP, qNombre, qEstado, qTurno, qDesde, qHasta, sortKey, sortOrder]);
-
-  const total = filtered.length;
-  const pages = Math.max(1, Math.ceil(total / pageSize));
-  const pageRows = filtered.slice((page - 1) * pageSize, page * pageSize);
-
+  // push: cada asignación/devolución dispara un poll incremental
   useEffect(() => {
-    if (page > pages) setPage(pages);
-  }, [pages, page]);
+    if (!autoRefresh) return;
+    let source: EventSource | null = null;
+    let cancelled = false;
+    openEventStream("/prestamos/stream/").then((es) => {
+      if (cancelled) {
+        es?.close();
+        return;
+      }
+      source = es;
+      source?.addEventListener("prestamo", () => pollRef.current());
+    });
+    return () => {
+      cancelled = true;
+      source?.close();
+    };
+  }, [autoRefresh]);
+
+  // orden dentro de la página cargada
+  const pageRows = useMemo(() => sortRows(rows, sortKey, sortOrder), [rows, sortKey, sortOrder]);
+  const pages = cursors.length;
+  const summary = hasMore ? `Página ${page}` : `Página ${page} de ${pages}`;
 
   function setSort(k: SortKey) {
     if (k === sortKey) setSortOrder((o) => (o === "asc" ? "desc" : "asc"));
@@ -184,19 +248,21 @@ export default function HistoricoPage() {
     }
   }
 
-  const openCount = filtered.filter((r) => (r.estado || "").toUpperCase() !== "DEVUELTO").length;
-
   /* ----------------------------- Export handlers ----------------------------- */
-  async function onExportXLSX() {
-    await exportXLSX(filtered, headers, {
-      filename: "historico.xlsx",
-      sheetName: "Histórico",
-      dateKeys: ["fecha_hora_prestamo", "fecha_hora_devolucion"],
-    });
-  }
-  function onExportCSV() {
-    const csv = rowsToCSV(filtered, headers, { delimiter: ",", includeBOM: true, excelSepDirective: true });
-    downloadCSV(csv, "historico.csv");
+  // El backend genera el archivo con los filtros del servidor: incluye todo el histórico, no solo lo cargado
+  const [exporting, setExporting] = useState(false);
+  async function onExport(formato: "csv" | "xlsx") {
+    setExporting(true);
+    setErr(null);
+    try {
+      const params = serverParams();
+      params.set("formato", formato);
+      await apiDownload(`/prestamos/exportar/?${params.toString()}`, `historico.${formato}`);
+    } catch (e: any) {
+      setErr(e?.message || "No fue posible exportar el histórico.");
+    } finally {
+      setExporting(false);
+    }
   }
 
   /* ----------------------------- UI ----------------------------- */
@@ -208,12 +274,11 @@ export default function HistoricoPage() {
           <div className="flex items-center gap-3">
             <h1 className="text-2xl tracking-tight font-semibold">Histórico</h1>
             <div className="hidden md:flex items-center gap-2">
-              <span className="badge bg-cloud/60 dark:bg-coffee/40">Total: <b>{total}</b></span>
-              <span className="badge bg-cloud/60 dark:bg-coffee/40">Abiertos: <b>{openCount}</b></span>
+              <span className="badge bg-cloud/60 dark:bg-coffee/40">{summary}</span>
             </div>
           </div>
           <div className="flex items-center gap-3">
-            <button onClick={load} className="btn btn-outline transition-transform hover:scale-[1.02]">
+            <button onClick={() => load(appliedRef.current)} className="btn btn-outline transition-transform hover:scale-[1.02]">
               {loading ? "Cargando…" : "Refrescar"}
             </button>
             <label className="inline-flex items-center gap-2 text-sm select-none">
@@ -262,7 +327,7 @@ export default function HistoricoPage() {
                 <option value="2">Turno 2</option>
                 <option value="3">Turno 3</option>
               </select>
-              <button onClick={load} className="btn btn-outline transition-transform hover:scale-[1.02]">
+              <button onClick={() => load()} className="btn btn-outline transition-transform hover:scale-[1.02]">
                 {loading ? "Cargando…" : "Aplicar"}
               </button>
             </div>
@@ -283,16 +348,17 @@ export default function HistoricoPage() {
                   setQTurno("");
                   setQDesde("");
                   setQHasta("");
+                  load(new URLSearchParams());
                 }}
                 className="btn btn-outline w-full transition-colors hover:bg-cloud/70 dark:hover:bg-coffee/40"
               >
                 Limpiar filtros
               </button>
               <div className="flex gap-2">
-                <button className="btn btn-outline" onClick={onExportCSV} title="CSV (interoperable)">
+                <button className="btn btn-outline" onClick={() => onExport("csv")} disabled={exporting} title="CSV (interoperable)">
                   CSV
                 </button>
-                <button className="btn btn-primary" onClick={onExportXLSX} title="Excel con formato">
+                <button className="btn btn-primary" onClick={() => onExport("xlsx")} disabled={exporting} title="Excel">
                   Excel
                 </button>
               </div>
@@ -376,12 +442,12 @@ export default function HistoricoPage() {
           {/* Paginación */}
           <div className="flex items-center justify-between mt-4">
             <div className="table-footnote">
-              Página {page} de {pages} · Mostrando {pageRows.length} de {total}
+              {summary} · Mostrando {pageRows.length}
             </div>
             <div className="flex items-center gap-2">
               <button
                 className="btn btn-outline"
-                onClick={() => setPage(1)}
+                onClick={() => goToPage(1)}
                 disabled={page === 1}
                 aria-label="Primera"
               >
@@ -389,7 +455,7 @@ export default function HistoricoPage() {
               </button>
               <button
                 className="btn btn-outline"
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
+                onClick={() => goToPage(page - 1)}
                 disabled={page === 1}
                 aria-label="Anterior"
               >
@@ -406,7 +472,7 @@ export default function HistoricoPage() {
                     return (
                       <button
                         key={n}
-                        onClick={() => setPage(n)}
+                        onClick={() => goToPage(n)}
                         className={`px-2.5 h-9 rounded-lg text-sm transition-colors ${
                           active
                             ? "bg-sky-blue text-white"
@@ -422,7 +488,7 @@ export default function HistoricoPage() {
 
               <button
                 className="btn btn-outline"
-                onClick={() => setPage((p) => Math.min(pages, p + 1))}
+                onClick={() => goToPage(page + 1)}
                 disabled={page === pages}
                 aria-label="Siguiente"
               >
@@ -430,7 +496,7 @@ export default function HistoricoPage() {
               </button>
               <button
                 className="btn btn-outline"
-                onClick={() => setPage(pages)}
+                onClick={() => goToPage(pages)}
                 disabled={page === pages}
                 aria-label="Última"
               >
@@ -4,8 +4,9 @@
 import { useEffect, useMemo, useState } from "react";
 import Menu from "@/components/Menu";
 import { apiGET, apiPOST } from "@/lib/api";
-import type { Empleado, Radio, SapUsuario, PrestamoResp } from "@/lib/types";
+import type { Empleado, Radio, SapUsuario, PrestamoResp, Sugerencia } from "@/lib/types";
 import { calcularTurno, formatoFecha, formatoHora } from "@/lib/turnos";
+import { etiquetaSugerencia, useSugerencias } from "@/lib/autocomplete";
 
 const RE_CEDULA = /^[0-9]{5,15}$/;
 const RE_SAP = /^[A-Za-z0-9._-]{3,50}$/;
@@ -31,6 +32,11 @@ export default function PrestamosPage() {
   const [mensaje, setMensaje] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
 
+  // Sugerencias mientras se escribe
+  const sugCedulas = useSugerencias("cedula", cedula);
+  const sugSap = useSugerencias("usuario_sap", usuarioSAP);
+  const sugRadios = useSugerencias("codigo_radio", codigoRadio);
+
   // Derivados
   const fecha = formatoFecha(ahora);
   const hora = formatoHora(ahora);
@@ -244,12 +250,18 @@ export default function PrestamosPage() {
 
           {/* Formulario */}
           <form onSubmit={onGuardar} className="space-y-5">
+            <SugerenciasList id="sug-cedula" items={sugCedulas} />
+            <SugerenciasList id="sug-sap" items={sugSap} />
+            <SugerenciasList id="sug-rf" items={sugRadios} />
+
             {/* Cédula */}
             <div className="grid sm:grid-cols-[220px_1fr_auto] items-center gap-3">
               <label className="text-sm muted" htmlFor="cedula">Cédula</label>
               <div className="flex gap-3">
                 <input
                   id="cedula"
+                  list="sug-cedula"
+                  autoComplete="off"
                   value={cedula}
                   onChange={(e) => setCedula(cleanCedula(e.target.value))}
                   onBlur={buscarEmpleado}
@@ -295,6 +307,8 @@ export default function PrestamosPage() {
               <label className="text-sm muted" htmlFor="sap">Usuario SAP</label>
               <input
                 id="sap"
+                list="sug-sap"
+                autoComplete="off"
                 value={usuarioSAP}
                 onChange={(e) => {
                   setUsuarioSAP(cleanSAP(e.target.value));
@@ -325,6 +339,8 @@ export default function PrestamosPage() {
               <label className="text-sm muted" htmlFor="rf">Código RF</label>
               <input
                 id="rf"
+                list="sug-rf"
+                autoComplete="off"
                 value={codigoRadio}
                 onChange={(e) => {
                   setCodigoRadio(cleanRF(e.target.value));
@@ -415,3 +431,13 @@ export default function PrestamosPage() {
     </>
   );
 }
+
+function SugerenciasList({ id, items }: { id: string; items: Sugerencia[] }) {
+  return (
+    <datalist id={id}>
+      {items.map((item) => (
+        <option key={item.valor} value={item.valor} label={etiquetaSugerencia(item)} />
+      ))}
+    </datalist>
+  );
+}
@@ -4,7 +4,7 @@
 import Link from "next/link";
 import { useEffect, useMemo, useRef, useState } from "react";
 import { apiGET } from "@/lib/api";
-import type { PrestamoResp } from "@/lib/types";
+import type { PrestamoResp, PrestamoResumen } from "@/lib/types";
 
 /** Utilidades */
 function parseDate(value?: string | null): Date | null {
@@ -40,6 +40,7 @@ function RowSkeleton({ idx }: { idx: number }) {
 
 export default function Home() {
   const [rows, setRows] = useState<PrestamoResp[]>([]);
+  const [resumen, setResumen] = useState<PrestamoResumen | null>(null);
   const [loading, setLoading] = useState(true);
   const [err, setErr] = useState<string | null>(null);
   const [query, setQuery] = useState("");
@@ -50,8 +51,12 @@ export default function Home() {
   async function load() {
     setErr(null);
     try {
-      const data = await apiGET<PrestamoResp[]>("/prestamos/");
+      const [data, res] = await Promise.all([
+        apiGET<PrestamoResp[]>("/prestamos/"),
+        apiGET<PrestamoResumen>("/prestamos/resumen/"),
+      ]);
       setRows(Array.isArray(data) ? data : []);
+      setResumen(res);
       setLastUpdated(new Date());
     } catch (e: any) {
       setErr(e?.message || "No fue posible cargar los datos.");
@@ -81,17 +86,7 @@ export default function Home() {
   /** Cálculos */
   const total = rows.length;
 
-  // Consideramos "abierto" si NO hay fecha de devolución,
-  // o si el estado no es "DEVUELTO" por si el backend cambia el flag.
-  const abiertos = useMemo(
-    () =>
-      rows.filter(
-        (r) =>
-          !r.fecha_hora_devolucion ||
-          (typeof r.estado === "string" && r.estado.toUpperCase() !== "DEVUELTO")
-      ).length,
-    [rows]
-  );
+  // Abiertos, vencidos y radios disponibles vienen precalculados por el backend
 
   const prestadosHoy = useMemo(() => {
     const d0 = new Date(); d0.setHours(0, 0, 0, 0);
@@ -177,8 +172,10 @@ export default function Home() {
       </section>
 
       {/* Métricas */}
-      <section className="grid sm:grid-cols-2 lg:grid-cols-4 gap-4">
-        <Stat label="Abiertos" value={abiertos} loading={loading} />
+      <section className="grid sm:grid-cols-2 lg:grid-cols-3 gap-4">
+        <Stat label="Abiertos" value={resumen?.abiertos ?? 0} loading={loading} />
+        <Stat label="Vencidos" value={resumen?.vencidos ?? 0} loading={loading} />
+        <Stat label="Radios disponibles" value={resumen?.radios_disponibles ?? 0} loading={loading} />
         <Stat label="Prestados hoy" value={prestadosHoy} loading={loading} />
         <Stat label="Devueltos hoy" value={devueltosHoy} loading={loading} />
         <Stat label="Total registros" value={total} loading={loading} />
@@ -174,7 +174,8 @@ export async function apiGET<T>(path: string): Promise<T> {
     {
       method: "GET",
       headers: { "Content-Type": "application/json" },
-      cache: "no-store",
+      // Revalida siempre: los catálogos responden 304 (ETag) si no cambiaron
+      cache: "no-cache",
     },
   );
   if (!res.ok) throw new Error(await safeErr(res));
@@ -217,3 +218,32 @@ export async function apiDELETE(path: string): Promise<void> {
   );
   if (!res.ok) throw new Error(await safeErr(res));
 }
+
+/**
+ * Descarga un archivo generado por el backend (exportaciones) con el token de
+ * acceso. El nombre se toma de `Content-Disposition` si el backend lo envía.
+ */
+export async function apiDownload(path: string, fallbackName: string): Promise<void> {
+  const res = await fetchWithAuth(path, { method: "GET" });
+  if (!res.ok) throw new Error(await safeErr(res));
+  const disposition = res.headers.get("content-disposition") || "";
+  const match = /filename="?([^";]+)"?/i.exec(disposition);
+  const url = URL.createObjectURL(await res.blob());
+  const a = document.createElement("a");
+  a.href = url;
+  a.download = match?.[1] ?? fallbackName;
+  a.click();
+  URL.revokeObjectURL(url);
+}
+
+/**
+ * Abre un canal Server-Sent Events autenticado. EventSource no admite
+ * cabeceras, por eso el token de acceso viaja en el query string.
+ */
+export async function openEventStream(path: string): Promise<EventSource | null> {
+  if (typeof window === "undefined" || typeof EventSource === "undefined") return null;
+  const token = await ensureAccessToken();
+  if (!token) return null;
+  const sep = path.includes("?") ? "&" : "?";
+  return new EventSource(`${API_BASE}${path}${sep}token=${encodeURIComponent(token)}`);
+}
@@ -0,0 +1,45 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { apiGET } from "@/lib/api";
+import type { Sugerencia } from "@/lib/types";
+
+export type TipoSugerencia = "cedula" | "codigo_radio" | "usuario_sap";
+
+const DEBOUNCE_MS = 150;
+const MIN_CHARS = 2;
+
+/** Sugerencias por prefijo desde /autocomplete/ mientras el operador escribe. */
+export function useSugerencias(tipo: TipoSugerencia, valor: string, limit = 8): Sugerencia[] {
+  const [items, setItems] = useState<Sugerencia[]>([]);
+
+  useEffect(() => {
+    const q = valor.trim();
+    if (q.length < MIN_CHARS) {
+      setItems([]);
+      return;
+    }
+    let cancelado = false;
+    const handle = setTimeout(() => {
+      const params = new URLSearchParams({ tipo, q, limit: String(limit) });
+      apiGET<Sugerencia[]>(`/autocomplete/?${params.toString()}`)
+        .then((data) => {
+          if (!cancelado) setItems(data);
+        })
+        .catch(() => {
+          if (!cancelado) setItems([]);
+        });
+    }, DEBOUNCE_MS);
+    return () => {
+      cancelado = true;
+      clearTimeout(handle);
+    };
+  }, [tipo, valor, limit]);
+
+  return items;
+}
+
+export function etiquetaSugerencia(item: Sugerencia): string {
+  const partes = [item.etiqueta, item.prestado ? "con préstamo abierto" : null].filter(Boolean);
+  return partes.join(" · ");
+}
@@ -12,6 +12,29 @@ export type PrestamoResp = {
   fecha_hora_devolucion: string | null;
 };
 
+export type PrestamoResumen = {
+  abiertos: number;
+  abiertos_por_turno: Record<"1" | "2" | "3", number>;
+  vencidos: number;
+  radios_activas: number;
+  radios_asignadas: number;
+  radios_disponibles: number;
+};
+
+export type PageResp<T> = {
+  results: T[];
+  next_cursor: string | null;
+  has_more: boolean;
+};
+
+export type CambiosResp = {
+  results: PrestamoResp[];
+  token: string | null;
+  has_more: boolean;
+};
+
+export type Sugerencia = { valor: string; etiqueta: string | null; prestado: boolean };
+
 export type Empleado = { cedula: string; nombre: string; activo: boolean };
 export type Radio    = { codigo: string; descripcion: string | null; activo: boolean };
 export type SapUsuario = {